@@ -0,0 +1,57 @@
+from contextlib import asynccontextmanager
+from flask import Flask
+from pymongo import AsyncMongoClient
+from starlette.applications import Starlette
+from starlette.middleware.wsgi import WSGIMiddleware
+from starlette.routing import Mount
+import asyncio
+import certifi
+
+from app.asgi.routes import routes
+from app.config import config
+from app.extensions import start_scheduler, stop_scheduler
+from app.database.async_base import AsyncDatabase
+from app.database import PlanRepository, TeamRepository, RecordRepository, ArcherRankRepository, PaymentLedgerRepository
+from app.services.paystack.async_client import AsyncPaystack
+
+
+def init_asgi_app(flask_app: Flask) -> Starlette:
+    """
+    Wrap the Flask app in an ASGI app.
+
+    The hot I/O-bound reads run as coroutines on an async Mongo client and
+    an async Paystack client, so one process can keep hundreds of them in
+    flight. Every other route is handed to the Flask app on a thread pool.
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette):
+        client = AsyncMongoClient(
+            flask_app.config["MONGO_URI"],
+            tlsCAFile=certifi.where(),
+            maxPoolSize=config.ASYNC_MONGO_MAX_POOL_SIZE
+        )
+        db_instance = AsyncDatabase(client.get_default_database())
+
+        # the repositories only forward to the database, so they work on the async one as well
+        app.state.flask_app = flask_app
+        app.state.plan_repo = PlanRepository(db_instance)
+        app.state.team_repo = TeamRepository(db_instance)
+        app.state.record_repo = RecordRepository(db_instance)
+        app.state.archer_rank_repo = ArcherRankRepository(db_instance)
+        app.state.payment_ledger_repo = PaymentLedgerRepository(db_instance)
+        app.state.paystack = AsyncPaystack(config.PAYSTACK_SECRET_KEY, max_connections=config.ASYNC_PAYSTACK_MAX_CONNECTIONS)
+
+        start_scheduler(flask_app)
+
+        yield
+
+        # joins the scheduler thread, off the event loop
+        await asyncio.to_thread(stop_scheduler)
+        await app.state.paystack.aclose()
+        await client.close()
+
+    return Starlette(
+        routes=routes + [Mount('/', app=WSGIMiddleware(flask_app))],
+        lifespan=lifespan
+    )
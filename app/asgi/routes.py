@@ -0,0 +1,207 @@
+import asyncio
+import logging
+from typing import Any, Dict
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+from app.database import PlanRepository, TeamRepository, RecordRepository, ArcherRankRepository, PaymentLedgerRepository
+from app.database.models.payment_ledger import FINAL_PAYMENT_STATUSES
+from app.config import config
+from app.services.paystack.async_client import AsyncPaystack
+from app.services.realtime.leaderboard import AsyncLeaderboardSubscription
+from app.services.realtime.change_feed import AsyncFeedSubscription
+from app.services.realtime.setup import leaderboard_feed, payment_feed
+from app.services.realtime.sse import sse_event, sse_comment
+
+logger = logging.getLogger(__name__)
+
+
+def json_response(request: Request, payload: Dict[str, Any], status_code: int) -> Response:
+    """Serialize like the Flask app does so both serving modes return identical bodies."""
+    return Response(
+        request.app.state.flask_app.json.dumps(payload),
+        status_code=status_code,
+        media_type="application/json",
+        headers={"Access-Control-Allow-Origin": "*"},
+    )
+
+
+async def get_all_plans(request: Request) -> Response:
+    try:
+        plan_repo: PlanRepository = request.app.state.plan_repo
+        plans = await plan_repo.get_all_plans()
+
+        return json_response(request, {"error": False, "data": plans}, 200)
+    except Exception as e:
+        logger.error(f"Failed to get all plans: {str(e)}")
+        return json_response(request, {"error": True, "message": "Failed to get all plans"}, 500)
+
+
+async def get_all_teams(request: Request) -> Response:
+    try:
+        team_repo: TeamRepository = request.app.state.team_repo
+        teams = await team_repo.get_all_teams()
+
+        return json_response(request, {"error": False, "message": "Team Members found.", "data": teams}, 200)
+    except Exception as e:
+        logger.error(f"Failed to get all teams: {str(e)}")
+        return json_response(request, {"error": True, "message": "Failed to get all teams"}, 500)
+
+
+async def get_all_records(request: Request) -> Response:
+    try:
+        record_repo: RecordRepository = request.app.state.record_repo
+        records = await record_repo.find_and_sort_by("start_date", -1)
+
+        return json_response(request, {"error": False, "data": records}, 200)
+    except Exception as e:
+        logger.error(f"Failed to get all records: {str(e)}")
+        return json_response(request, {"error": True, "message": "Failed to get all records"}, 500)
+
+
+async def get_all_archer_ranks(request: Request) -> Response:
+    try:
+        archer_rank_repo: ArcherRankRepository = request.app.state.archer_rank_repo
+
+        # the four leaderboards are independent, fetch them concurrently
+        types = ["General", "Recurve", "Compound", "Barebow"]
+        ranks = await asyncio.gather(*[
+            archer_rank_repo.filter_and_sort_by({"type": rank_type}, "point", -1) for rank_type in types
+        ])
+
+        return json_response(request, {
+            "error": False,
+            "message": "Archer ranks found.",
+            "data": dict(zip(types, ranks))
+        }, 200)
+    except Exception as e:
+        logger.error(f"Failed to get all archer ranks: {str(e)}")
+        return json_response(request, {"error": True, "message": "Failed to get all archer ranks"}, 500)
+
+
+async def stream_archer_ranks(request: Request) -> Response:
+    """
+    Server-sent events for the leaderboards: a `snapshot` shaped like /all's
+    data, then a `rank` event for every change. An upsert carries the archer
+    and its new position within its type, a removal only the type and _id.
+
+    Only served by the ASGI app, where each spectator waits on the event
+    loop. Under gunicorn every spectator would hold a worker thread.
+    """
+    async def stream():
+        subscription: AsyncLeaderboardSubscription = leaderboard_feed.subscribe(asyncio.get_running_loop())
+        try:
+            yield "retry: 3000\n\n"
+            yield sse_event("snapshot", await asyncio.to_thread(leaderboard_feed.snapshot))
+            deadline = asyncio.get_running_loop().time() + config.LEADERBOARD_STREAM_MAX_SECONDS
+
+            while (remaining := deadline - asyncio.get_running_loop().time()) > 0:
+                if subscription.resync:
+                    subscription.resync = False
+                    yield sse_event("snapshot", await asyncio.to_thread(leaderboard_feed.snapshot))
+                    continue
+
+                delta = await subscription.get_async(min(remaining, config.SSE_KEEPALIVE_SECONDS))
+                if delta is None:
+                    yield sse_comment("idle")
+                    continue
+                yield sse_event("rank", delta)
+        except Exception as e:
+            logger.error(f"Failed to stream archer ranks: {str(e)}")
+            yield sse_event("error", {"error": True, "message": "Failed to stream archer ranks"})
+        finally:
+            leaderboard_feed.unsubscribe(subscription)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+        "Access-Control-Allow-Origin": "*"
+    })
+
+
+async def verify_payment(request: Request) -> Response:
+    try:
+        reference = request.path_params["reference"]
+
+        # answered from the ledger when a webhook already reported the payment
+        payment_ledger_repo: PaymentLedgerRepository = request.app.state.payment_ledger_repo
+        if entry := await payment_ledger_repo.get_by_reference(reference):
+            return json_response(request, {
+                "error": False,
+                "message": "Verification successful",
+                "status": entry.get('status')
+            }, 200)
+
+        paystack: AsyncPaystack = request.app.state.paystack
+        response: Dict = await paystack.transaction.verify(reference=reference)
+
+        if not response.get('status'):
+            return json_response(request, {"error": True, "message": response.get('message')}, 400)
+
+        response_data: Dict = response.get('data')
+        if response_data.get('status') in FINAL_PAYMENT_STATUSES:
+            await payment_ledger_repo.record(reference, response_data.get('status'), "verify",
+                                             amount=response_data.get('amount'), paid_at=response_data.get('paid_at'))
+
+        return json_response(request, {
+            "error": False,
+            "message": response.get('message'),
+            "status": response_data.get('status')
+        }, 200)
+    except Exception as e:
+        logger.error(f"Failed to initialize payment: {str(e)}")
+        return json_response(request, {"error": True, "message": "Failed to initialize payment"}, 500)
+
+
+async def stream_payment_status(request: Request) -> Response:
+    """
+    Server-sent events for one payment: a `payment` event shaped like /verify
+    as soon as the webhook records the outcome, or `timeout` once
+    PAYMENT_STREAM_TIMEOUT_SECONDS pass without one. Each open checkout page
+    waits on the event loop, not on a thread.
+    """
+    reference = request.path_params["reference"]
+    payment_ledger_repo: PaymentLedgerRepository = request.app.state.payment_ledger_repo
+
+    async def stream():
+        loop = asyncio.get_running_loop()
+        subscription: AsyncFeedSubscription = payment_feed.subscribe(reference, loop)
+        try:
+            # subscribed before looking, so an outcome recorded in between still wakes us
+            entry = await payment_ledger_repo.get_by_reference(reference)
+            deadline = loop.time() + config.PAYMENT_STREAM_TIMEOUT_SECONDS
+
+            while entry is None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    yield sse_event("timeout", {"message": "No payment outcome yet."})
+                    return
+
+                entry = await subscription.wait_async(min(remaining, config.SSE_KEEPALIVE_SECONDS))
+                if entry is None:
+                    yield sse_comment("waiting")
+
+            yield sse_event("payment", {"error": False, "status": entry.get("status"), "message": "Verification successful"})
+        except Exception as e:
+            logger.error(f"Failed to stream payment status: {str(e)}")
+            yield sse_event("error", {"error": True, "message": "Failed to stream payment status"})
+        finally:
+            payment_feed.unsubscribe(subscription)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+        "Access-Control-Allow-Origin": "*"
+    })
+
+
+# I/O-bound public endpoints served natively, everything else falls through to the Flask app
+routes = [
+    Route('/api/v1/plan/all', get_all_plans, methods=["GET"]),
+    Route('/api/v1/team/all', get_all_teams, methods=["GET"]),
+    Route('/api/v1/record/all', get_all_records, methods=["GET"]),
+    Route('/api/v1/rank/all', get_all_archer_ranks, methods=["GET"]),
+    Route('/api/v1/rank/live', stream_archer_ranks, methods=["GET"]),
+    Route('/api/v1/subscription/verify/{reference}', verify_payment, methods=["GET"]),
+    Route('/api/v1/subscription/verify/{reference}/stream', stream_payment_status, methods=["GET"]),
+]
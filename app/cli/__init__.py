@@ -0,0 +1,6 @@
+from app.cli.reconcile import reconcile_paystack_command
+from app.cli.webhooks import webhooks_cli
+from app.cli.subscriptions import subscriptions_cli
+from app.cli.member_points import rebuild_member_points_command
+
+from app.cli.revenue import rollup_revenue_command
\ No newline at end of file
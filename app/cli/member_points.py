@@ -0,0 +1,20 @@
+from flask import current_app
+from flask.cli import with_appcontext
+import click
+
+from app.database import MemberPointsRepository
+
+
+@click.command("rebuild-member-points")
+@with_appcontext
+def rebuild_member_points_command() -> None:
+    """
+    Recompute every member's total points from their archer ranks.
+
+    The totals are kept up to date as ranks are written, this repairs them
+    after manual edits or a failed import. Rank changes made while it runs
+    may be overwritten, so run it when no scores are being entered.
+    """
+    repo: MemberPointsRepository = current_app.extensions['repositories'].get(MemberPointsRepository)
+    removed = repo.rebuild()
+    click.echo(f"Member points rebuilt, {removed} totals without ranks removed.")
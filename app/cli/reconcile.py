@@ -0,0 +1,26 @@
+from flask import current_app
+from flask.cli import with_appcontext
+import click
+
+from app.database import SubscriptionRepository, PaymentHistoryRepository, UserRepository, PlanRepository, JobStateRepository
+from app.usecases import ReconciliationUseCase
+
+
+@click.command("reconcile-paystack")
+@click.option("--full", is_flag=True, help="Ignore the saved watermark and compare every transaction and subscription.")
+@with_appcontext
+def reconcile_paystack_command(full: bool) -> None:
+    """Correct subscriptions and payment history that drifted from Paystack."""
+    repositories = current_app.extensions['repositories']
+    usecase = ReconciliationUseCase(
+        repositories.get(SubscriptionRepository),
+        repositories.get(PaymentHistoryRepository),
+        repositories.get(UserRepository),
+        repositories.get(PlanRepository),
+        repositories.get(JobStateRepository)
+    )
+
+    success, resp_data = usecase.reconcile(full=full)
+    click.echo(resp_data.get("message"))
+    for key, value in resp_data.get("data", {}).items():
+        click.echo(f"  {key}: {value}")
@@ -0,0 +1,21 @@
+from flask import current_app
+from flask.cli import with_appcontext
+from datetime import datetime
+import click
+
+from app.database import RevenueRollupRepository, JobStateRepository
+from app.usecases import RevenueUseCase
+
+
+@click.command("rollup-revenue")
+@click.option("--full", is_flag=True, help="Ignore the saved watermark and recompute every day.")
+@with_appcontext
+def rollup_revenue_command(full: bool) -> None:
+    """Bring the daily revenue rollups behind /api/v1/admin/revenue up to date."""
+    repositories = current_app.extensions['repositories']
+    usecase = RevenueUseCase(repositories.get(RevenueRollupRepository), repositories.get(JobStateRepository))
+
+    result = usecase.roll_up(datetime.now(), full=full)
+    click.echo("Revenue rolled up.")
+    for key, value in result.items():
+        click.echo(f"  {key}: {value}")
@@ -0,0 +1,32 @@
+from itertools import islice
+from flask import current_app
+from flask.cli import with_appcontext
+import click
+
+from app.database import SubscriptionRepository, UserRepository
+
+
+@click.group("subscriptions")
+def subscriptions_cli() -> None:
+    """Maintain the subscription records."""
+
+
+@subscriptions_cli.command("backfill-user-details")
+@click.option("--batch-size", default=500, show_default=True, help="Users updated per bulk write.")
+@with_appcontext
+def backfill_user_details_command(batch_size: int) -> None:
+    """Copy every user's name and image onto their subscriptions, for records made before they were stored there."""
+    repositories = current_app.extensions['repositories']
+    user_repo: UserRepository = repositories.get(UserRepository)
+    subscription_repo: SubscriptionRepository = repositories.get(SubscriptionRepository)
+
+    users = matched = modified = 0
+    profiles = user_repo.iter_profiles(batch_size)
+    while batch := list(islice(profiles, batch_size)):
+        result = subscription_repo.backfill_user_details(batch)
+        users += len(batch)
+        if result:
+            matched += result.matched_count
+            modified += result.modified_count
+
+    click.echo(f"Checked {users} users: {matched} subscriptions matched, {modified} updated.")
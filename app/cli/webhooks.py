@@ -0,0 +1,135 @@
+from typing import Any, Dict, Iterator, List, Tuple
+from collections import Counter
+from datetime import datetime
+from flask import current_app
+from flask.cli import with_appcontext
+import click
+import json
+import multiprocessing
+import os
+import time
+import zlib
+
+from app.database import WebhookEventRepository
+
+
+@click.group("webhooks")
+def webhooks_cli() -> None:
+    """Export and replay Paystack webhook events."""
+
+
+@webhooks_cli.command("export")
+@click.argument("output", type=click.File("w"))
+@click.option("--since", type=click.DateTime(), help="Only events received at or after this time.")
+@click.option("--until", type=click.DateTime(), help="Only events received before this time.")
+@with_appcontext
+def export_command(output, since: datetime, until: datetime) -> None:
+    """Write archived webhook events to OUTPUT as NDJSON, oldest first."""
+    repo = current_app.extensions['repositories'].get(WebhookEventRepository)
+
+    count = 0
+    for event in repo.iter_events(since=since, until=until):
+        output.write(json.dumps({"event": event["event"], "data": event["data"]}, default=str) + "\n")
+        count += 1
+
+    click.echo(f"Exported {count} events.")
+
+
+@webhooks_cli.command("replay")
+@click.argument("source", type=click.Path(exists=True, dir_okay=False))
+@click.option("--workers", default=os.cpu_count() or 1, show_default=True, help="Worker processes.")
+@click.option("--reverse", is_flag=True, help="The file lists the newest event first.")
+@click.option("--suppress-side-effects", is_flag=True,
+              help="Send no emails and make no Paystack calls, only replay the database writes.")
+def replay_command(source: str, workers: int, reverse: bool, suppress_side_effects: bool) -> None:
+    """
+    Replay the events in SOURCE (NDJSON or a JSON array of {"event", "data"})
+    through the webhook handlers.
+
+    Events of one customer all go to the same worker, in file order, so
+    each customer's history is applied in sequence while different
+    customers are replayed in parallel.
+    """
+    events = list(read_events(source))
+    if reverse:
+        events.reverse()
+
+    partitions: List[List[Tuple[int, Dict[str, Any]]]] = [[] for _ in range(max(workers, 1))]
+    for number, event in enumerate(events, start=1):
+        partitions[partition_for(event, len(partitions))].append((number, event))
+
+    click.echo(f"Replaying {len(events)} events on {len(partitions)} workers.")
+
+    # workers read these when they import the app, so they are set before spawning
+    os.environ["WEBHOOK_ARCHIVE_ENABLED"] = "false"
+    if suppress_side_effects:
+        os.environ["FLASK_MAIL_BACKEND"] = "dummy"
+        os.environ["PAYSTACK_OUTBOUND_ENABLED"] = "false"
+
+    # spawn, not fork: each worker builds its own app and Mongo client
+    context = multiprocessing.get_context("spawn")
+    started = time.perf_counter()
+    with context.Pool(len(partitions)) as pool:
+        results = pool.map(replay_partition, [partition for partition in partitions if partition])
+    elapsed = time.perf_counter() - started
+
+    outcomes: Counter = Counter()
+    failures: List[Tuple[int, str, str]] = []
+    for counts, partition_failures in results:
+        outcomes.update(counts)
+        failures.extend(partition_failures)
+
+    click.echo(f"Replayed {len(events)} events in {elapsed:.2f}s ({len(events) / elapsed if elapsed else 0:.1f} events/s).")
+    for outcome, count in sorted(outcomes.items()):
+        click.echo(f"  {outcome}: {count}")
+    for number, event_type, message in sorted(failures)[:20]:
+        click.echo(f"  event {number} ({event_type}): {message}")
+
+
+def read_events(source: str) -> Iterator[Dict[str, Any]]:
+    with open(source, encoding="utf-8-sig") as file:
+        first = file.read(1)
+        while first and first.isspace():
+            first = file.read(1)
+        file.seek(0)
+
+        if first == "[":
+            yield from json.load(file)
+            return
+
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def partition_for(event: Dict[str, Any], partitions: int) -> int:
+    """Same customer, same partition. crc32 rather than hash() so runs are repeatable."""
+    customer: Dict = (event.get("data") or {}).get("customer") or {}
+    key = customer.get("customer_code") or customer.get("email") or ""
+    return zlib.crc32(key.encode()) % partitions
+
+
+def replay_partition(events: List[Tuple[int, Dict[str, Any]]]) -> Tuple[Dict[str, int], List[Tuple[int, str, str]]]:
+    from run import app
+    from app.v1 import payment_bp
+
+    counts: Counter = Counter()
+    failures: List[Tuple[int, str, str]] = []
+
+    with app.app_context():
+        for number, event in events:
+            event_type = event.get("event")
+            response = payment_bp.paystack_payment.paymentHandler(event_type=event_type, data=event.get("data"))
+
+            # the handler logs and returns nothing when it raises
+            if response is None:
+                counts["errored"] += 1
+                failures.append((number, event_type, "handler raised, see the log"))
+                continue
+
+            success, resp_data = response
+            counts["succeeded" if success else "rejected"] += 1
+            if not success:
+                failures.append((number, event_type, resp_data.get("message")))
+
+    return dict(counts), failures
@@ -13,5 +13,80 @@ class Config:
     CLOUDINARY_API_SECRET = os.getenv('CLOUDINARY_API_SECRET')
     MAIL_DEFAULT_SENDER = ("Zen Archery", os.getenv('FLASK_MAIL_DEFAULT_SENDER'))
 
+    # password hashing
+    PASSWORD_HASH_ALGORITHM = os.getenv('PASSWORD_HASH_ALGORITHM', 'scrypt')
+    PASSWORD_HASH_COST = int(os.getenv('PASSWORD_HASH_COST', '0')) or None
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', '2'))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', '16'))
+    PASSWORD_HASH_TIMEOUT = float(os.getenv('PASSWORD_HASH_TIMEOUT', '10'))
+
+    # walk-in sessions
+    WALKIN_SESSION_CAPACITY = int(os.getenv('WALKIN_SESSION_CAPACITY', '6'))
+    WALKIN_HOLD_TTL_MINUTES = int(os.getenv('WALKIN_HOLD_TTL_MINUTES', '15'))
+
+    # asgi serving mode
+    ASYNC_MONGO_MAX_POOL_SIZE = int(os.getenv('ASYNC_MONGO_MAX_POOL_SIZE', '100'))
+    ASYNC_PAYSTACK_MAX_CONNECTIONS = int(os.getenv('ASYNC_PAYSTACK_MAX_CONNECTIONS', '100'))
+
+    # response cache for public reads: mongo (shared by every worker), local (per process) or none
+    RESPONSE_CACHE_BACKEND = os.getenv('RESPONSE_CACHE_BACKEND', 'mongo')
+    RESPONSE_CACHE_DEFAULT_TTL = int(os.getenv('RESPONSE_CACHE_DEFAULT_TTL', '300'))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '1024'))
+
+    # background jobs, run by whichever worker holds the scheduler lease
+    SCHEDULER_ENABLED = os.getenv('SCHEDULER_ENABLED', 'true').lower() == 'true'
+    SCHEDULER_TICK_SECONDS = int(os.getenv('SCHEDULER_TICK_SECONDS', '30'))
+    SCHEDULER_LEASE_SECONDS = int(os.getenv('SCHEDULER_LEASE_SECONDS', '90'))
+    SUBSCRIPTION_SWEEP_INTERVAL_SECONDS = int(os.getenv('SUBSCRIPTION_SWEEP_INTERVAL_SECONDS', '900'))
+    SUBSCRIPTION_RENEWAL_GRACE_HOURS = int(os.getenv('SUBSCRIPTION_RENEWAL_GRACE_HOURS', '48'))
+
+    # boot: lazy mode serves requests while index builds and cache warm-up run in the background
+    LAZY_INIT = os.getenv('LAZY_INIT', 'false').lower() == 'true'
+    READINESS_RETRY_SECONDS = int(os.getenv('READINESS_RETRY_SECONDS', '5'))
+
+    # archer rank result sheet imports
+    ARCHER_RANK_IMPORT_MAX_ROWS = int(os.getenv('ARCHER_RANK_IMPORT_MAX_ROWS', '5000'))
+
+    # outbound paystack calls queued by webhook handlers
+    OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', '8'))
+    OUTBOX_RETRY_INTERVAL_SECONDS = int(os.getenv('OUTBOX_RETRY_INTERVAL_SECONDS', '60'))
+    PAYSTACK_OUTBOUND_ENABLED = os.getenv('PAYSTACK_OUTBOUND_ENABLED', 'true').lower() == 'true'
+
+    # registration work done after the response: paystack customers and welcome emails
+    BACKGROUND_TASK_WORKERS = int(os.getenv('BACKGROUND_TASK_WORKERS', '4'))
+
+    # plans and users looked up by webhook handlers, kept between events
+    PAYSTACK_PLAN_CACHE_TTL_SECONDS = int(os.getenv('PAYSTACK_PLAN_CACHE_TTL_SECONDS', '300'))
+    CUSTOMER_DIRECTORY_MAX_ENTRIES = int(os.getenv('CUSTOMER_DIRECTORY_MAX_ENTRIES', '10000'))
+    CUSTOMER_DIRECTORY_TTL_SECONDS = int(os.getenv('CUSTOMER_DIRECTORY_TTL_SECONDS', '600'))
+
+    # admin dashboard overview, recomputed at most once per ttl per process
+    ADMIN_SUMMARY_TTL_SECONDS = int(os.getenv('ADMIN_SUMMARY_TTL_SECONDS', '30'))
+
+    # payment history summed per day for the revenue report
+    REVENUE_ROLLUP_INTERVAL_SECONDS = int(os.getenv('REVENUE_ROLLUP_INTERVAL_SECONDS', '900'))
+
+    # registrations read per cursor batch by the championship export
+    CHAMPION_EXPORT_BATCH_SIZE = int(os.getenv('CHAMPION_EXPORT_BATCH_SIZE', '500'))
+
+    # payment verification polled by the payment callback page
+    PAYMENT_STATUS_CACHE_TTL_SECONDS = int(os.getenv('PAYMENT_STATUS_CACHE_TTL_SECONDS', '5'))
+    PAYMENT_STATUS_CACHE_MAX_ENTRIES = int(os.getenv('PAYMENT_STATUS_CACHE_MAX_ENTRIES', '4096'))
+
+    # server-sent event streams, each holds one worker thread while open
+    REALTIME_POLL_INTERVAL_SECONDS = float(os.getenv('REALTIME_POLL_INTERVAL_SECONDS', '2'))
+    PAYMENT_STREAM_TIMEOUT_SECONDS = int(os.getenv('PAYMENT_STREAM_TIMEOUT_SECONDS', '120'))
+    # payment streams one gunicorn worker keeps open at once, the rest are told to poll /verify
+    PAYMENT_STREAM_MAX_OPEN = int(os.getenv('PAYMENT_STREAM_MAX_OPEN', '2'))
+    SSE_KEEPALIVE_SECONDS = int(os.getenv('SSE_KEEPALIVE_SECONDS', '15'))
+    # live leaderboard: streams end after this long and EventSource reconnects, releasing the thread
+    LEADERBOARD_STREAM_MAX_SECONDS = int(os.getenv('LEADERBOARD_STREAM_MAX_SECONDS', '900'))
+    # deltas a slow client may fall behind before it is sent a fresh snapshot instead
+    LEADERBOARD_SUBSCRIBER_QUEUE_SIZE = int(os.getenv('LEADERBOARD_SUBSCRIBER_QUEUE_SIZE', '256'))
+
+    # raw paystack webhook events kept for replays
+    WEBHOOK_ARCHIVE_ENABLED = os.getenv('WEBHOOK_ARCHIVE_ENABLED', 'true').lower() == 'true'
+    WEBHOOK_MAX_BODY_BYTES = int(os.getenv('WEBHOOK_MAX_BODY_BYTES', str(256 * 1024)))
+
 
 config = Config()
\ No newline at end of file
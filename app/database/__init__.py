@@ -8,4 +8,12 @@ from app.database.repository.record import RecordRepository
 from app.database.repository.archer_rank import ArcherRankRepository
 from app.database.repository.payment_history import PaymentHistoryRepository
 from app.database.repository.walk_in import WalkInRepository
-from app.database.repository.champion_user import ChampionUserRepository
\ No newline at end of file
+from app.database.repository.champion_user import ChampionUserRepository
+from app.database.repository.session_slot import SessionSlotRepository
+from app.database.repository.job_state import JobStateRepository
+from app.database.repository.outbox import OutboxRepository
+from app.database.repository.webhook_event import WebhookEventRepository
+from app.database.container import RepositoryContainer
+from app.database.repository.payment_ledger import PaymentLedgerRepository
+from app.database.repository.member_points import MemberPointsRepository
+from app.database.repository.revenue_rollup import RevenueRollupRepository
\ No newline at end of file
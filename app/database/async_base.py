@@ -0,0 +1,72 @@
+from typing import Any, Dict, List, Optional
+from pymongo.asynchronous.database import AsyncDatabase as PyMongoAsyncDatabase
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.results import InsertOneResult, UpdateResult, DeleteResult
+from pymongo import ReturnDocument
+from app.utils.utils import serialize_document
+
+
+class AsyncDatabase:
+    """
+    Asynchronous counterpart of Database with the same method names.
+
+    Repository methods that only return a Database call work unchanged on top
+    of it, their result just has to be awaited.
+    """
+
+    def __init__(self, db: PyMongoAsyncDatabase):
+        self.db: PyMongoAsyncDatabase = db
+
+    def get_collection(self, collection: str) -> AsyncCollection:
+        """Retrieve a collection from the database."""
+        return self.db[collection]
+
+    async def get_all(self, collection: str) -> List[Dict[str, Any]]:
+        """Retrieve all documents from a collection."""
+        cursor = self.get_collection(collection).find()
+        return [serialize_document(doc) async for doc in cursor]
+
+    async def get_one(self, collection: str, query: Dict[str, Any], projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Retrieve a single document from a collection based on a query."""
+        return await self.get_collection(collection).find_one(query, projection)
+
+    async def insert_one(self, collection: str, data: Dict[str, Any]) -> InsertOneResult:
+        """Insert a single document into a collection."""
+        return await self.get_collection(collection).insert_one(data)
+
+    async def update_one(self, collection: str, query: Dict[str, Any], data: Dict[str, Any]) -> UpdateResult:
+        """Update a single document in a collection based on a query."""
+        return await self.get_collection(collection).update_one(query, {"$set": data})
+
+    async def modify_one(self, collection: str, query: Dict[str, Any], update: Any, upsert: bool = False) -> UpdateResult:
+        """Apply an update document (operators or a pipeline) to a single document."""
+        return await self.get_collection(collection).update_one(query, update, upsert=upsert)
+
+    async def find_one_and_update(self, collection: str, query: Dict[str, Any], update: Any, upsert: bool = False,
+                                  projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Atomically update a single document and return it as it is after the update."""
+        return await self.get_collection(collection).find_one_and_update(
+            query, update, projection=projection, upsert=upsert, return_document=ReturnDocument.AFTER
+        )
+
+    async def delete_one(self, collection: str, query: Dict[str, Any]) -> DeleteResult:
+        """Delete a single document from a collection based on a query."""
+        return await self.get_collection(collection).delete_one(query)
+
+    async def sort_by(self, collection: str, key: str, order: int) -> List[Dict[str, Any]]:
+        """Sort documents in a collection by a key."""
+        cursor = self.get_collection(collection).find().sort(key, order)
+        return [serialize_document(doc) async for doc in cursor]
+
+    async def filter_and_sort_by(self, collection: str, query: Dict[str, Any], key: str, order: int) -> List[Dict[str, Any]]:
+        """Filter and sort documents in a collection by a key."""
+        return await self.aggregate(collection, [
+            {"$match": query},
+            {"$sort": {key: order}},
+            {"$project": {"created_at": 0, "updated_at": 0}}
+        ])
+
+    async def aggregate(self, collection: str, pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Perform an aggregation on the specified collection using a custom pipeline."""
+        cursor = await self.get_collection(collection).aggregate(pipeline)
+        return [serialize_document(doc) async for doc in cursor]
@@ -1,9 +1,21 @@
+from contextvars import ContextVar
 from typing import Any, Dict, List, Optional
+from pymongo.client_session import ClientSession
 from pymongo.database import Database as PyMongoDatabase
-from pymongo.results import InsertOneResult, InsertManyResult, UpdateResult, DeleteResult
+from pymongo.results import InsertOneResult, InsertManyResult, UpdateResult, DeleteResult, BulkWriteResult
 from pymongo.collection import Collection
+from pymongo import ReturnDocument
 from app.utils.utils import serialize_document
 
+# session of the unit of work running in this context, if any
+_session: ContextVar[Optional[ClientSession]] = ContextVar("mongo_session", default=None)
+
+
+def current_session() -> Optional[ClientSession]:
+    """The session every Database call joins, set by UnitOfWork."""
+    return _session.get()
+
+
 class Database:
     def __init__(self, db: PyMongoDatabase):
         self.db: PyMongoDatabase = db
@@ -14,42 +26,94 @@ class Database:
 
     def get_all(self, collection: str) -> List[Dict[str, Any]]:
         """Retrieve all documents from a collection."""
-        cursor = self.get_collection(collection).find()
+        cursor = self.get_collection(collection).find(session=current_session())
         documents = list(cursor)
         return [serialize_document(doc) for doc in documents]
 
 
-    def get_one(self, collection: str, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def get_one(self, collection: str, query: Dict[str, Any], projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         """Retrieve a single document from a collection based on a query."""
-        return self.get_collection(collection).find_one(query)
+        return self.get_collection(collection).find_one(query, projection, session=current_session())
+
+    def find(self, collection: str, query: Dict[str, Any], projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Retrieve every document matching a query, as stored (ObjectIds are kept)."""
+        return list(self.get_collection(collection).find(query, projection, session=current_session()))
 
     def insert_one(self, collection: str, data: Dict[str, Any]) -> InsertOneResult:
         """Insert a single document into a collection."""
-        return self.get_collection(collection).insert_one(data)
+        return self.get_collection(collection).insert_one(data, session=current_session())
+
+    def insert_document(self, collection: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert a single document and return it with its generated _id, without reading it back."""
+        result = self.get_collection(collection).insert_one(data, session=current_session())
+        data["_id"] = result.inserted_id
+        return data
+
+    def upsert_document(self, collection: str, query: Dict[str, Any], data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Insert a document unless one matching the query exists, and return the stored
+        document either way in the same round trip.
+        """
+        return self.find_one_and_update(collection, query, {"$setOnInsert": data}, upsert=True)
 
     def insert_many(self, collection: str, data: List[Dict[str, Any]]) -> InsertManyResult:
         """Insert multiple documents into a collection."""
-        return self.get_collection(collection).insert_many(data)
+        return self.get_collection(collection).insert_many(data, session=current_session())
 
     def update_one(self, collection: str, query: Dict[str, Any], data: Dict[str, Any]) -> UpdateResult:
         """Update a single document in a collection based on a query."""
-        return self.get_collection(collection).update_one(query, {"$set": data})
+        return self.get_collection(collection).update_one(query, {"$set": data}, session=current_session())
+
+    def modify_one(self, collection: str, query: Dict[str, Any], update: Any, upsert: bool = False) -> UpdateResult:
+        """Apply an update document (operators or a pipeline) to a single document."""
+        return self.get_collection(collection).update_one(query, update, upsert=upsert, session=current_session())
+
+    def find_one_and_update(self, collection: str, query: Dict[str, Any], update: Any, upsert: bool = False,
+                            projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Atomically update a single document and return it as it is after the update."""
+        return self.get_collection(collection).find_one_and_update(
+            query, update, projection=projection, upsert=upsert, return_document=ReturnDocument.AFTER,
+            session=current_session()
+        )
 
     def update_many(self, collection: str, query: Dict[str, Any], data: Dict[str, Any]) -> UpdateResult:
         """Update multiple documents in a collection based on a query."""
-        return self.get_collection(collection).update_many(query, {"$set": data})
+        return self.get_collection(collection).update_many(query, {"$set": data}, session=current_session())
+
+    def create_index(self, collection: str, keys: List[Any], **kwargs) -> str:
+        """Create an index on a collection if it does not exist yet."""
+        return self.get_collection(collection).create_index(keys, **kwargs)
+
+    def drop_index(self, collection: str, name: str) -> bool:
+        """Drop an index by name. Returns False when there was no such index."""
+        mongo_collection = self.get_collection(collection)
+        if name not in mongo_collection.index_information():
+            return False
+        mongo_collection.drop_index(name)
+        return True
+
+    def bulk_write(self, collection: str, operations: List[Any], ordered: bool = False) -> Optional[BulkWriteResult]:
+        """Send a batch of write operations in as few round trips as possible."""
+        if not operations:
+            return None
+        return self.get_collection(collection).bulk_write(operations, ordered=ordered, session=current_session())
 
     def delete_one(self, collection: str, query: Dict[str, Any]) -> DeleteResult:
         """Delete a single document from a collection based on a query."""
-        return self.get_collection(collection).delete_one(query)
+        return self.get_collection(collection).delete_one(query, session=current_session())
+
+    def find_one_and_delete(self, collection: str, query: Dict[str, Any],
+                            projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Atomically delete a single document and return it as it was."""
+        return self.get_collection(collection).find_one_and_delete(query, projection=projection, session=current_session())
 
     def delete_many(self, collection: str, query: Dict[str, Any]) -> DeleteResult:
         """Delete multiple documents from a collection based on a query."""
-        return self.get_collection(collection).delete_many(query)
+        return self.get_collection(collection).delete_many(query, session=current_session())
 
     def sort_by(self, collection: str, key: str, order: int) -> List[Dict[str, Any]]:
         """Sort documents in a collection by a key."""
-        cursor = self.get_collection(collection).find().sort(key, order)
+        cursor = self.get_collection(collection).find(session=current_session()).sort(key, order)
         documents = list(cursor)
         return [serialize_document(doc) for doc in documents]
     
@@ -59,7 +123,7 @@ class Database:
             {"$match": query},
             {"$sort": {key: order}},
             {"$project": {"created_at": 0, "updated_at": 0}}
-        ])
+        ], session=current_session())
         documents = list(cursor)
         return [serialize_document(doc) for doc in documents]
 
@@ -74,6 +138,6 @@ class Database:
         Returns:
             List[Dict[str, Any]]: The aggregated result.
         """
-        cursor = self.get_collection(collection).aggregate(pipeline)
+        cursor = self.get_collection(collection).aggregate(pipeline, session=current_session())
         documents = list(cursor)
         return [serialize_document(doc) for doc in documents]
\ No newline at end of file
@@ -0,0 +1,32 @@
+from threading import Lock
+from typing import Any, Dict, Type, TypeVar
+
+from app.database.base import Database
+
+R = TypeVar("R")
+
+
+class RepositoryContainer:
+    """
+    Holds one instance of each repository for the life of the app.
+
+    Use cases, services and CLI commands take their repositories from here
+    instead of constructing them per call, so whatever a repository keeps
+    between calls is shared by every caller.
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+        self._repositories: Dict[type, Any] = {}
+        self._lock = Lock()
+
+    def get(self, repository_class: Type[R]) -> R:
+        """Return the app's instance of `repository_class`, creating it on first use."""
+        repository = self._repositories.get(repository_class)
+        if repository is not None:
+            return repository
+
+        with self._lock:
+            if repository_class not in self._repositories:
+                self._repositories[repository_class] = repository_class(self.db)
+            return self._repositories[repository_class]
@@ -1,5 +1,4 @@
-from fastapi.encoders import jsonable_encoder
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, Dict
 from .objectid import PydanticObjectId
 from datetime import datetime
@@ -24,7 +23,7 @@ class ArcherRank(BaseModel):
 
     def to_json(self) -> dict:
         """Convert model to JSON-compatible dictionary."""
-        return jsonable_encoder(self, exclude_none=True)
+        return self.model_dump(mode="json", by_alias=True, exclude_none=True)
     
     def to_bson(self) -> dict:
         """Convert model to BSON-compatible dictionary for MongoDB."""
@@ -34,6 +33,20 @@ class ArcherRank(BaseModel):
         return data
     
 
+class ArcherRankImport(BaseModel):
+    """One row of a tournament result sheet."""
+    email: str
+    full_name: str
+    point: int
+    type: ArcherRankType
+    image_url: str = ""
+
+    @field_validator("full_name", "email")
+    @classmethod
+    def strip_whitespace(cls, value: str) -> str:
+        return value.strip()
+
+
 class ArcherRankUpdate(BaseModel):
     point: int
     updated_at: datetime = Field(default_factory=datetime.now)
@@ -1,4 +1,3 @@
-from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel, EmailStr
 from datetime import datetime
 from typing import Optional
@@ -12,4 +11,4 @@ class ContactUs(BaseModel):
 
     def to_json(self) -> dict:
         """Convert model to JSON-compatible dictionary."""
-        return jsonable_encoder(self, exclude_none=True)
\ No newline at end of file
+        return self.model_dump(mode="json", by_alias=True, exclude_none=True)
\ No newline at end of file
@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Dict
+from datetime import datetime
+
+
+class JobState(BaseModel):
+    """Progress of a recurring background job, one document per job."""
+    id: str = Field(alias="_id")
+    watermark: Optional[datetime] = None
+    last_run_at: Optional[datetime] = None
+    last_result: Dict = {}
+    # held while a run is in progress, so two runs of the job never overlap
+    locked_by: Optional[str] = None
+    locked_until: Optional[datetime] = None
+    updated_at: datetime = Field(default_factory=datetime.now)
+
+    def to_bson(self) -> Dict:
+        """Convert model to BSON-compatible dictionary for MongoDB."""
+        return self.model_dump(by_alias=True, exclude_none=True)
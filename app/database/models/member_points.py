@@ -0,0 +1,13 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+
+class MemberPoints(BaseModel):
+    """A member's points summed over all their archer ranks, keyed by email."""
+    email: str = Field(alias="_id")
+    total_points: int = 0
+    updated_at: datetime = Field(default_factory=datetime.now)
+
+    def to_bson(self) -> dict:
+        """Convert model to BSON-compatible dictionary for MongoDB."""
+        return self.model_dump(by_alias=True, exclude_none=True)
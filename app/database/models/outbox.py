@@ -0,0 +1,32 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Dict
+from .objectid import PydanticObjectId
+from datetime import datetime
+from enum import Enum
+
+
+class OutboxStatus(str, Enum):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+
+class OutboxMessage(BaseModel):
+    """An outbound call recorded alongside the writes that caused it, sent once they commit."""
+    id: Optional[PydanticObjectId] = Field(None, alias="_id")
+    kind: str
+    payload: Dict
+    status: OutboxStatus = OutboxStatus.PENDING
+    attempts: int = 0
+    last_error: Optional[str] = None
+    next_attempt_at: datetime = Field(default_factory=datetime.now)
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
+
+    def to_bson(self) -> dict:
+        """Convert model to BSON-compatible dictionary for MongoDB."""
+        data = self.model_dump(by_alias=True, exclude_none=True)
+        if data.get("_id") is None:
+            data.pop("_id", None)
+        return data
@@ -1,15 +1,24 @@
-from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel, Field
 from typing import Optional, Dict
 from .objectid import PydanticObjectId
 from datetime import datetime
 
+# what a payment was for, keyed by the `type` in the Paystack metadata of one-off charges
+PAYMENT_TYPES = {
+    "walkin": "walk-in",
+    "competition": "competition",
+    "subscription": "subscription",
+    "upgrade": "subscription"
+}
+
 class PaymentHistory(BaseModel):
     id: Optional[PydanticObjectId] = Field(None, alias="_id")
     user_id: Optional[PydanticObjectId] = Field(None, alias="user_id")
     plan_id: Optional[PydanticObjectId] = Field(None, alias="plan_id")
     amount: Optional[int] = None
     status: str
+    # walk-in, competition, subscription or renewal, rolled up into RevenueRollup
+    type: Optional[str] = None
     reference: Optional[str] = None
     name: Optional[str] = None
     email: Optional[str] = None
@@ -19,7 +28,7 @@ class PaymentHistory(BaseModel):
 
     def to_json(self) -> dict:
         """Convert model to JSON-compatible dictionary."""
-        return jsonable_encoder(self, exclude_none=True)
+        return self.model_dump(mode="json", by_alias=True, exclude_none=True)
     
     def to_bson(self) -> dict:
         """Convert model to BSON-compatible dictionary for MongoDB."""
@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+# Paystack transaction statuses that will not change again
+FINAL_PAYMENT_STATUSES = ("success", "failed", "reversed")
+
+
+class PaymentLedger(BaseModel):
+    """The latest known status of a Paystack transaction, keyed by its reference."""
+    reference: str = Field(alias="_id")
+    status: str
+    amount: Optional[int] = None
+    paid_at: Optional[datetime] = None
+    # where the status came from: the webhook event name or "verify"
+    source: str
+    updated_at: datetime = Field(default_factory=datetime.now)
+
+    def to_bson(self) -> dict:
+        """Convert model to BSON-compatible dictionary for MongoDB."""
+        return self.model_dump(by_alias=True, exclude_none=True)
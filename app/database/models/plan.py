@@ -1,5 +1,4 @@
 from enum import Enum
-from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel, Field, field_validator
 from typing import Optional, Dict, List
 from datetime import datetime, timedelta
@@ -35,7 +34,7 @@ class Plan(BaseModel):
 
     def to_json(self) -> dict:
         """Convert model to JSON-compatible dictionary."""
-        return jsonable_encoder(self, exclude_none=True)
+        return self.model_dump(mode="json", by_alias=True, exclude_none=True)
     
     def to_bson(self) -> dict:
         """Convert model to BSON-compatible dictionary for MongoDB."""
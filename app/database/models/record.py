@@ -1,4 +1,3 @@
-from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel, Field, field_validator
 from typing import Optional, Dict
 from datetime import datetime
@@ -17,7 +16,7 @@ class Record(BaseModel):
 
     def to_json(self) -> Dict:
         """Convert model to JSON-compatible Dictionary."""
-        return jsonable_encoder(self, exclude_none=True)
+        return self.model_dump(mode="json", by_alias=True, exclude_none=True)
     
     def to_bson(self) -> Dict:
         """Convert model to BSON-compatible dictionary for MongoDB."""
@@ -0,0 +1,24 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Dict
+from .objectid import PydanticObjectId
+from datetime import datetime
+
+
+class RevenueRollup(BaseModel):
+    """
+    PaymentHistory summed per day, plan, type and status. The _id is the
+    bucket, {day, plan_id, type, status}, and its fields are repeated at the
+    top level for queries.
+    """
+    id: Dict = Field(alias="_id")
+    day: datetime
+    plan_id: Optional[PydanticObjectId] = None
+    type: str
+    status: Optional[str] = None
+    amount: int = 0
+    payments: int = 0
+    rolled_up_at: datetime = Field(default_factory=datetime.now)
+
+    def to_bson(self) -> dict:
+        """Convert model to BSON-compatible dictionary for MongoDB."""
+        return self.model_dump(by_alias=True, exclude_none=True)
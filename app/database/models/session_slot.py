@@ -0,0 +1,33 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, List
+from datetime import datetime
+
+
+class SessionHold(BaseModel):
+    hold_id: str
+    email: str
+    expires_at: datetime
+
+
+class SessionSlot(BaseModel):
+    id: Optional[str] = Field(None, alias="_id")
+    session_date: datetime
+    capacity: int
+    booked: int = 0
+    # booked walk-ins plus unexpired holds, guarded against capacity
+    reserved: int = 0
+    holds: List[SessionHold] = []
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
+
+    def to_bson(self) -> Dict:
+        """Convert model to BSON-compatible dictionary for MongoDB."""
+        data = self.model_dump(by_alias=True, exclude_none=True)
+        if data.get("_id") is None:
+            data.pop("_id", None)
+        return data
+
+    @staticmethod
+    def key_for(entry_date: datetime) -> str:
+        """One slot document per walk-in session (a calendar day)."""
+        return entry_date.strftime("%Y-%m-%d")
@@ -1,4 +1,3 @@
-from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel, Field, field_validator
 from typing import Optional, Dict
 from datetime import datetime, timedelta
@@ -27,12 +26,15 @@ class Subscription(BaseModel):
     start_date: datetime = Field(default_factory=datetime.now)
     end_date: Optional[datetime] = None
     status: SubscriptionStatus = SubscriptionStatus.PENDING
+    # copied from the user for the admin listing, kept in sync by UserRepository.profile_listeners
+    name: Optional[str] = None
+    image_url: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
 
     def to_json(self) -> dict:
         """Convert model to JSON-compatible dictionary."""
-        return jsonable_encoder(self, exclude_none=True)
+        return self.model_dump(mode="json", by_alias=True, exclude_none=True)
 
     def to_bson(self) -> dict:
         """Convert model to BSON-compatible dictionary for MongoDB."""
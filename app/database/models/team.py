@@ -1,4 +1,3 @@
-from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel, Field
 from typing import Optional, Dict
 from .objectid import PydanticObjectId
@@ -15,7 +14,7 @@ class Team(BaseModel):
 
     def to_json(self) -> dict:
         """Convert model to JSON-compatible dictionary."""
-        return jsonable_encoder(self, exclude_none=True)
+        return self.model_dump(mode="json", by_alias=True, exclude_none=True)
     
     def to_bson(self) -> dict:
         """Convert model to BSON-compatible dictionary for MongoDB."""
@@ -1,4 +1,3 @@
-from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional
 from .objectid import PydanticObjectId
@@ -14,7 +13,7 @@ class TokenBlocklist(BaseModel):
 
     def to_json(self) -> dict:
         """Convert model to JSON-compatible dictionary."""
-        return jsonable_encoder(self, exclude_none=True)
+        return self.model_dump(mode="json", by_alias=True, exclude_none=True)
     
     def to_bson(self) -> dict:
         """Convert model to BSON-compatible dictionary for MongoDB."""
@@ -1,9 +1,8 @@
-from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional
 from datetime import datetime, timezone, timedelta
 from .objectid import PydanticObjectId
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.services.hashing.setup import password_hasher
 
 
 class User(BaseModel):
@@ -56,15 +55,19 @@ class User(BaseModel):
 
     def set_password(self, password: str) -> None:
         """Set hashed password."""
-        self.Password = generate_password_hash(password)
+        self.Password = password_hasher.hash(password)
 
     def check_password(self, password: str) -> bool:
         """Check if password matches hashed password."""
-        return check_password_hash(self.Password, password)
+        return password_hasher.verify(self.Password, password)
+
+    def password_needs_rehash(self) -> bool:
+        """Check if the stored hash was made with outdated parameters."""
+        return password_hasher.needs_rehash(self.Password)
 
     def to_json(self) -> dict:
         """Convert model to JSON-compatible dictionary."""
-        return jsonable_encoder(self, exclude_none=True)
+        return self.model_dump(mode="json", by_alias=True, exclude_none=True)
 
     def to_bson(self) -> dict:
         """Convert model to BSON-compatible dictionary for MongoDB."""
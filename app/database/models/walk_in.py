@@ -1,4 +1,3 @@
-from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel, Field, field_validator
 from typing import Optional, Dict
 from datetime import datetime
@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Dict
+from .objectid import PydanticObjectId
+from datetime import datetime
+
+
+class WebhookEvent(BaseModel):
+    """A Paystack webhook exactly as it was received, kept so it can be replayed."""
+    id: Optional[PydanticObjectId] = Field(None, alias="_id")
+    event: str
+    data: Dict
+    received_at: datetime = Field(default_factory=datetime.now)
+
+    def to_bson(self) -> dict:
+        """Convert model to BSON-compatible dictionary for MongoDB."""
+        data = self.model_dump(by_alias=True, exclude_none=True)
+        if data.get("_id") is None:
+            data.pop("_id", None)
+        return data
@@ -1,13 +1,18 @@
 from app.database.base import Database
 from app.database.models.archer_rank import ArcherRank
 from bson import ObjectId
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+from datetime import datetime
 
 
 class ArcherRankRepository:
     def __init__(self, db: Database):
         self.db = db
 
+    def ensure_indexes(self) -> None:
+        """Index behind the duplicate check and the leaderboards."""
+        self.db.create_index(ArcherRank.__name__, [("type", 1), ("full_name", 1)])
+
     def get_by_id(self, archer_rank_id: str):
         """Fetch an archer rank by ID."""
         return self.db.get_one(ArcherRank.__name__, {"_id": ObjectId(archer_rank_id)})
@@ -18,18 +23,40 @@ class ArcherRankRepository:
 
     def create_archer_rank(self, data: Dict):
         """Insert a new archer rank record."""
-        result = self.db.insert_one(ArcherRank.__name__, data)
+        return self.db.insert_document(ArcherRank.__name__, data)
+
+    def get_by_types_and_names(self, types: List[str], full_names: List[str]) -> List[Dict[str, Any]]:
+        """Fetch the existing ranks that may match any of the given archers, in one query."""
+        return self.db.find(
+            ArcherRank.__name__,
+            {"type": {"$in": types}, "full_name": {"$in": full_names}},
+            {"type": 1, "full_name": 1, "email": 1}
+        )
 
-        # Fetch the inserted record
-        return self.get_by_id(str(result.inserted_id))
+    def bulk_write_archer_ranks(self, operations: List[Any], ordered: bool = True):
+        """Apply a batch of archer rank writes."""
+        return self.db.bulk_write(ArcherRank.__name__, operations, ordered=ordered)
 
     def find_and_update_archer_rank(self, query: Dict[str, Any], data: Dict):
         """Find an archer rank by query and update the record."""
         return self.db.update_one(ArcherRank.__name__, query, data)
 
+    def add_points(self, archer_rank_id: str, points: int, updated_at: datetime) -> Optional[Dict[str, Any]]:
+        """Add to an archer rank's points in place, and return its email and new points."""
+        return self.db.find_one_and_update(
+            ArcherRank.__name__,
+            {"_id": ObjectId(archer_rank_id)},
+            {"$inc": {"point": points}, "$set": {"updated_at": updated_at}},
+            projection={"email": 1, "point": 1}
+        )
+
     def find_and_delete_archer_rank(self, query: Dict[str, Any]):
         """Find an archer rank by query and delete the record."""
         return self.db.delete_one(ArcherRank.__name__, query)
+
+    def remove_archer_rank(self, archer_rank_id: str) -> Optional[Dict[str, Any]]:
+        """Delete an archer rank and return its email and points, None when it did not exist."""
+        return self.db.find_one_and_delete(ArcherRank.__name__, {"_id": ObjectId(archer_rank_id)}, {"email": 1, "point": 1})
     
     def find_and_sort_by(self, key: str, order: int):
         """Sort archer ranks by a key."""
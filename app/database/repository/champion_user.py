@@ -1,7 +1,7 @@
 from app.database.base import Database
 from app.database.models.champion_user import ChampionUser
 from bson import ObjectId
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 from flask_mailman import EmailMultiAlternatives
 from app.config import config
 from app.utils.utils import capitalize_first_letter
@@ -9,9 +9,27 @@ from typing import List
 
 
 class ChampionUserRepository:
+    # registrations that can no longer be overwritten by registering again
+    SETTLED_STATUSES = ["payment", "paid"]
+
     def __init__(self, db: Database):
         self.db = db
 
+    def ensure_indexes(self) -> None:
+        """
+        One registration per email, and the index behind the payment webhook's
+        lookup by unique_id. Raises DuplicateKeyError while duplicate emails exist.
+        """
+        self.db.create_index(ChampionUser.__name__, [("unique_id", 1)])
+        self.db.create_index(ChampionUser.__name__, [("email", 1)], unique=True)
+
+    def duplicate_emails(self) -> List[str]:
+        """Emails shared by more than one registration, which keep the unique index from building."""
+        return [group["_id"] for group in self.db.aggregate(ChampionUser.__name__, [
+            {"$group": {"_id": "$email", "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gt": 1}}}
+        ])]
+
     def get_by_id(self, champion_user_id: str):
         """Fetch a user by ID."""
         return self.db.get_one(ChampionUser.__name__, {"_id": ObjectId(champion_user_id)})
@@ -27,6 +45,31 @@ class ChampionUserRepository:
         # fetch the inserted record
         return str(result.inserted_id)
     
+    def register_champion_user(self, data: Dict) -> Tuple[str, bool]:
+        """
+        Insert a registration, or overwrite the unsettled one with the same email,
+        in one write. Returns the id and whether it was inserted. Raises
+        DuplicateKeyError when the email belongs to a settled registration.
+        """
+        data = dict(data)
+        created_at = data.pop("created_at")
+        new_id = ObjectId()
+        result = self.db.find_one_and_update(
+            ChampionUser.__name__,
+            {"email": data["email"], "status": {"$nin": self.SETTLED_STATUSES}},
+            {"$set": data, "$setOnInsert": {"_id": new_id, "created_at": created_at}},
+            upsert=True,
+            projection={"_id": 1}
+        )
+        return str(result["_id"]), result["_id"] == new_id
+
+    def count_by_status(self) -> Dict[str, int]:
+        """Number of registrations in each status."""
+        return {
+            group["_id"]: group["count"]
+            for group in self.db.aggregate(ChampionUser.__name__, [{"$group": {"_id": "$status", "count": {"$sum": 1}}}])
+        }
+
     def find_and_update_champion_user(self, query: Dict[str, Any], data: Dict):
         """Find a champion user by query and update the record."""
         return self.db.update_one(ChampionUser.__name__, query, data)
@@ -303,6 +346,10 @@ class ChampionUserRepository:
         # ✅ Send the email
         email_msg.send()
 
+    def iter_for_export(self, query: Dict[str, Any], projection: Dict[str, Any], batch_size: int):
+        """Registrations matching a query in the order they came in, read off the cursor `batch_size` at a time."""
+        return self.db.get_collection(ChampionUser.__name__).find(query, projection, batch_size=batch_size).sort("_id", 1)
+
     def get_all_champion_users(self, page: int, limit: int, sort: dict, search: str) -> Dict[str, Any]:
         """Fetch paginated champion users with optional search."""
         match_stage = {}
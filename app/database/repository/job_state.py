@@ -0,0 +1,55 @@
+from app.database.base import Database
+from app.database.models.job_state import JobState
+from pymongo.errors import DuplicateKeyError
+from typing import Dict, Any, Optional
+from datetime import datetime, timedelta
+
+
+class JobStateRepository:
+    def __init__(self, db: Database):
+        self.db = db
+
+    def get_by_job(self, job: str) -> Optional[Dict[str, Any]]:
+        """Fetch the saved state of a job."""
+        return self.db.get_one(JobState.__name__, {"_id": job})
+
+    def save_run(self, job: str, watermark: datetime, result: Dict[str, Any]):
+        """Record a finished run and the point the next run should resume from."""
+        state = JobState(**{
+            "_id": job,
+            "watermark": watermark,
+            "last_run_at": datetime.now(),
+            "last_result": result
+        }).to_bson()
+        del state["_id"]
+
+        return self.db.modify_one(JobState.__name__, {"_id": job}, {"$set": state}, upsert=True)
+
+    def record_run(self, job: str, result: Dict[str, Any]):
+        """Record a finished run, leaving the job's own watermark as it is."""
+        return self.db.modify_one(JobState.__name__, {"_id": job}, {"$set": {
+            "last_run_at": datetime.now(),
+            "last_result": result,
+            "updated_at": datetime.now()
+        }}, upsert=True)
+
+    def acquire_lock(self, job: str, holder: str, ttl: timedelta) -> bool:
+        """Take the job's lock for `ttl`, unless another holder has it and it has not expired."""
+        now = datetime.now()
+        try:
+            state = self.db.find_one_and_update(
+                JobState.__name__,
+                {"_id": job, "$or": [{"locked_until": None}, {"locked_until": {"$lt": now}}, {"locked_by": holder}]},
+                {"$set": {"locked_by": holder, "locked_until": now + ttl}},
+                upsert=True,
+                projection={"locked_by": 1}
+            )
+            return state is not None and state.get("locked_by") == holder
+        except DuplicateKeyError:
+            # the filter missed an existing document, someone else holds the lock
+            return False
+
+    def release_lock(self, job: str, holder: str):
+        """Give the lock back, if it is still ours."""
+        return self.db.modify_one(JobState.__name__, {"_id": job, "locked_by": holder},
+                                  {"$set": {"locked_by": None, "locked_until": None}})
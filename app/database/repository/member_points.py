@@ -0,0 +1,44 @@
+from app.database.base import Database
+from app.database.models.archer_rank import ArcherRank
+from app.database.models.member_points import MemberPoints
+from pymongo import UpdateOne
+from typing import Dict
+from datetime import datetime
+
+
+class MemberPointsRepository:
+    def __init__(self, db: Database):
+        self.db = db
+
+    def get_total(self, email: str) -> int:
+        """A member's total points. The email is the _id, so this is an index lookup."""
+        totals = self.db.get_one(MemberPoints.__name__, {"_id": email}, {"total_points": 1})
+        return totals.get("total_points", 0) if totals else 0
+
+    def add(self, email: str, points: int):
+        """Add to (or with a negative number, take from) a member's total."""
+        return self.add_many({email: points})
+
+    def add_many(self, points_by_email: Dict[str, int]):
+        """Apply the point changes of several members in one batch."""
+        now = datetime.now()
+        return self.db.bulk_write(MemberPoints.__name__, [
+            UpdateOne({"_id": email}, {"$inc": {"total_points": points}, "$set": {"updated_at": now}}, upsert=True)
+            for email, points in points_by_email.items() if email and points
+        ])
+
+    def rebuild(self) -> int:
+        """
+        Recompute every total from ArcherRank, merged in on the server. Totals
+        of members who no longer have a rank are removed. Returns how many
+        were removed.
+        """
+        started = datetime.now()
+        self.db.aggregate(ArcherRank.__name__, [
+            {"$group": {"_id": "$email", "total_points": {"$sum": "$point"}}},
+            {"$set": {"updated_at": {"$literal": started}}},
+            {"$merge": {"into": MemberPoints.__name__, "on": "_id", "whenMatched": "replace", "whenNotMatched": "insert"}}
+        ])
+
+        # anything the merge did not touch, and no rank write changed since, has no ranks left
+        return self.db.delete_many(MemberPoints.__name__, {"updated_at": {"$lt": started}}).deleted_count
@@ -0,0 +1,52 @@
+from app.database.base import Database
+from app.database.models.outbox import OutboxMessage
+from bson import ObjectId
+from typing import Dict, Any, Optional
+from datetime import datetime, timedelta
+
+
+class OutboxRepository:
+    def __init__(self, db: Database):
+        self.db = db
+
+    def ensure_indexes(self) -> None:
+        """Index behind claiming the next due message."""
+        self.db.create_index(OutboxMessage.__name__, [("status", 1), ("next_attempt_at", 1)])
+
+    def enqueue(self, kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Record an outbound call, inside the caller's unit of work if there is one."""
+        return self.db.insert_document(OutboxMessage.__name__, OutboxMessage(kind=kind, payload=payload).to_bson())
+
+    def claim_due(self, now: datetime, lock: timedelta, query: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Take the next due message. Pushing next_attempt_at forward keeps other
+        dispatchers off it, and lets it be retried if this one dies mid-send.
+        """
+        return self.db.find_one_and_update(
+            OutboxMessage.__name__,
+            {**(query or {}), "status": "pending", "next_attempt_at": {"$lte": now}},
+            {"$set": {"next_attempt_at": now + lock, "updated_at": now}, "$inc": {"attempts": 1}}
+        )
+
+    def mark_sent(self, message_id: ObjectId):
+        return self.db.update_one(OutboxMessage.__name__, {"_id": message_id}, {
+            "status": "sent",
+            "last_error": None,
+            "updated_at": datetime.now()
+        })
+
+    def mark_skipped(self, message_id: ObjectId):
+        return self.db.update_one(OutboxMessage.__name__, {"_id": message_id}, {
+            "status": "skipped",
+            "updated_at": datetime.now()
+        })
+
+    def mark_failed(self, message_id: ObjectId, error: str, retry_at: Optional[datetime]):
+        """Schedule another attempt, or give up on the message when `retry_at` is None."""
+        data: Dict[str, Any] = {"last_error": error, "updated_at": datetime.now()}
+        if retry_at:
+            data["next_attempt_at"] = retry_at
+        else:
+            data["status"] = "failed"
+
+        return self.db.update_one(OutboxMessage.__name__, {"_id": message_id}, data)
@@ -3,6 +3,7 @@ from app.database.models.payment_history import PaymentHistory
 from app.database.models.plan import Plan
 from bson import ObjectId
 from typing import Dict, Any, List
+from datetime import datetime
 from app.config import config
 from app.utils.utils import capitalize_first_letter
 from flask_mailman import EmailMultiAlternatives
@@ -12,6 +13,57 @@ class PaymentHistoryRepository:
     def __init__(self, db: Database):
         self.db = db
 
+    def ensure_indexes(self) -> None:
+        """Indexes behind the revenue summary and the daily rollups."""
+        self.db.create_index(PaymentHistory.__name__, [("status", 1), ("payment_date", 1)])
+        self.db.create_index(PaymentHistory.__name__, [("payment_date", 1)])
+        self.db.create_index(PaymentHistory.__name__, [("created_at", 1)])
+
+    def summarize_revenue(self, now: datetime) -> Dict[str, Any]:
+        """
+        Successful payments today, this month and this year, and per month
+        for the last twelve, in one pass over that window.
+        """
+        today = datetime(now.year, now.month, now.day)
+        this_month = today.replace(day=1)
+        this_year = this_month.replace(month=1)
+        # the first day of the month eleven months back, never later than this_year
+        months_back = now.year * 12 + now.month - 1 - 11
+        window_start = datetime(months_back // 12, months_back % 12 + 1, 1)
+
+        def total(since: datetime) -> List[Dict[str, Any]]:
+            return [
+                {"$match": {"payment_date": {"$gte": since}}},
+                {"$group": {"_id": None, "amount": {"$sum": "$amount"}, "payments": {"$sum": 1}}},
+                {"$project": {"_id": 0}}
+            ]
+
+        result = self.db.aggregate(PaymentHistory.__name__, [
+            {"$match": {"status": "success", "payment_date": {"$gte": window_start}}},
+            {"$facet": {
+                "today": total(today),
+                "this_month": total(this_month),
+                "this_year": total(this_year),
+                "by_month": [
+                    {"$group": {
+                        "_id": {"$dateToString": {"format": "%Y-%m", "date": "$payment_date"}},
+                        "amount": {"$sum": "$amount"},
+                        "payments": {"$sum": 1}
+                    }},
+                    {"$sort": {"_id": 1}},
+                    {"$project": {"_id": 0, "month": "$_id", "amount": 1, "payments": 1}}
+                ]
+            }}
+        ])[0]
+
+        empty = {"amount": 0, "payments": 0}
+        return {
+            "today": (result["today"] or [empty])[0],
+            "this_month": (result["this_month"] or [empty])[0],
+            "this_year": (result["this_year"] or [empty])[0],
+            "by_month": result["by_month"]
+        }
+
     def get_by_user_id(self, user_id: str):
         """Fetch an archer rank by ID."""
         return self.db.get_one(PaymentHistory.__name__, {"user_id": ObjectId(user_id)})
@@ -25,6 +77,15 @@ class PaymentHistoryRepository:
         # fetch the inserted record
         return str(result.inserted_id)
     
+    def get_existing_references(self, references: List[str]) -> set:
+        """Return which of the given transaction references are already recorded."""
+        documents = self.db.find(PaymentHistory.__name__, {"reference": {"$in": references}}, {"reference": 1, "_id": 0})
+        return {document["reference"] for document in documents}
+
+    def bulk_write_payment_history(self, operations: List[Any]):
+        """Apply a batch of payment history writes."""
+        return self.db.bulk_write(PaymentHistory.__name__, operations)
+
     def all_payment_history_by_user_id(self, user_id: str) -> List[Dict[str, Any]]:
         """
             Get all payment history for a user
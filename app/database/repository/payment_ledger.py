@@ -0,0 +1,19 @@
+from app.database.base import Database
+from app.database.models.payment_ledger import PaymentLedger
+from typing import Dict, Any, Optional
+from datetime import datetime
+
+
+class PaymentLedgerRepository:
+    def __init__(self, db: Database):
+        self.db = db
+
+    def get_by_reference(self, reference: str) -> Optional[Dict[str, Any]]:
+        """Fetch the recorded status of a transaction. The reference is the _id, so this is an index lookup."""
+        return self.db.get_one(PaymentLedger.__name__, {"_id": reference})
+
+    def record(self, reference: str, status: str, source: str, amount: Optional[int] = None, paid_at: Optional[datetime] = None):
+        """Record the status of a transaction, replacing whatever was known before."""
+        entry = PaymentLedger(_id=reference, status=status, source=source, amount=amount, paid_at=paid_at).to_bson()
+        entry.pop("_id")
+        return self.db.modify_one(PaymentLedger.__name__, {"_id": reference}, {"$set": entry}, upsert=True)
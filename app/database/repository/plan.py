@@ -23,6 +23,11 @@ class PlanRepository:
         """Fetch a plan by registration."""
         return self.db.get_one(Plan.__name__, {"interval": "registration"})
 
+    def get_plan_ids_by_code(self) -> Dict[str, Any]:
+        """Map every Paystack plan code to the plan's ObjectId."""
+        plans = self.db.find(Plan.__name__, {"plan_code": {"$exists": True}}, {"plan_code": 1})
+        return {plan["plan_code"]: plan["_id"] for plan in plans}
+
     def get_all_plans(self):
         """Fetch all plans."""
         pipeline = [
@@ -45,10 +50,7 @@ class PlanRepository:
 
     def create_plan(self, data: Dict):
         """Insert a new plan record."""
-        result = self.db.insert_one(Plan.__name__, data)
-
-        # Fetch the inserted record
-        return self.get_by_id(str(result.inserted_id))
+        return self.db.insert_document(Plan.__name__, data)
 
     def find_and_update_plan(self, query: Dict[str, Any], data: Dict):
         """Find a plan by query and update the record."""
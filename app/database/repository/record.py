@@ -21,10 +21,7 @@ class RecordRepository:
 
     def create_record(self, data: Dict):
         """Insert a new record."""
-        result = self.db.insert_one(Record.__name__, data)
-
-        # Fetch the inserted record
-        return self.get_by_id(str(result.inserted_id))
+        return self.db.insert_document(Record.__name__, data)
 
     def find_and_update_record(self, query: Dict[str, Any], data: Dict):
         """Find a record by query and update the record."""
@@ -0,0 +1,109 @@
+from app.database.base import Database
+from app.database.models.payment_history import PaymentHistory
+from app.database.models.revenue_rollup import RevenueRollup
+from app.database.models.plan import Plan
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta
+
+# midnight of the payment date, the bucket a payment is summed into
+PAYMENT_DAY = {"$dateFromParts": {
+    "year": {"$year": "$payment_date"},
+    "month": {"$month": "$payment_date"},
+    "day": {"$dayOfMonth": "$payment_date"}
+}}
+
+
+class RevenueRollupRepository:
+    PERIOD_FORMATS = {"day": "%Y-%m-%d", "month": "%Y-%m", "year": "%Y"}
+    # days recomputed per aggregation on incremental runs
+    DAYS_PER_BATCH = 100
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    def ensure_indexes(self) -> None:
+        """Index behind the report date range."""
+        self.db.create_index(RevenueRollup.__name__, [("day", 1)])
+
+    def days_recorded_since(self, since: datetime) -> List[datetime]:
+        """The payment days of every payment recorded since `since`."""
+        days = self.db.aggregate(PaymentHistory.__name__, [
+            {"$match": {"created_at": {"$gte": since}}},
+            {"$group": {"_id": PAYMENT_DAY}},
+            {"$sort": {"_id": 1}}
+        ])
+        return [day["_id"] for day in days]
+
+    def roll_up(self, days: Optional[List[datetime]], started: datetime) -> int:
+        """
+        Recompute the buckets of `days`, or of every day when None, and merge
+        them in on the server. Buckets of those days that no payment falls in
+        any more are removed. Returns how many were removed.
+        """
+        if days is None:
+            self._merge({}, started)
+            return self.db.delete_many(RevenueRollup.__name__, {"rolled_up_at": {"$lt": started}}).deleted_count
+
+        removed = 0
+        for start in range(0, len(days), self.DAYS_PER_BATCH):
+            batch = days[start:start + self.DAYS_PER_BATCH]
+            self._merge({"$or": [
+                {"payment_date": {"$gte": day, "$lt": day + timedelta(days=1)}} for day in batch
+            ]}, started)
+            removed += self.db.delete_many(RevenueRollup.__name__, {
+                "day": {"$in": batch},
+                "rolled_up_at": {"$lt": started}
+            }).deleted_count
+        return removed
+
+    def _merge(self, match: Dict[str, Any], started: datetime) -> None:
+        self.db.aggregate(PaymentHistory.__name__, [
+            {"$match": match},
+            {"$group": {
+                "_id": {
+                    "day": PAYMENT_DAY,
+                    "plan_id": {"$ifNull": ["$plan_id", None]},
+                    # payments recorded before types were
+                    "type": {"$ifNull": ["$type", "other"]},
+                    "status": {"$ifNull": ["$status", None]}
+                },
+                "amount": {"$sum": "$amount"},
+                "payments": {"$sum": 1}
+            }},
+            {"$set": {
+                "day": "$_id.day",
+                "plan_id": "$_id.plan_id",
+                "type": "$_id.type",
+                "status": "$_id.status",
+                "rolled_up_at": {"$literal": started}
+            }},
+            {"$merge": {"into": RevenueRollup.__name__, "on": "_id", "whenMatched": "replace", "whenNotMatched": "insert"}}
+        ])
+
+    def report(self, since: datetime, until: datetime, period: str) -> List[Dict[str, Any]]:
+        """Revenue per period, plan, type and status for the days in [since, until)."""
+        return self.db.aggregate(RevenueRollup.__name__, [
+            {"$match": {"day": {"$gte": since, "$lt": until}}},
+            {"$group": {
+                "_id": {
+                    "period": {"$dateToString": {"format": self.PERIOD_FORMATS[period], "date": "$day"}},
+                    "plan_id": "$plan_id",
+                    "type": "$type",
+                    "status": "$status"
+                },
+                "amount": {"$sum": "$amount"},
+                "payments": {"$sum": "$payments"}
+            }},
+            {"$sort": {"_id.period": 1, "_id.type": 1, "_id.status": 1}},
+            {"$lookup": {"from": Plan.__name__, "localField": "_id.plan_id", "foreignField": "_id", "as": "plan"}},
+            {"$project": {
+                "_id": 0,
+                "period": "$_id.period",
+                "plan_id": {"$toString": "$_id.plan_id"},
+                "plan_name": {"$arrayElemAt": ["$plan.newplan", 0]},
+                "type": "$_id.type",
+                "status": "$_id.status",
+                "amount": 1,
+                "payments": 1
+            }}
+        ])
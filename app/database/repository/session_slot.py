@@ -0,0 +1,83 @@
+from app.database.base import Database
+from app.database.models.session_slot import SessionSlot, SessionHold
+from typing import Dict, Any, Optional
+from datetime import datetime
+
+
+class SessionSlotRepository:
+    def __init__(self, db: Database):
+        self.db = db
+
+    def get_by_date(self, entry_date: datetime):
+        """Fetch the slot document of a session."""
+        return self.db.get_one(SessionSlot.__name__, {"_id": SessionSlot.key_for(entry_date)})
+
+    def create_slot(self, entry_date: datetime, capacity: int, booked: int):
+        """Create the slot document of a session if no one else has yet."""
+        slot = SessionSlot(**{
+            "_id": SessionSlot.key_for(entry_date),
+            "session_date": datetime(entry_date.year, entry_date.month, entry_date.day),
+            "capacity": capacity,
+            "booked": booked,
+            "reserved": booked
+        })
+        data = slot.to_bson()
+        del data["_id"]
+
+        return self.db.modify_one(SessionSlot.__name__, {"_id": slot.id}, {"$setOnInsert": data}, upsert=True)
+
+    def reserve_hold(self, entry_date: datetime, hold: SessionHold) -> Optional[Dict[str, Any]]:
+        """
+        Take a place in a session, if there is one left.
+        Returns the updated slot, or None when the session is full or has no slot yet.
+        """
+        query = {
+            "_id": SessionSlot.key_for(entry_date),
+            "$expr": {"$lt": ["$reserved", "$capacity"]}
+        }
+        update = {
+            "$inc": {"reserved": 1},
+            "$push": {"holds": hold.model_dump()},
+            "$set": {"updated_at": datetime.now()}
+        }
+        return self.db.find_one_and_update(SessionSlot.__name__, query, update, projection={"holds": 0})
+
+    def release_expired_holds(self, entry_date: datetime):
+        """Drop holds whose payment window has passed and give their places back."""
+        now = datetime.now()
+        return self.db.modify_one(SessionSlot.__name__, {
+            "_id": SessionSlot.key_for(entry_date),
+            "holds.expires_at": {"$lte": now}
+        }, [
+            {"$set": {"holds": {"$filter": {"input": "$holds", "cond": {"$gt": ["$$this.expires_at", now]}}}}},
+            {"$set": {"reserved": {"$add": ["$booked", {"$size": "$holds"}]}, "updated_at": now}}
+        ])
+
+    def confirm_hold(self, entry_date: datetime, hold_id: Optional[str]):
+        """Turn a hold into a booking once its payment has gone through."""
+        key = SessionSlot.key_for(entry_date)
+        if hold_id:
+            result = self.db.modify_one(SessionSlot.__name__, {"_id": key, "holds.hold_id": hold_id}, {
+                "$pull": {"holds": {"hold_id": hold_id}},
+                "$inc": {"booked": 1},
+                "$set": {"updated_at": datetime.now()}
+            })
+            if result.matched_count:
+                return result
+
+        # the hold already expired (or predates holds), the place is taken anyway since it was paid for
+        return self.db.modify_one(SessionSlot.__name__, {"_id": key}, {
+            "$inc": {"booked": 1, "reserved": 1},
+            "$set": {"updated_at": datetime.now()}
+        })
+
+    def release_hold(self, entry_date: datetime, hold_id: str):
+        """Give a held place back, e.g. when the payment could not be started."""
+        return self.db.modify_one(SessionSlot.__name__, {
+            "_id": SessionSlot.key_for(entry_date),
+            "holds.hold_id": hold_id
+        }, {
+            "$pull": {"holds": {"hold_id": hold_id}},
+            "$inc": {"reserved": -1},
+            "$set": {"updated_at": datetime.now()}
+        })
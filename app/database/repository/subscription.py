@@ -3,11 +3,62 @@ from app.database.models.subscription import Subscription
 from app.database.models.plan import Plan
 from bson import ObjectId
 from typing import Dict, Any, List
+from pymongo import UpdateMany
+from pymongo.errors import DuplicateKeyError
+from datetime import datetime
 
 class SubscriptionRepository:
+    # what the admin listing returns, in index order: sorted by name, then email
+    LISTING_FIELDS = ("name", "email", "status", "image_url")
+
     def __init__(self, db: Database):
         self.db = db
 
+    def ensure_indexes(self) -> None:
+        """
+        Indexes behind the expiry sweep and the reconciliation lookups, and one
+        subscription per Paystack subscription code. Raises DuplicateKeyError
+        while duplicate codes exist.
+        """
+        # equality on status, then range on end_date
+        self.db.create_index(Subscription.__name__, [("status", 1), ("end_date", 1)])
+        # holds every field the admin listing returns, so its pages are read from the index alone
+        self.db.create_index(Subscription.__name__, [(key, 1) for key in self.LISTING_FIELDS])
+        self.db.create_index(Subscription.__name__, [("user_id", 1)])
+        # subscriptions created before Paystack sent a code have none, leave them out
+        self.db.create_index(
+            Subscription.__name__, [("subscription_code", 1)], name="subscription_code_unique",
+            unique=True, partialFilterExpression={"subscription_code": {"$type": "string"}}
+        )
+        # the plain index it replaces
+        self.db.drop_index(Subscription.__name__, "subscription_code_1")
+
+    def duplicate_codes(self) -> List[str]:
+        """Subscription codes shared by more than one subscription, which keep the unique index from building."""
+        return [group["_id"] for group in self.db.aggregate(Subscription.__name__, [
+            {"$match": {"subscription_code": {"$type": "string"}}},
+            {"$group": {"_id": "$subscription_code", "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gt": 1}}}
+        ])]
+
+    @staticmethod
+    def user_details(user: Dict[str, Any]) -> Dict[str, Any]:
+        """The user fields copied onto their subscriptions."""
+        return {
+            "name": f"{user.get('firstName')} {user.get('lastName')}",
+            "image_url": user.get('image_url')
+        }
+
+    def sync_user_details(self, user: Dict[str, Any]):
+        """Copy a user's changed name or image onto all their subscriptions."""
+        return self.db.update_many(Subscription.__name__, {"user_id": user["_id"]}, self.user_details(user))
+
+    def backfill_user_details(self, users: List[Dict[str, Any]]):
+        """Copy the details of each user onto their subscriptions, in one batch."""
+        return self.db.bulk_write(Subscription.__name__, [
+            UpdateMany({"user_id": user["_id"]}, {"$set": self.user_details(user)}) for user in users
+        ])
+
     def get_by_email(self, email: str):
         """Fetch a subscription by email."""
         return self.db.get_one(Subscription.__name__, {"email": email})
@@ -33,60 +84,110 @@ class SubscriptionRepository:
         return self.db.get_all(Subscription.__name__)
 
     def create_subscription(self, data: Dict):
-        """Insert a new subscription record."""
-        result = self.db.insert_one(Subscription.__name__, data)
+        """
+        Insert a new subscription record. A redelivered subscription.create
+        event returns the stored subscription instead of adding a second one.
+        """
+        if data.get("subscription_code"):
+            query = {"subscription_code": data["subscription_code"]}
+            try:
+                return self.db.upsert_document(Subscription.__name__, query, data)
+            except DuplicateKeyError:
+                # a concurrent delivery inserted it between our match and insert, it matches now
+                return self.db.upsert_document(Subscription.__name__, query, data)
 
-        # fetch the inserted record
-        return self.get_by_id(str(result.inserted_id))
+        return self.db.insert_document(Subscription.__name__, data)
     
     def find_and_update_subscription(self, query: Dict[str, Any], data: Dict):
         """Find a subscription by query and update the record."""
         return self.db.update_one(Subscription.__name__, query, data)
     
+    def get_by_subscription_codes(self, subscription_codes: List[str]) -> List[Dict[str, Any]]:
+        """Fetch every subscription whose code is in the list, in one query."""
+        return self.db.find(Subscription.__name__, {"subscription_code": {"$in": subscription_codes}})
+
+    def get_due_subscriptions(self, since: datetime, until: datetime) -> List[Dict[str, Any]]:
+        """Fetch live subscriptions whose billing date fell between `since` and `until`."""
+        return self.db.find(Subscription.__name__, {
+            "status": {"$in": ["active", "non-renewing", "attention"]},
+            "end_date": {"$gte": since, "$lt": until}
+        })
+
+    def transition_lapsed(self, from_status: str, to_status: str, ended_before: datetime):
+        """Move every subscription in `from_status` whose end_date is before `ended_before` to `to_status`."""
+        return self.db.update_many(
+            Subscription.__name__,
+            {"status": from_status, "end_date": {"$lt": ended_before}},
+            {"status": to_status, "updated_at": datetime.now()}
+        )
+
+    def bulk_write_subscriptions(self, operations: List[Any]):
+        """Apply a batch of subscription writes."""
+        return self.db.bulk_write(Subscription.__name__, operations)
+
     def find_and_cancel_subscription(self, query: Dict[str, Any], status: str):
         """Find a subscription by query and delete the record."""
         return self.db.update_one(Subscription.__name__, query, {
             "status": status
         })
     
-    def get_subscriptions_with_user_details(self) -> List[Dict[str, Any]]:
+    def get_subscriptions_with_user_details(self, page: int, limit: int) -> Dict[str, Any]:
         """
-        Retrieve subscriptions with user name, email, and status.
+        A page of subscriptions with the user's name and image, sorted by name.
+        The fields are denormalized onto each subscription and all sit in one
+        index, so the page is read from the index without touching a document.
         """
-        pipeline = [
-            {
-                "$lookup": {
-                    "from": "User",
-                    "localField": "user_id",
-                    "foreignField": "_id",
-                    "as": "user_details"
-                }
-            },
-            {
-                "$unwind": {
-                    "path": "$user_details",
-                    "preserveNullAndEmptyArrays": False
-                }
-            },
-            {
-                "$project": {
-                    "_id": 0,
-                    "name": {
-                        "$concat": [
-                            "$user_details.firstName",
-                            " ",
-                            "$user_details.lastName"
-                        ]
-                    },
-                    "image_url": "$user_details.image_url",
-                    "email": "$email",
-                    "status": "$status"
-                }
-            }
-        ]
+        collection = self.db.get_collection(Subscription.__name__)
+        # like the old inner join, subscriptions without a user (or not backfilled yet) are left out
+        query = {"name": {"$ne": None}}
+        total = collection.count_documents(query)
 
-        return self.db.aggregate(Subscription.__name__, pipeline)
+        docs = list(
+            collection.find(query, {"_id": 0, **{key: 1 for key in self.LISTING_FIELDS}})
+            .sort([(key, 1) for key in self.LISTING_FIELDS])
+            .skip((page - 1) * limit)
+            .limit(limit)
+        )
+
+        total_pages = (total + limit - 1) // limit
+        return {
+            "total": total,
+            "page": page,
+            "per_page": limit,
+            "prev": page - 1 if page > 1 else None,
+            "next": page + 1 if page < total_pages else None,
+            "total_page": total_pages,
+            "docs": docs
+        }
     
+    def summarize(self) -> Dict[str, Any]:
+        """Subscriptions per status and active subscribers per plan, in one pass over the collection."""
+        result = self.db.aggregate(Subscription.__name__, [
+            {"$facet": {
+                "by_status": [
+                    {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+                ],
+                "active_per_plan": [
+                    {"$match": {"status": "active"}},
+                    {"$group": {"_id": "$plan_id", "active_users": {"$sum": 1}}},
+                    # one lookup per plan, not per subscription
+                    {"$lookup": {"from": Plan.__name__, "localField": "_id", "foreignField": "_id", "as": "plan"}},
+                    {"$project": {
+                        "_id": 0,
+                        "plan_id": {"$toString": "$_id"},
+                        "plan_name": {"$arrayElemAt": ["$plan.newplan", 0]},
+                        "active_users": 1
+                    }},
+                    {"$sort": {"active_users": -1}}
+                ]
+            }}
+        ])[0]
+
+        return {
+            "by_status": {group["_id"]: group["count"] for group in result["by_status"]},
+            "active_per_plan": result["active_per_plan"]
+        }
+
     def get_active_users_by_plan(self) -> List[Dict[str, Any]]:
         """
         Gets the number of active users for each plan, including plans with zero active users.
@@ -17,10 +17,7 @@ class TeamRepository:
 
     def create_team(self, data: Dict):
         """Insert a new team record."""
-        result = self.db.insert_one(Team.__name__, data)
-
-        # Fetch the inserted record
-        return self.get_by_id(str(result.inserted_id))
+        return self.db.insert_document(Team.__name__, data)
 
     def find_and_update_team(self, query: Dict[str, Any], data: Dict):
         """Find a team by query and update the record."""
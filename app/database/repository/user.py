@@ -1,14 +1,41 @@
 from app.database.base import Database
 from app.database.models.user import User
 from bson import ObjectId
-from typing import Dict, Any
+from typing import Callable, Dict, Any, List, Optional
 from flask_mailman import EmailMultiAlternatives
 from app.utils.utils import capitalize_first_letter
+from app.utils.lru_cache import LRUCache
 from app.config import config
 
 class UserRepository:
+    # what webhook handlers need to know about the user behind a Paystack customer code
+    # profile fields stay out: only the worker that changes them drops its entry, the others would copy stale ones
+    CUSTOMER_FIELDS = {"customer_code": 1, "plan_id": 1}
+    # copied onto other collections, the profile listeners are told when they change
+    PROFILE_FIELDS = {"firstName": 1, "lastName": 1, "image_url": 1}
+
     def __init__(self, db: Database):
         self.db = db
+        # customer_code -> CUSTOMER_FIELDS. A customer code never moves to another user,
+        # entries are dropped when the user's plan changes in this process
+        self.customers = LRUCache(max_entries=config.CUSTOMER_DIRECTORY_MAX_ENTRIES, ttl=config.CUSTOMER_DIRECTORY_TTL_SECONDS)
+        # called with {_id, *PROFILE_FIELDS} after a user's profile fields are updated
+        self.profile_listeners: List[Callable[[Dict[str, Any]], Any]] = []
+
+    def ensure_indexes(self) -> None:
+        """
+        Indexes behind the webhook lookups by Paystack customer code and one
+        account per email. Raises DuplicateKeyError while duplicate emails exist.
+        """
+        self.db.create_index(User.__name__, [("customer_code", 1)])
+        self.db.create_index(User.__name__, [("email", 1)], unique=True)
+
+    def duplicate_emails(self) -> List[str]:
+        """Emails shared by more than one user, which keep the unique index from building."""
+        return [group["_id"] for group in self.db.aggregate(User.__name__, [
+            {"$group": {"_id": "$email", "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gt": 1}}}
+        ])]
 
     def get_by_email(self, email: str):
         """Fetch a user by email."""
@@ -22,24 +49,89 @@ class UserRepository:
         """Fetch a user by ID."""
         return self.db.get_one(User.__name__, {"customer_code": customer_code})
 
+    def get_customer(self, customer_code: str) -> Optional[Dict[str, Any]]:
+        """Fetch the _id and plan_id of the user behind a customer code, from the customer directory when possible."""
+        customer = self.customers.get(customer_code)
+        if customer is None:
+            customer = self.db.get_one(User.__name__, {"customer_code": customer_code}, self.CUSTOMER_FIELDS)
+            if customer:
+                self.customers.set(customer_code, customer)
+        return customer
+
+    def warm_customers(self) -> int:
+        """Load the most recently updated users into the customer directory."""
+        cursor = self.db.get_collection(User.__name__).find(
+            {"customer_code": {"$ne": None}}, self.CUSTOMER_FIELDS
+        ).sort("updated_at", -1).limit(self.customers.max_entries)
+
+        # oldest first, so the most recent users are the last to be evicted
+        customers = list(cursor)
+        for customer in reversed(customers):
+            self.customers.set(customer["customer_code"], customer)
+        return len(customers)
+
+    def forget_customers(self, query: Dict[str, Any]) -> None:
+        """Drop the directory entries of the users matching a query."""
+        if isinstance(query.get("customer_code"), str):
+            self.customers.delete(query["customer_code"])
+        elif isinstance(query.get("_id"), (ObjectId, str)):
+            user_id = ObjectId(query["_id"])
+            self.customers.delete_where(lambda customer: customer.get("_id") == user_id)
+        else:
+            self.customers.clear()
+
+    def count_by_status(self) -> Dict[str, int]:
+        """Number of members at each onboarding step, admins left out."""
+        return {
+            group["_id"]: group["count"]
+            for group in self.db.aggregate(User.__name__, [
+                {"$match": {"role": {"$ne": "admin"}}},
+                {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+            ])
+        }
+
+    def iter_profiles(self, batch_size: int = 1000):
+        """Every user's _id and PROFILE_FIELDS, read in batches."""
+        return self.db.get_collection(User.__name__).find({}, self.PROFILE_FIELDS, batch_size=batch_size)
+
+    def get_profile(self, user_id: Any) -> Optional[Dict[str, Any]]:
+        """A user's _id and PROFILE_FIELDS, read from the database rather than the customer directory."""
+        return self.db.get_one(User.__name__, {"_id": ObjectId(user_id)}, self.PROFILE_FIELDS)
+
+    def get_by_customer_codes(self, customer_codes: List[str]) -> List[Dict[str, Any]]:
+        """Fetch the users behind a list of Paystack customer codes, in one query."""
+        return self.db.find(User.__name__, {"customer_code": {"$in": customer_codes}}, {"customer_code": 1, "plan_id": 1, "email": 1, **self.PROFILE_FIELDS})
+
     def get_all_users(self):
         """Fetch all users."""
         return self.db.get_all(User.__name__)
 
     def create_user(self, data: Dict):
-        """Insert a new user record."""
-        result = self.db.insert_one(User.__name__, data)
+        """Insert a new user record. Raises DuplicateKeyError when the email is taken."""
+        result = self.db.insert_document(User.__name__, data)
 
-        # fetch the inserted record
-        return str(result.inserted_id)
+        if result.get("customer_code"):
+            self.customers.set(result["customer_code"], {key: result.get(key) for key in ("_id", *self.CUSTOMER_FIELDS)})
+        return result
 
     def find_and_update_user(self, query: Dict[str, Any], data: Dict):
         """Find a user by query and update the record."""
-        return self.db.update_one(User.__name__, query, data)
+        result = self.db.update_one(User.__name__, query, data)
+
+        if self.CUSTOMER_FIELDS.keys() & data.keys():
+            self.forget_customers(query)
+
+        if self.profile_listeners and result.modified_count and self.PROFILE_FIELDS.keys() & data.keys():
+            user = self.db.get_one(User.__name__, query, self.PROFILE_FIELDS)
+            for listener in self.profile_listeners:
+                listener(user)
+        return result
     
     def find_and_delete_user(self, query: Dict[str, Any]):
         """Find a user by query and delete the record."""
-        return self.db.delete_one(User.__name__, query)
+        result = self.db.delete_one(User.__name__, query)
+        self.forget_customers(query)
+        return result
     
     def send_welcome_email(self, user: User) -> None:
         subject = " Welcome to Zen Archery!"
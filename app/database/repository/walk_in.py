@@ -10,10 +10,7 @@ class WalkInRepository:
 
     def create_walk_in(self, data: Dict):
         """Insert a new record."""
-        result = self.db.insert_one(WalkIn.__name__, data)
-
-        # Fetch the inserted record
-        return self.get_by_id(str(result.inserted_id))
+        return self.db.insert_document(WalkIn.__name__, data)
     
     def get_by_id(self, walk_ins_id: str):
         """Fetch a Walk-Ins by ID."""
@@ -47,4 +44,14 @@ class WalkInRepository:
             }
         ]
         
-        return self.db.aggregate(WalkIn.__name__, pipeline)
\ No newline at end of file
+        return self.db.aggregate(WalkIn.__name__, pipeline)
+
+    def summarize_day(self, day: datetime) -> Dict[str, int]:
+        """Number of walk-ins on a day and what they paid."""
+        start_of_day = datetime(day.year, day.month, day.day)
+        result = self.db.aggregate(WalkIn.__name__, [
+            {"$match": {"entry_date": {"$gte": start_of_day, "$lt": start_of_day + timedelta(days=1)}}},
+            {"$group": {"_id": None, "walk_ins": {"$sum": 1}, "amount": {"$sum": "$amount"}}},
+            {"$project": {"_id": 0}}
+        ])
+        return result[0] if result else {"walk_ins": 0, "amount": 0}
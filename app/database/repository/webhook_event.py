@@ -0,0 +1,26 @@
+from app.database.base import Database
+from app.database.models.webhook_event import WebhookEvent
+from typing import Dict, Any, Iterator, Optional
+from datetime import datetime
+
+
+class WebhookEventRepository:
+    def __init__(self, db: Database):
+        self.db = db
+
+    def ensure_indexes(self) -> None:
+        """Index behind exporting events in the order they arrived."""
+        self.db.create_index(WebhookEvent.__name__, [("received_at", 1)])
+
+    def archive(self, event: str, data: Dict[str, Any]):
+        """Keep a received webhook for later replays."""
+        return self.db.insert_one(WebhookEvent.__name__, WebhookEvent(event=event, data=data).to_bson())
+
+    def iter_events(self, since: Optional[datetime] = None, until: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """Stream archived events oldest first, without loading them all."""
+        query: Dict[str, Any] = {}
+        if since or until:
+            query["received_at"] = {key: value for key, value in (("$gte", since), ("$lt", until)) if value}
+
+        cursor = self.db.get_collection(WebhookEvent.__name__).find(query, {"_id": 0}).sort("received_at", 1)
+        yield from cursor
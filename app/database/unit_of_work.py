@@ -0,0 +1,57 @@
+from typing import Callable, Optional, TypeVar
+from pymongo.client_session import ClientSession
+from pymongo.errors import PyMongoError
+from pymongo.topology_description import TOPOLOGY_TYPE
+import logging
+
+from app.database.base import Database, _session
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class UnitOfWork:
+    """
+    Runs a block of Database calls in one multi-document transaction.
+
+    Repositories need no changes: every Database call made while the block
+    runs joins the transaction through a context variable. The commit is
+    retried on transient errors by pymongo's `with_transaction`. On a
+    standalone server, which has no transactions, the block runs as plain
+    writes.
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+        self.client = db.db.client
+        self._warned = False
+
+    def supports_transactions(self) -> bool:
+        try:
+            topology_type = self.client.topology_description.topology_type
+        except (AttributeError, PyMongoError):
+            return False
+        return topology_type in (TOPOLOGY_TYPE.ReplicaSetWithPrimary, TOPOLOGY_TYPE.Sharded, TOPOLOGY_TYPE.LoadBalanced)
+
+    def run(self, work: Callable[[], T]) -> T:
+        """Run `work()` inside a transaction and return its result once committed."""
+        if _session.get() is not None:
+            # already inside a unit of work, join it
+            return work()
+
+        if not self.supports_transactions():
+            if not self._warned:
+                logger.warning("MongoDB deployment does not support transactions, units of work run without one.")
+                self._warned = True
+            return work()
+
+        def callback(session: ClientSession) -> T:
+            token = _session.set(session)
+            try:
+                return work()
+            finally:
+                _session.reset(token)
+
+        with self.client.start_session() as session:
+            return session.with_transaction(callback)
@@ -5,11 +5,13 @@ from flask_mailman import Mail
 import certifi
 import ssl
 
-from pymongo.errors import ServerSelectionTimeoutError
+from pymongo.errors import DuplicateKeyError, ServerSelectionTimeoutError
 
 # Import database connection
 from app.database.connection import mongo
 from app.database.base import Database
+from app.database.unit_of_work import UnitOfWork
+from app.database.container import RepositoryContainer
 
 # Import repositories
 from app.database import (
@@ -23,7 +25,14 @@ from app.database import (
     ArcherRankRepository,
     PaymentHistoryRepository,
     ChampionUserRepository,
-    WalkInRepository
+    WalkInRepository,
+    SessionSlotRepository,
+    OutboxRepository,
+    WebhookEventRepository,
+    PaymentLedgerRepository,
+    MemberPointsRepository,
+    RevenueRollupRepository,
+    JobStateRepository
 )
 
 # Import usecases
@@ -38,9 +47,14 @@ from app.usecases import (
     ArcherRankUseCase,
     PaymentHistoryUseCase,
     ChampionUserUseCase,
-    FileUploadUseCase
+    FileUploadUseCase,
+    AdminUseCase,
+    RevenueUseCase
 )
 
+# Import cli commands
+from app.cli import reconcile_paystack_command, webhooks_cli, subscriptions_cli, rebuild_member_points_command, rollup_revenue_command
+
 # Import blueprints
 from app.v1 import (
     auth_bp,
@@ -54,14 +68,23 @@ from app.v1 import (
     payment_bp,
     payment_history_bp,
     champion_user_bp,
-    file_upload_bp
+    file_upload_bp,
+    health_bp,
+    admin_bp
 )
 
 
 import logging
+import time
 from typing import Dict
-import cloudinary
 from app.config import config
+from app.services.cache.setup import response_cache
+from app.services.scheduler.setup import scheduler
+from app.services.paystack.setup import paystack_outbox
+from app.services.paystack.payment import PayStackPayment
+from app.services.readiness.setup import readiness
+from app.services.background.setup import background_tasks
+from app.services.realtime.setup import payment_feed, leaderboard_feed
 
 
 # Initialize extensions
@@ -69,18 +92,30 @@ jwt = JWTManager()
 cors = CORS()
 mail = Mail()
 
-cloudinary.config(
-    cloud_name=config.CLOUD_NAME,
-    api_key=config.CLOUDINARY_API_KEY,
-    api_secret=config.CLOUDINARY_API_SECRET,
-    secure=True
-)
-
 # Logger setup
 logger = logging.getLogger(__name__)
 app = Flask(__name__)
 
+def start_scheduler(flask_app: Flask) -> None:
+    """
+    Run the background jobs in this process. Only the servers call this
+    (gunicorn workers, the ASGI app and `python run.py`), so `flask` CLI
+    commands never take the scheduler lease. Does nothing for apps other
+    than this one, such as the benchmark apps served by the same config.
+    """
+    if 'database' not in getattr(flask_app, 'extensions', {}):
+        return
+    if config.SCHEDULER_ENABLED:
+        scheduler.start(flask_app, flask_app.extensions['database'])
+
+
+def stop_scheduler() -> None:
+    scheduler.stop()
+
+
 def init_app():
+    boot_started = time.perf_counter()
+
     # global database
     app.config.from_prefixed_env()
     app.config["MAIL_SSL_CONTEXT"] = ssl.create_default_context()
@@ -99,47 +134,99 @@ def init_app():
     handler.setLevel(logging.INFO)
     app.logger.addHandler(handler)
 
-    # Check MongoDB connection and initialize Database instance
-    try:
-        # Perform a test connection to MongoDB to check if it’s available
-        mongo.cx.server_info()  # This will raise an immediate error if MongoDB is not available
-
-        app.extensions['database'] = Database(mongo.db)
-        app.logger.info("MongoDB connection established.")
-    except ServerSelectionTimeoutError as e:
-        # Log the detailed connection error
-        app.logger.error(f"Failed to connect to MongoDB: {e.details}")
-        raise RuntimeError("Cannot start app: Database connection failed.")
+    # initialize the Database instance, the client connects on first use
+    app.extensions['database'] = Database(mongo.db)
+    app.extensions['unit_of_work'] = UnitOfWork(app.extensions['database'])
 
     # initialize repositories and usecases
     db_instance = app.extensions['database']  # Ensure 'database' is added to extensions
 
-    # repositories
-    subscription_repo = SubscriptionRepository(db_instance)
-    user_repo = UserRepository(db_instance)
-    token_repo = TokenRepository(db_instance)
+    # repositories, one instance each for the life of the app
+    repositories = RepositoryContainer(db_instance)
+    app.extensions['repositories'] = repositories
+
+    subscription_repo = repositories.get(SubscriptionRepository)
+    user_repo = repositories.get(UserRepository)
+    token_repo = repositories.get(TokenRepository)
     contact_us_repo = ContactUsRepository(mail)
-    plan_repo = PlanRepository(db_instance)
-    team_repo = TeamRepository(db_instance)
-    record_repo = RecordRepository(db_instance)
-    archer_rank_repo = ArcherRankRepository(db_instance)
-    payment_history_repo = PaymentHistoryRepository(db_instance)
-    champion_user_repo = ChampionUserRepository(db_instance)
-    walk_in_repo = WalkInRepository(db_instance)
+    plan_repo = repositories.get(PlanRepository)
+    team_repo = repositories.get(TeamRepository)
+    record_repo = repositories.get(RecordRepository)
+    archer_rank_repo = repositories.get(ArcherRankRepository)
+    payment_history_repo = repositories.get(PaymentHistoryRepository)
+    champion_user_repo = repositories.get(ChampionUserRepository)
+    walk_in_repo = repositories.get(WalkInRepository)
+    session_slot_repo = repositories.get(SessionSlotRepository)
+    outbox_repo = repositories.get(OutboxRepository)
+    payment_ledger_repo = repositories.get(PaymentLedgerRepository)
+    member_points_repo = repositories.get(MemberPointsRepository)
+    revenue_rollup_repo = repositories.get(RevenueRollupRepository)
+
+    # keep the user details copied onto subscriptions current
+    user_repo.profile_listeners.append(subscription_repo.sync_user_details)
+
+    background_tasks.init_app(app)
+    payment_feed.init_app(db_instance)
+    leaderboard_feed.init_app(db_instance)
+
+    # boot work that needs the database
+    def check_connection():
+        # Perform a test connection to MongoDB to check if it’s available
+        mongo.cx.server_info()
+        app.logger.info("MongoDB connection established.")
+
+    def ensure_indexes():
+        try:
+            subscription_repo.ensure_indexes()
+        except DuplicateKeyError:
+            # serve anyway, redelivered subscription.create events only match once the index exists
+            app.logger.error(f"SubscriptionRepository: merge the subscriptions with codes {subscription_repo.duplicate_codes()[:20]} to enforce unique codes.")
+        for repo in (user_repo, champion_user_repo):
+            try:
+                repo.ensure_indexes()
+            except DuplicateKeyError:
+                # serve anyway, registration only rejects duplicates once the index exists
+                app.logger.error(f"{type(repo).__name__}: merge the accounts of {repo.duplicate_emails()[:20]} to enforce unique emails.")
+        archer_rank_repo.ensure_indexes()
+        payment_history_repo.ensure_indexes()
+        revenue_rollup_repo.ensure_indexes()
+        outbox_repo.ensure_indexes()
+        repositories.get(WebhookEventRepository).ensure_indexes()
+
+    def warm_customer_directory():
+        # webhook handlers find users by customer code, load the recent ones up front
+        app.logger.info(f"Loaded {user_repo.warm_customers()} users into the customer directory.")
+
+    readiness.add_task("mongo", check_connection)
+    readiness.add_task("response_cache", lambda: response_cache.init_app(db_instance))
+    readiness.add_task("indexes", ensure_indexes)
+    readiness.add_task("customer_directory", warm_customer_directory)
     
     # usecases
-    subscription_use_case = SubscriptionUseCase(subscription_repo, user_repo, plan_repo, walk_in_repo)
-    user_use_case = UserUseCase(user_repo, subscription_repo, plan_repo, archer_rank_repo, payment_history_repo)
+    subscription_use_case = SubscriptionUseCase(subscription_repo, user_repo, plan_repo, walk_in_repo, session_slot_repo, payment_ledger_repo)
+    user_use_case = UserUseCase(user_repo, subscription_repo, plan_repo, member_points_repo, payment_history_repo)
     contact_us_use_case = ContactUsUseCase(contact_us_repo)
     token_use_case = TokenUseCase(token_repo)
     plan_use_case = PlanUseCase(plan_repo)
     team_use_case = TeamUseCase(team_repo)
     record_use_case = RecordUseCase(record_repo)
-    archer_rank_use_case = ArcherRankUseCase(archer_rank_repo)
+    archer_rank_use_case = ArcherRankUseCase(archer_rank_repo, member_points_repo, app.extensions['unit_of_work'])
     payment_history_usecase = PaymentHistoryUseCase(payment_history_repo)
-    champion_user_usecase = ChampionUserUseCase(champion_user_repo, payment_history_repo)
+    champion_user_usecase = ChampionUserUseCase(champion_user_repo, payment_history_repo,
+                                                export_batch_size=config.CHAMPION_EXPORT_BATCH_SIZE)
+    admin_use_case = AdminUseCase(user_repo, subscription_repo, payment_history_repo, walk_in_repo, champion_user_repo,
+                                  summary_ttl=config.ADMIN_SUMMARY_TTL_SECONDS)
+    revenue_use_case = RevenueUseCase(revenue_rollup_repo, repositories.get(JobStateRepository))
     file_upload_usecase = FileUploadUseCase()
 
+    # services
+    paystack_payment = PayStackPayment(
+        repositories,
+        app.extensions['unit_of_work'],
+        paystack_outbox,
+        plan_cache_ttl=config.PAYSTACK_PLAN_CACHE_TTL_SECONDS
+    )
+
     # intialize blueprints with usecases
     auth_bp.user_use_case = user_use_case
     auth_bp.token_use_case = token_use_case
@@ -152,9 +239,12 @@ def init_app():
     archer_rank_bp.archer_rank_use_case = archer_rank_use_case
     subscription_bp.subscription_use_case = subscription_use_case
     payment_bp.payment_history_usecase = payment_history_usecase
+    payment_bp.paystack_payment = paystack_payment
     payment_history_bp.payment_history_usecase = payment_history_usecase
     champion_user_bp.champion_user_use_case = champion_user_usecase
     file_upload_bp.file_upload_use_case = file_upload_usecase
+    admin_bp.admin_use_case = admin_use_case
+    admin_bp.revenue_use_case = revenue_use_case
 
 
     # Register blueprints
@@ -170,6 +260,31 @@ def init_app():
     app.register_blueprint(payment_history_bp, url_prefix='/api/v1/history')
     app.register_blueprint(champion_user_bp, url_prefix='/api/v1/championship')
     app.register_blueprint(file_upload_bp, url_prefix='/api/v1/file')
+    app.register_blueprint(health_bp, url_prefix='/api/v1/health')
+    app.register_blueprint(admin_bp, url_prefix='/api/v1/admin')
+
+    # Register cli commands
+    app.cli.add_command(reconcile_paystack_command)
+    app.cli.add_command(webhooks_cli)
+    app.cli.add_command(subscriptions_cli)
+    app.cli.add_command(rebuild_member_points_command)
+    app.cli.add_command(rollup_revenue_command)
+
+    if config.LAZY_INIT:
+        # serve straight away, /api/v1/health/ready reports when the boot work is done
+        readiness.start(app)
+    else:
+        try:
+            readiness.run()
+        except ServerSelectionTimeoutError as e:
+            # Log the detailed connection error
+            app.logger.error(f"Failed to connect to MongoDB: {e.details}")
+            raise RuntimeError("Cannot start app: Database connection failed.")
+
+    # background jobs, run once a server calls start_scheduler
+    scheduler.add_job("subscription_expiry", config.SUBSCRIPTION_SWEEP_INTERVAL_SECONDS, subscription_use_case.expire_subscriptions)
+    scheduler.add_job("paystack_outbox", config.OUTBOX_RETRY_INTERVAL_SECONDS, lambda now: paystack_outbox.dispatch(outbox_repo))
+    scheduler.add_job(RevenueUseCase.JOB, config.REVENUE_ROLLUP_INTERVAL_SECONDS, revenue_use_case.roll_up)
 
     # jwt error handlers
     @jwt.expired_token_loader
@@ -194,4 +309,5 @@ def init_app():
     def revoked_token_callback(jwt_header, jwt_payload):
         return {"error": True, "message": "Token has been revoked"}, 401
 
+    app.logger.info(f"App initialised in {time.perf_counter() - boot_started:.2f}s ({'lazy' if config.LAZY_INIT else 'eager'} mode).")
     return app
\ No newline at end of file
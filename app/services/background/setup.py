@@ -0,0 +1,4 @@
+from app.config import config
+from app.services.background.tasks import BackgroundTasks
+
+background_tasks = BackgroundTasks(max_workers=config.BACKGROUND_TASK_WORKERS)
@@ -0,0 +1,32 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from flask import Flask
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundTasks:
+    """
+    Runs work a request should not wait for, like third-party calls and
+    emails, on a small thread pool. Each task gets an app context. A failed
+    task is logged, not retried, so callers need a way to finish the work
+    later (see register_user and create_subscription).
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.app: Optional[Flask] = None
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="background-task")
+
+    def init_app(self, app: Flask) -> None:
+        self.app = app
+
+    def submit(self, name: str, fn: Callable, *args, **kwargs) -> Future:
+        return self._executor.submit(self._run, name, fn, *args, **kwargs)
+
+    def _run(self, name: str, fn: Callable, *args, **kwargs) -> Any:
+        try:
+            with self.app.app_context():
+                return fn(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"Background task {name} failed: {str(e)}")
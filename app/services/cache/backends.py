@@ -0,0 +1,107 @@
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+from pymongo.collection import Collection
+import time
+
+
+class CacheBackend(ABC):
+    """Stores cached responses by key, grouped by namespace so a whole group can be dropped at once."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def set(self, namespace: str, key: str, entry: Dict[str, Any], ttl: int) -> None:
+        ...
+
+    @abstractmethod
+    def invalidate(self, namespace: str) -> None:
+        ...
+
+
+class NullCacheBackend(CacheBackend):
+    """Caches nothing, used when caching is switched off."""
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return None
+
+    def set(self, namespace: str, key: str, entry: Dict[str, Any], ttl: int) -> None:
+        pass
+
+    def invalidate(self, namespace: str) -> None:
+        pass
+
+
+class LocalCacheBackend(CacheBackend):
+    """
+    In-process cache. Invalidations only reach the worker that made the
+    change, other workers serve their copy until it expires.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[str, float, Dict[str, Any]]] = {}
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            item = self._entries.get(key)
+            if not item:
+                return None
+
+            _, expires_at, entry = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            return entry
+
+    def set(self, namespace: str, key: str, entry: Dict[str, Any], ttl: int) -> None:
+        with self._lock:
+            if len(self._entries) >= self.max_entries and key not in self._entries:
+                # drop the entry closest to expiry to make room
+                oldest = min(self._entries, key=lambda k: self._entries[k][1])
+                del self._entries[oldest]
+
+            self._entries[key] = (namespace, time.monotonic() + ttl, entry)
+
+    def invalidate(self, namespace: str) -> None:
+        with self._lock:
+            for key in [k for k, item in self._entries.items() if item[0] == namespace]:
+                del self._entries[key]
+
+
+class MongoCacheBackend(CacheBackend):
+    """
+    Cache shared by every worker, kept in a Mongo collection. A TTL index
+    clears expired documents and reads skip any the TTL monitor has not reached yet.
+    """
+
+    def __init__(self, collection: Collection):
+        self.collection = collection
+        self.collection.create_index("expires_at", expireAfterSeconds=0)
+        self.collection.create_index("namespace")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        document = self.collection.find_one({"_id": key, "expires_at": {"$gt": datetime.now(timezone.utc)}})
+        if not document:
+            return None
+
+        return document["entry"]
+
+    def set(self, namespace: str, key: str, entry: Dict[str, Any], ttl: int) -> None:
+        self.collection.replace_one(
+            {"_id": key},
+            {
+                "namespace": namespace,
+                "entry": entry,
+                "expires_at": datetime.now(timezone.utc) + timedelta(seconds=ttl)
+            },
+            upsert=True
+        )
+
+    def invalidate(self, namespace: str) -> None:
+        self.collection.delete_many({"namespace": namespace})
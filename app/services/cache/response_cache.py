@@ -0,0 +1,89 @@
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+from flask import Response, current_app, make_response, request
+import hashlib
+
+from app.database.base import Database
+from app.services.cache.backends import CacheBackend, LocalCacheBackend, MongoCacheBackend, NullCacheBackend
+
+
+class ResponseCache:
+    """
+    Caches the body of successful GET responses per namespace and serves
+    them with an ETag and Last-Modified, answering conditional requests
+    with a 304. Writers call `invalidate` with the namespaces they touched.
+    """
+
+    def __init__(self, backend: str = "mongo", default_ttl: int = 300, max_entries: int = 1024):
+        self.backend_name = backend
+        self.default_ttl = default_ttl
+        # until init_app runs, a shared cache caches nothing rather than keep copies other workers cannot invalidate
+        self.backend: CacheBackend = LocalCacheBackend(max_entries=max_entries) if backend == "local" else NullCacheBackend()
+
+    def init_app(self, db: Database) -> None:
+        """Switch to the configured backend once the database is available."""
+        if self.backend_name == "mongo":
+            self.backend = MongoCacheBackend(db.get_collection("ResponseCache"))
+
+    def cached(self, namespace: str, ttl: Optional[int] = None) -> Callable:
+        """Decorator for a GET view whose response only changes when `namespace` is invalidated."""
+        def decorator(f):
+            @wraps(f)
+            def decorated_function(*args, **kwargs):
+                key = f"{namespace}:{request.full_path}"
+
+                entry = self._get(key)
+                if entry is None:
+                    response: Response = make_response(f(*args, **kwargs))
+                    if response.status_code != 200:
+                        return response
+
+                    entry = self._entry_for(response)
+                    self._set(namespace, key, entry, ttl or self.default_ttl)
+
+                return self._respond(entry)
+            return decorated_function
+        return decorator
+
+    def invalidate(self, *namespaces: str) -> None:
+        """Drop every cached response in the given namespaces."""
+        for namespace in namespaces:
+            try:
+                self.backend.invalidate(namespace)
+            except Exception as e:
+                current_app.logger.error(f"Failed to invalidate '{namespace}' cache: {str(e)}")
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self.backend.get(key)
+        except Exception as e:
+            current_app.logger.error(f"Failed to read response cache: {str(e)}")
+            return None
+
+    def _set(self, namespace: str, key: str, entry: Dict[str, Any], ttl: int) -> None:
+        try:
+            self.backend.set(namespace, key, entry, ttl)
+        except Exception as e:
+            current_app.logger.error(f"Failed to write response cache: {str(e)}")
+
+    @staticmethod
+    def _entry_for(response: Response) -> Dict[str, Any]:
+        body = response.get_data()
+        return {
+            "body": body,
+            "mimetype": response.mimetype,
+            "etag": hashlib.sha1(body).hexdigest(),
+            # whole seconds, as that is all Last-Modified can carry
+            "last_modified": int(datetime.now(timezone.utc).timestamp()),
+        }
+
+    @staticmethod
+    def _respond(entry: Dict[str, Any]) -> Response:
+        response = Response(entry["body"], status=200, mimetype=entry["mimetype"])
+        response.set_etag(entry["etag"])
+        response.last_modified = datetime.fromtimestamp(entry["last_modified"], timezone.utc)
+        # let clients keep a copy but always revalidate it, so invalidations show up immediately
+        response.cache_control.no_cache = True
+
+        return response.make_conditional(request)
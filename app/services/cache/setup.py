@@ -0,0 +1,8 @@
+from app.config import config
+from app.services.cache.response_cache import ResponseCache
+
+response_cache = ResponseCache(
+    backend=config.RESPONSE_CACHE_BACKEND,
+    default_ttl=config.RESPONSE_CACHE_DEFAULT_TTL,
+    max_entries=config.RESPONSE_CACHE_MAX_ENTRIES,
+)
@@ -0,0 +1,130 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from threading import BoundedSemaphore, Lock
+from typing import Any, Callable, Dict, Optional
+from werkzeug.security import generate_password_hash, check_password_hash
+import time
+import bcrypt
+
+
+# default cost per algorithm (scrypt N, pbkdf2 iterations, bcrypt log rounds)
+DEFAULT_COSTS = {
+    "scrypt": 32768,
+    "pbkdf2": 1_000_000,
+    "bcrypt": 12,
+}
+
+
+class HashingBusyError(RuntimeError):
+    """Raised when the hashing queue is full and the request should be shed."""
+
+
+class PasswordHasher:
+    """
+    Hashes and verifies passwords on a bounded thread pool.
+
+    scrypt, pbkdf2 and bcrypt all release the GIL while hashing, so the pool
+    lets a threaded worker hash in parallel while the cap keeps a login storm
+    from starving every other request.
+    """
+
+    def __init__(self, algorithm: str = "scrypt", cost: Optional[int] = None, max_workers: int = 2,
+                 max_pending: int = 16, timeout: float = 10):
+        if algorithm not in DEFAULT_COSTS:
+            raise ValueError(f"Unsupported password hash algorithm '{algorithm}'")
+
+        self.algorithm = algorithm
+        self.cost = cost or DEFAULT_COSTS[algorithm]
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hasher")
+        # running + waiting jobs allowed before new ones are rejected
+        self._slots = BoundedSemaphore(max_workers + max_pending)
+        self._lock = Lock()
+        self._stats = {
+            "max_workers": max_workers,
+            "max_pending": max_pending,
+            "in_flight": 0,
+            "queued": 0,
+            "completed": 0,
+            "rejected": 0,
+            "queue_wait_ms": 0.0,
+            "hash_ms": 0.0,
+        }
+
+    @property
+    def method(self) -> str:
+        """The parameter string new hashes are created with."""
+        if self.algorithm == "scrypt":
+            return f"scrypt:{self.cost}:8:1"
+        if self.algorithm == "pbkdf2":
+            return f"pbkdf2:sha256:{self.cost}"
+        return f"bcrypt:{self.cost}"
+
+    def hash(self, password: str) -> str:
+        """Hash a password with the configured algorithm and cost."""
+        return self._submit(self._hash, password)
+
+    def verify(self, hashed: str, password: str) -> bool:
+        """Check a password against a stored hash of any supported algorithm."""
+        return self._submit(self._verify, hashed, password)
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """Whether a stored hash was made with different parameters than the current ones."""
+        if hashed.startswith("$2"):
+            # bcrypt hashes look like $2b$12$<salt+hash>
+            return self.method != f"bcrypt:{int(hashed.split('$')[2])}"
+        return hashed.split("$", 1)[0] != self.method
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of the queue counters."""
+        with self._lock:
+            data = dict(self._stats)
+
+        completed = data["completed"] or 1
+        data["avg_queue_wait_ms"] = round(data.pop("queue_wait_ms") / completed, 2)
+        data["avg_hash_ms"] = round(data.pop("hash_ms") / completed, 2)
+        data["algorithm"] = self.method
+        return data
+
+    def _hash(self, password: str) -> str:
+        if self.algorithm == "bcrypt":
+            return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(self.cost)).decode("utf-8")
+        return generate_password_hash(password, method=self.method)
+
+    @staticmethod
+    def _verify(hashed: str, password: str) -> bool:
+        if hashed.startswith("$2"):
+            return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+        return check_password_hash(hashed, password)
+
+    def _submit(self, fn: Callable, *args) -> Any:
+        if not self._slots.acquire(blocking=False):
+            self._record(rejected=1)
+            raise HashingBusyError("Password hashing queue is full")
+
+        self._record(queued=1)
+        try:
+            future = self._executor.submit(self._run, fn, time.perf_counter(), *args)
+        except Exception:
+            self._record(queued=-1)
+            self._slots.release()
+            raise
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise HashingBusyError("Password hashing timed out")
+
+    def _run(self, fn: Callable, submitted_at: float, *args) -> Any:
+        started_at = time.perf_counter()
+        self._record(queued=-1, in_flight=1, queue_wait_ms=(started_at - submitted_at) * 1000)
+        try:
+            return fn(*args)
+        finally:
+            self._record(in_flight=-1, completed=1, hash_ms=(time.perf_counter() - started_at) * 1000)
+            # the slot is held until the work is actually done, even if the caller timed out
+            self._slots.release()
+
+    def _record(self, **deltas) -> None:
+        with self._lock:
+            for key, value in deltas.items():
+                self._stats[key] += value
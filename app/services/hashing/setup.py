@@ -0,0 +1,10 @@
+from app.config import config
+from app.services.hashing.hasher import PasswordHasher
+
+password_hasher = PasswordHasher(
+    algorithm=config.PASSWORD_HASH_ALGORITHM,
+    cost=config.PASSWORD_HASH_COST,
+    max_workers=config.PASSWORD_HASH_WORKERS,
+    max_pending=config.PASSWORD_HASH_MAX_PENDING,
+    timeout=config.PASSWORD_HASH_TIMEOUT,
+)
@@ -0,0 +1,29 @@
+from threading import Lock
+from typing import Any, Dict
+from app.config import config
+
+_configured = False
+_lock = Lock()
+
+
+def upload(file, **options) -> Dict[str, Any]:
+    """
+    Upload a file to Cloudinary. The SDK is imported and configured on the
+    first upload rather than at boot.
+    """
+    global _configured
+    import cloudinary
+    import cloudinary.uploader
+
+    if not _configured:
+        with _lock:
+            if not _configured:
+                cloudinary.config(
+                    cloud_name=config.CLOUD_NAME,
+                    api_key=config.CLOUDINARY_API_KEY,
+                    api_secret=config.CLOUDINARY_API_SECRET,
+                    secure=True
+                )
+                _configured = True
+
+    return cloudinary.uploader.upload(file, **options)
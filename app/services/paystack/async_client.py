@@ -0,0 +1,54 @@
+from typing import Any, Dict, Optional
+import httpx
+
+
+class AsyncTransaction:
+    def __init__(self, client: "AsyncPaystack"):
+        self.client = client
+
+    async def initialize(self, **kwargs) -> Dict[str, Any]:
+        """Initialize a transaction."""
+        return await self.client.request("POST", "transaction/initialize", json=kwargs)
+
+    async def verify(self, reference: str) -> Dict[str, Any]:
+        """Verify a transaction by its reference."""
+        return await self.client.request("GET", f"transaction/verify/{reference}")
+
+
+class AsyncSubscription:
+    def __init__(self, client: "AsyncPaystack"):
+        self.client = client
+
+    async def create(self, **kwargs) -> Dict[str, Any]:
+        """Create a subscription."""
+        return await self.client.request("POST", "subscription", json=kwargs)
+
+    async def disable(self, **kwargs) -> Dict[str, Any]:
+        """Disable a subscription."""
+        return await self.client.request("POST", "subscription/disable", json=kwargs)
+
+
+class AsyncPaystack:
+    """
+    Non-blocking Paystack client over one pooled HTTP/1.1 connection pool,
+    shaped like the paystackapi client so responses are handled the same way.
+    """
+
+    API_URL = "https://api.paystack.co/"
+
+    def __init__(self, secret_key: Optional[str], max_connections: int = 100, timeout: float = 30):
+        self.http = httpx.AsyncClient(
+            base_url=self.API_URL,
+            headers={"Authorization": f"Bearer {secret_key}"},
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=timeout,
+        )
+        self.transaction = AsyncTransaction(self)
+        self.subscription = AsyncSubscription(self)
+
+    async def request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+        response = await self.http.request(method, endpoint, **kwargs)
+        return response.json()
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
@@ -0,0 +1,31 @@
+from typing import Any, Dict, Optional
+from flask import current_app
+
+from app.database import UserRepository
+from app.services.paystack.setup import paystack
+
+
+def provision_customer(user_repo: UserRepository, user: Dict[str, Any]) -> Optional[str]:
+    """
+    Make sure the user has a Paystack customer and return its code, None
+    when Paystack refused. Paystack keys customers by email, so running
+    this twice for the same user returns the same customer.
+    """
+    if user.get('customer_code'):
+        return user['customer_code']
+
+    response: Dict = paystack.customer.create(
+        first_name=user.get('firstName'),
+        last_name=user.get('lastName'),
+        email=user.get('email'),
+        phone=user.get('PhoneNumber'),
+    )
+
+    if not response.get('status'):
+        current_app.logger.error(f"Failed to create paystack customer for {user.get('email')}: {response.get('message')}")
+        return None
+
+    customer_code: str = response.get('data').get('customer_code')
+    user_repo.find_and_update_user({"_id": user["_id"], "customer_code": None}, {"customer_code": customer_code})
+    user['customer_code'] = customer_code
+    return customer_code
@@ -0,0 +1,23 @@
+from threading import Lock
+from typing import Any, Optional
+
+
+class LazyPaystack:
+    """
+    Stands in for the paystackapi client, which pulls in `requests` and its
+    dependencies, and builds it on first use rather than at boot.
+    """
+
+    def __init__(self, secret_key: Optional[str]):
+        self._secret_key = secret_key
+        self._client = None
+        self._lock = Lock()
+
+    def __getattr__(self, name: str) -> Any:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from paystackapi.paystack import Paystack
+
+                    self._client = Paystack(secret_key=self._secret_key)
+        return getattr(self._client, name)
@@ -0,0 +1,71 @@
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+from datetime import datetime, timedelta
+from flask import current_app
+
+from app.database import OutboxRepository
+
+if TYPE_CHECKING:
+    from paystackapi.paystack import Paystack
+
+
+class PaystackOutbox:
+    """
+    Sends the Paystack calls that webhook handlers record in the Outbox
+    collection. Callers send their own messages right after their unit of
+    work commits, and a scheduled job retries anything left behind with
+    exponential backoff.
+    """
+
+    def __init__(self, client: "Paystack", max_attempts: int = 8, lock_seconds: int = 60, enabled: bool = True):
+        self.max_attempts = max_attempts
+        # when off (e.g. replaying old webhooks) messages are marked skipped instead of sent
+        self.enabled = enabled
+        self.lock = timedelta(seconds=lock_seconds)
+        self.handlers: Dict[str, Callable[[Dict], Dict]] = {
+            "subscription.create": lambda payload: client.subscription.create(**payload),
+            "subscription.disable": lambda payload: client.subscription.disable(**payload),
+        }
+
+    def dispatch(self, outbox_repo: OutboxRepository, message_ids: Optional[List[Any]] = None) -> Dict[str, int]:
+        """Send the due messages, only `message_ids` when given."""
+        query = {"_id": {"$in": message_ids}} if message_ids is not None else None
+        result = {"sent": 0, "retrying": 0, "failed": 0, "skipped": 0}
+
+        while True:
+            message = outbox_repo.claim_due(datetime.now(), self.lock, query)
+            if not message:
+                return result
+
+            if not self.enabled:
+                outbox_repo.mark_skipped(message["_id"])
+                result["skipped"] += 1
+                continue
+
+            error = self._send(message)
+            if error is None:
+                outbox_repo.mark_sent(message["_id"])
+                result["sent"] += 1
+                continue
+
+            attempts: int = message["attempts"]
+            if attempts >= self.max_attempts:
+                outbox_repo.mark_failed(message["_id"], error, retry_at=None)
+                current_app.logger.error(f"Giving up on outbox message {message['_id']} ({message['kind']}): {error}")
+                result["failed"] += 1
+            else:
+                outbox_repo.mark_failed(message["_id"], error, retry_at=datetime.now() + timedelta(minutes=2 ** attempts))
+                result["retrying"] += 1
+
+    def _send(self, message: Dict[str, Any]) -> Optional[str]:
+        handler = self.handlers.get(message["kind"])
+        if not handler:
+            return f"No handler for outbox message kind '{message['kind']}'"
+
+        try:
+            response: Dict = handler(message["payload"])
+        except Exception as e:
+            return str(e)
+
+        if not response.get("status"):
+            return response.get("message") or "Paystack rejected the request"
+        return None
@@ -1,40 +1,72 @@
-from typing import Dict, Callable, Tuple, Any
+from typing import Dict, Callable, Tuple, Any, List, Optional
 from flask import current_app
-from app.services.paystack.setup import paystack
+from app.services.cache.backends import LocalCacheBackend
+from app.services.paystack.outbox import PaystackOutbox
+from app.services.realtime.setup import payment_feed
 from app.services.paystack.models import ChargeSuccessData, SubscriptionCreateData, InvoiceUpdateData
-from app.extensions import (
+from app.database import (
+    RepositoryContainer,
     UserRepository,
     SubscriptionRepository,
     PaymentHistoryRepository,
     PlanRepository,
     WalkInRepository,
-    ChampionUserRepository
+    ChampionUserRepository,
+    SessionSlotRepository,
+    OutboxRepository,
+    PaymentLedgerRepository
     )
-from app.database.models.payment_history import PaymentHistory
+from app.database.unit_of_work import UnitOfWork
+from app.database.models.payment_history import PaymentHistory, PAYMENT_TYPES
 from app.database.models.walk_in import WalkIn
 from datetime import datetime
 
 
 class PayStackPayment:
-    @staticmethod
-    def get_db():
-        """
-        Get the database instance from the Flask app context.
-        """
-        return current_app.extensions['database']
-
-    @staticmethod
-    def paymentHandler(event_type: str, data: Dict) -> Tuple[bool, Dict[str, Any]]:
-        event_handlers: Dict[str, Callable[[Dict], None]] = {
-            'charge.success': PayStackPayment.handle_charge_success,
-            'subscription.create': PayStackPayment.handle_subscription_create,
-            'subscription.disable': PayStackPayment.handle_subscription_disable,
-            'invoice.update': PayStackPayment.handle_invoice_updated,
-            'subscription.not_renew': PayStackPayment.handle_subscription_not_renew
+    """
+    Handles Paystack webhook events. Created once in init_app, so its
+    repositories and plan cache are shared by every event.
+    """
+
+    def __init__(self, repositories: RepositoryContainer, unit_of_work: UnitOfWork, outbox: PaystackOutbox, plan_cache_ttl: int = 300):
+        self.user_repo = repositories.get(UserRepository)
+        self.subscription_repo = repositories.get(SubscriptionRepository)
+        self.payment_history_repo = repositories.get(PaymentHistoryRepository)
+        self.plan_repo = repositories.get(PlanRepository)
+        self.walk_in_repo = repositories.get(WalkInRepository)
+        self.champion_user_repo = repositories.get(ChampionUserRepository)
+        self.session_slot_repo = repositories.get(SessionSlotRepository)
+        self.outbox_repo = repositories.get(OutboxRepository)
+        self.payment_ledger_repo = repositories.get(PaymentLedgerRepository)
+        self.unit_of_work = unit_of_work
+        self.outbox = outbox
+
+        # a plan's code and id never change, so lookups by code can be reused across events
+        self.plan_cache = LocalCacheBackend(max_entries=256)
+        self.plan_cache_ttl = plan_cache_ttl
+
+        self.event_handlers: Dict[str, Callable[[Dict], Tuple[bool, Dict[str, Any]]]] = {
+            'charge.success': self.handle_charge_success,
+            'subscription.create': self.handle_subscription_create,
+            'subscription.disable': self.handle_subscription_disable,
+            'invoice.update': self.handle_invoice_updated,
+            'subscription.not_renew': self.handle_subscription_not_renew
         }
 
+    def get_plan_by_code(self, plan_code: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch a plan by its Paystack code, from the plan cache when possible.
+        """
+        plan = self.plan_cache.get(plan_code)
+        if plan is None:
+            plan = self.plan_repo.get_by_plan_code(plan_code=plan_code)
+            if plan:
+                self.plan_cache.set("plans", plan_code, plan, self.plan_cache_ttl)
+        return plan
+
+    def paymentHandler(self, event_type: str, data: Dict) -> Tuple[bool, Dict[str, Any]]:
         # Get the handler for the event type
-        handler = event_handlers.get(event_type)
+        handler = self.event_handlers.get(event_type)
 
         if handler:
             try:
@@ -48,122 +80,160 @@ class PayStackPayment:
             current_app.logger.info(f"{data}")
             return True, {"message": "purposely unhandled"}
 
-    @staticmethod
-    def handle_charge_success(data: Dict) -> Tuple[bool, Dict[str, Any]]:
+    def handle_charge_success(self, data: Dict) -> Tuple[bool, Dict[str, Any]]:
         """
             Handles the charge success event
         """
         success_data = ChargeSuccessData(**data)
-        # init user repo
-        user_repo = UserRepository(PayStackPayment.get_db())
-        payment_history_repo = PaymentHistoryRepository(PayStackPayment.get_db())
-        plan_repo = PlanRepository(PayStackPayment.get_db())
-        walk_in_repo = WalkInRepository(PayStackPayment.get_db())
-        champion_user_repo = ChampionUserRepository(PayStackPayment.get_db())
-
-        first_name = ""
-
-        # check if metadata is present, then it is a walkIn sub
-        if type(success_data.metadata) is dict and success_data.metadata.get('custom'):
-            if success_data.metadata['custom'].get('type') == "walkin":
-                entry_date = success_data.metadata['custom'].get('entry_date')
-                first_name = success_data.metadata['custom'].get('first_name')
-                last_name = success_data.metadata['custom'].get('last_name')
-
-                walk_in_data = {
-                    "email": success_data.customer.email,
-                    "amount": success_data.amount // 100,
-                    "entry_date": entry_date,
-                    "first_name": first_name,
-                    "last_name": last_name
-                }
+        user_repo = self.user_repo
+        payment_history_repo = self.payment_history_repo
+        walk_in_repo = self.walk_in_repo
+        champion_user_repo = self.champion_user_repo
+        session_slot_repo = self.session_slot_repo
+        outbox_repo = self.outbox_repo
+
+        def record_charge() -> Tuple[str, List[Any], Optional[Tuple[bool, Dict[str, Any]]]]:
+            """
+                All the writes for the charge, run as one unit of work. Returns the
+                customer's first name, the outbox messages to send once committed and
+                a response to stop with, if any.
+            """
+            # Paystack redelivers a charge whose webhook failed after the commit (e.g. the
+            # confirmation mail), applying it again would book a second seat or walk-in
+            entry = self.payment_ledger_repo.get_by_reference(success_data.reference)
+            if entry and entry.get('source') == "charge.success":
+                return "", [], (True, {"message": "Charge already recorded."})
+
+            result = apply_charge()
+
+            # last, so on a server without transactions a charge that failed halfway is applied
+            # again; it also lets verify_payment answer without asking Paystack
+            self.payment_ledger_repo.record(success_data.reference, success_data.status, "charge.success",
+                                            amount=success_data.amount, paid_at=success_data.paid_at)
+            return result
+
+        def apply_charge() -> Tuple[str, List[Any], Optional[Tuple[bool, Dict[str, Any]]]]:
+            first_name = ""
+            outbox_ids = []
+
+            # check if metadata is present, then it is a walkIn sub
+            if type(success_data.metadata) is dict and success_data.metadata.get('custom'):
+                if success_data.metadata['custom'].get('type') == "walkin":
+                    entry_date = success_data.metadata['custom'].get('entry_date')
+                    first_name = success_data.metadata['custom'].get('first_name')
+                    last_name = success_data.metadata['custom'].get('last_name')
+
+                    walk_in_data = {
+                        "email": success_data.customer.email,
+                        "amount": success_data.amount // 100,
+                        "entry_date": entry_date,
+                        "first_name": first_name,
+                        "last_name": last_name
+                    }
 
-                parsed_walk_in_data = WalkIn(**walk_in_data)
-                walk_in_repo.create_walk_in(parsed_walk_in_data.to_bson())
-            elif success_data.metadata['custom'].get('type') == "competition":
-                unique_id = success_data.metadata['custom'].get('unique_id')
-                first_name = success_data.metadata['custom'].get('first_name')
-
-                # find and update champion user by unique id
-                champion_user_repo.find_and_update_champion_user({ "unique_id": unique_id }, { "status": "paid" })
-            elif success_data.metadata['custom'].get('type') == "subscription":
-                plan_code = success_data.metadata['custom'].get('plan_code')
-                customer_code = success_data.metadata['custom'].get('customer_code')
-                first_name = success_data.metadata['custom'].get('first_name')
-
-                # create a subscription for the user
-                paystack.subscription.create(
-                    customer=customer_code,
-                    plan=plan_code,
-                    authorization=success_data.authorization.authorization_code
-                )
-
-                # get the user by customer id
-                user_data = user_repo.get_by_customer_code(customer_code)
-
-                if user_data.get('status') == 'Payment':
-                    # find and update the user to done
-                    result = user_repo.find_and_update_user({ "customer_code": customer_code }, 
+                    parsed_walk_in_data = WalkIn(**walk_in_data)
+                    walk_in_repo.create_walk_in(parsed_walk_in_data.to_bson())
+
+                    # the held place in the session is now booked
+                    session_slot_repo.confirm_hold(parsed_walk_in_data.entry_date, success_data.metadata['custom'].get('hold_id'))
+                elif success_data.metadata['custom'].get('type') == "competition":
+                    unique_id = success_data.metadata['custom'].get('unique_id')
+                    first_name = success_data.metadata['custom'].get('first_name')
+
+                    # find and update champion user by unique id
+                    champion_user_repo.find_and_update_champion_user({ "unique_id": unique_id }, { "status": "paid" })
+                elif success_data.metadata['custom'].get('type') == "subscription":
+                    plan_code = success_data.metadata['custom'].get('plan_code')
+                    customer_code = success_data.metadata['custom'].get('customer_code')
+                    first_name = success_data.metadata['custom'].get('first_name')
+
+                    # create a subscription for the user once this commits
+                    message = outbox_repo.enqueue("subscription.create", {
+                        "customer": customer_code,
+                        "plan": plan_code,
+                        "authorization": success_data.authorization.authorization_code
+                    })
+                    outbox_ids.append(message["_id"])
+
+                    # get the user by customer id
+                    user_data = user_repo.get_customer(customer_code)
+                    if not user_data:
+                        current_app.logger.info(f"Subscription not found.")
+                        return first_name, outbox_ids, (False, {"message": "Subscription not found."})
+
+                    # move the user from Payment to done, the filter does the status check
+                    user_repo.find_and_update_user({ "customer_code": customer_code, "status": "Payment" },
                                                     {
                                                         "auth_code": success_data.authorization.authorization_code,
                                                         "status": "done"
                                                     })
-                    if result.matched_count == 0:
-                            current_app.logger.info(f"Subscription not found.")
-                            return False, {"message": "Subscription not found."}
 
-                # find plan by plan code
-                plan_paid_for = plan_repo.get_by_plan_code(plan_code=plan_code)
-
-                history_data = {
+                    # find plan by plan code
+                    plan_paid_for = self.get_plan_by_code(plan_code)
+
+                    # the name is not in the customer directory, read it fresh
+                    profile = user_repo.get_profile(user_data.get('_id')) or {}
+                    history_data = {
+                            "amount": success_data.amount,
+                            "name": f"{profile.get('firstName')} {profile.get('lastName')}",
+                            "reference": success_data.reference,
+                            "payment_date": success_data.paid_at,
+                            "status": success_data.status,
+                            "type": "subscription",
+                            "user_id": user_data.get('_id'),
+                            "plan_id": plan_paid_for.get('_id')
+                        }
+                    history_parsed_data = PaymentHistory(**history_data)
+
+                    # update the paymentHistory
+                    payment_history_repo.create_payment_history(history_parsed_data.to_bson())
+                elif success_data.metadata['custom'].get('type') == "upgrade":
+                    first_name = success_data.metadata['custom'].get('first_name')
+
+                if success_data.metadata['custom'].get('type') != "subscription":
+                    # update payment history
+                    history_data = {
                         "amount": success_data.amount,
-                        "name": f"{user_data.get('firstName')} {user_data.get('lastName')}",
+                        "email": success_data.customer.email,
                         "reference": success_data.reference,
                         "payment_date": success_data.paid_at,
                         "status": success_data.status,
-                        "user_id": user_data.get('_id'),
-                        "plan_id": plan_paid_for.get('_id')
+                        "type": PAYMENT_TYPES.get(success_data.metadata['custom'].get('type'))
                     }
-                history_parsed_data = PaymentHistory(**history_data)
-
-                # update the paymentHistory
-                result = payment_history_repo.create_payment_history(history_parsed_data.to_bson())
-            elif success_data.metadata['custom'].get('type') == "upgrade":
-                first_name = success_data.metadata['custom'].get('first_name')
-
-            if success_data.metadata['custom'].get('type') != "subscription":
-                # update payment history
-                history_data = {
-                    "amount": success_data.amount,
-                    "email": success_data.customer.email,
-                    "reference": success_data.reference,
-                    "payment_date": success_data.paid_at,
-                    "status": success_data.status
-                }
-                history_parsed_data = PaymentHistory(**history_data)
+                    history_parsed_data = PaymentHistory(**history_data)
 
-                # update the paymentHistory
-                result = payment_history_repo.create_payment_history(history_parsed_data.to_bson())
+                    # update the paymentHistory
+                    payment_history_repo.create_payment_history(history_parsed_data.to_bson())
 
-            # send payment confirmation mail
-            payment_history_repo.send_payment_confirmation_email(success_data.customer.email, success_data.amount, first_name)
+                return first_name, outbox_ids, None
 
-            return True, {
-                "message": "Customer made a payment!"
+            # from auto-renewal
+            history_data = {
+                "amount": success_data.amount,
+                "email": success_data.customer.email,
+                "reference": success_data.reference,
+                "payment_date": success_data.paid_at,
+                "status": success_data.status,
+                "type": "renewal"
             }
-        
-        # from auto-renewal
-        history_data = {
-            "amount": success_data.amount,
-            "email": success_data.customer.email,
-            "reference": success_data.reference,
-            "payment_date": success_data.paid_at,
-            "status": success_data.status
-        }
-        history_parsed_data = PaymentHistory(**history_data)
+            history_parsed_data = PaymentHistory(**history_data)
 
-        # update the paymentHistory
-        result = payment_history_repo.create_payment_history(history_parsed_data.to_bson())
+            # update the paymentHistory
+            payment_history_repo.create_payment_history(history_parsed_data.to_bson())
+
+            return first_name, outbox_ids, None
+
+        first_name, outbox_ids, stop_response = self.unit_of_work.run(record_charge)
+
+        # the outcome is committed, wake this worker's streams now, the change feed tells the others
+        payment_feed.publish(success_data.reference, {"_id": success_data.reference, "status": success_data.status})
+
+        # the writes are committed, now make the paystack calls they asked for
+        if outbox_ids:
+            self.outbox.dispatch(outbox_repo, outbox_ids)
+
+        if stop_response:
+            return stop_response
 
         # send payment confirmation mail
         payment_history_repo.send_payment_confirmation_email(success_data.customer.email, success_data.amount, first_name)
@@ -172,20 +242,24 @@ class PayStackPayment:
             "message": "Customer made a payment!"
         }
 
-    @staticmethod
-    def handle_subscription_create(data: Dict) -> Tuple[bool, Dict[str, Any]]:
+    def handle_subscription_create(self, data: Dict) -> Tuple[bool, Dict[str, Any]]:
         """
             Handles the subscription create event
         """
         success_data  = SubscriptionCreateData(**data)
-        # init repo
-        user_repo = UserRepository(PayStackPayment.get_db())
-        subscription_repo = SubscriptionRepository(PayStackPayment.get_db())
-        plan_repo = PlanRepository(PayStackPayment.get_db())
+        user_repo = self.user_repo
+        subscription_repo = self.subscription_repo
+        outbox_repo = self.outbox_repo
 
         # get the user by customer id
-        user_data = user_repo.get_by_customer_code(success_data.customer.customer_code)
-        plan_data = plan_repo.get_by_plan_code(success_data.plan.plan_code)
+        customer_code = success_data.customer.customer_code
+        user_data = user_repo.get_customer(customer_code)
+        plan_data = self.get_plan_by_code(success_data.plan.plan_code)
+
+        if str(user_data.get('plan_id')) != str(plan_data.get('_id')):
+            # another worker may have changed the plan, confirm against the database before acting on it
+            user_repo.forget_customers({ "customer_code": customer_code })
+            user_data = user_repo.get_customer(customer_code)
 
         # check if the current planId in user data is same as the one in the create event
         if str(user_data.get('plan_id')) != str(plan_data.get('_id')):
@@ -193,10 +267,11 @@ class PayStackPayment:
             # get the previous subnscription and disable it
             previous_sub = subscription_repo.get_by_plan_user_id(user_id=str(user_data.get('_id')), plan_id=str(user_data.get('plan_id')))
             # disable subscription
-            paystack.subscription.disable(
-                code=previous_sub.get('subscription_code'),
-                token=previous_sub.get('email_token')
-            )
+            message = outbox_repo.enqueue("subscription.disable", {
+                "code": previous_sub.get('subscription_code'),
+                "token": previous_sub.get('email_token')
+            })
+            self.outbox.dispatch(outbox_repo, [message["_id"]])
 
             # update user id
             user_repo.find_and_update_user({ '_id': user_data.get('_id') }, {
@@ -213,7 +288,10 @@ class PayStackPayment:
             "subscription_code": success_data.subscription_code,
             "start_date": success_data.createdAt,
             "end_date": success_data.next_payment_date,
-            "status": success_data.status
+            "status": success_data.status,
+            # denormalized so the admin listing needs no $lookup into User, read fresh as the
+            # directory entry may predate a profile change handled by another worker
+            **subscription_repo.user_details(user_repo.get_profile(user_data.get('_id')) or {})
         }
 
         # create the subscription with the plan selected
@@ -223,14 +301,13 @@ class PayStackPayment:
                     return False, {"message": "Subscription not created."}
         return True, {"message": "Subscription create success"}
 
-    @staticmethod
-    def handle_subscription_disable(data: Dict) -> Tuple[bool, Dict[str, Any]]:
+    def handle_subscription_disable(self, data: Dict) -> Tuple[bool, Dict[str, Any]]:
         """
             Handles disabling of subscription
         """
         subscription_code = data.get('subscription_code')
         email_token = data.get('email_token')
-        subscription_repo = SubscriptionRepository(PayStackPayment.get_db())
+        subscription_repo = self.subscription_repo
 
         #  delete subscription
         result = subscription_repo.find_and_cancel_subscription({
@@ -245,16 +322,15 @@ class PayStackPayment:
         
         return True, {"message": "Subscription disable success"}
 
-    @staticmethod
-    def handle_invoice_updated(data: Dict) -> Tuple[bool, Dict[str, Any]]:
+    def handle_invoice_updated(self, data: Dict) -> Tuple[bool, Dict[str, Any]]:
         """
             handles the invoice status of subscriptions
         """
         request_data = InvoiceUpdateData(**data)
 
-        subscription_repo = SubscriptionRepository(PayStackPayment.get_db())
-        user_repo = UserRepository(PayStackPayment.get_db())
-        payment_history_repo = PaymentHistoryRepository(PayStackPayment.get_db())
+        subscription_repo = self.subscription_repo
+        user_repo = self.user_repo
+        payment_history_repo = self.payment_history_repo
 
         # get the subscription based on the subscription code and update status
         if request_data.subscription.status == "success":
@@ -271,7 +347,7 @@ class PayStackPayment:
                                                             })
             
         # get user by customer code
-        user_data = user_repo.get_by_customer_code(request_data.customer.customer_code)
+        user_data = user_repo.get_customer(request_data.customer.customer_code)
 
         # create payment history
         history_data = {
@@ -279,6 +355,7 @@ class PayStackPayment:
                 "name": f"{request_data.customer.first_name} {request_data.customer.last_name}",
                 "payment_date": request_data.paid_at,
                 "status": request_data.status,
+                "type": "renewal",
                 "user_id": user_data.get('_id'),
                 "plan_id": user_data.get('plan_id')
             }
@@ -290,13 +367,11 @@ class PayStackPayment:
             "message": "Payment was made or not!"
         }
     
-    @staticmethod
-    def handle_subscription_not_renew(data: Dict) -> Tuple[bool, Dict[str, Any]]:
+    def handle_subscription_not_renew(self, data: Dict) -> Tuple[bool, Dict[str, Any]]:
         """
             handles the subscriptions not renew event
         """
-        subscription_repo = SubscriptionRepository(PayStackPayment.get_db())
-
+        subscription_repo = self.subscription_repo
 
         subscription_code = data.get('subscription_code')
         email_token = data.get('email_token')
@@ -1,4 +1,12 @@
 from app.config import config
-from paystackapi.paystack import Paystack
+from app.services.paystack.lazy_client import LazyPaystack
+from app.services.paystack.outbox import PaystackOutbox
+from app.services.paystack.webhook import WebhookIngress
 
-paystack = Paystack(secret_key=config.PAYSTACK_SECRET_KEY)
\ No newline at end of file
+paystack = LazyPaystack(secret_key=config.PAYSTACK_SECRET_KEY)
+
+# outbound calls recorded by webhook handlers, sent after their writes commit
+paystack_outbox = PaystackOutbox(paystack, max_attempts=config.OUTBOX_MAX_ATTEMPTS, enabled=config.PAYSTACK_OUTBOUND_ENABLED)
+
+# verifies and parses incoming webhooks
+webhook_ingress = WebhookIngress(config.PAYSTACK_SECRET_KEY, max_body_bytes=config.WEBHOOK_MAX_BODY_BYTES)
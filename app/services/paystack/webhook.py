@@ -0,0 +1,63 @@
+from typing import Any, Callable, Dict, Optional, Tuple
+from flask import Request
+import hashlib
+import hmac
+import json
+
+try:
+    import orjson
+
+    loads: Callable[[bytes], Any] = orjson.loads
+except ImportError:
+    loads = json.loads
+
+
+class WebhookRejected(Exception):
+    """The request is not a genuine, well-formed Paystack webhook."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class WebhookIngress:
+    """
+    Turns a webhook request into (event, data): the body is capped, read
+    once, its HMAC-SHA512 checked in constant time and parsed once.
+    """
+
+    SIGNATURE_HEADER = "X-Paystack-Signature"
+
+    def __init__(self, secret_key: Optional[str], max_body_bytes: int = 256 * 1024):
+        self.secret = (secret_key or "").encode("utf-8")
+        self.max_body_bytes = max_body_bytes
+
+    def read(self, request: Request) -> Tuple[str, Dict[str, Any]]:
+        signature = request.headers.get(self.SIGNATURE_HEADER)
+        if not signature:
+            raise WebhookRejected(400, "Signature missing")
+
+        # refuse oversized bodies before reading, and never read past the cap
+        if request.content_length is not None and request.content_length > self.max_body_bytes:
+            raise WebhookRejected(413, "Payload too large")
+        body = request.stream.read(self.max_body_bytes + 1)
+        if len(body) > self.max_body_bytes:
+            raise WebhookRejected(413, "Payload too large")
+
+        return self.verify(body, signature)
+
+    def verify(self, body: bytes, signature: str) -> Tuple[str, Dict[str, Any]]:
+        expected = hmac.new(self.secret, body, hashlib.sha512).hexdigest()
+        if not hmac.compare_digest(expected.encode(), signature.strip().lower().encode()):
+            raise WebhookRejected(400, "Invalid signature")
+
+        try:
+            payload = loads(body)
+        except ValueError:
+            raise WebhookRejected(400, "Malformed payload")
+
+        if not isinstance(payload, dict) or not isinstance(payload.get("event"), str):
+            raise WebhookRejected(400, "Malformed payload")
+
+        return payload["event"], payload.get("data") or {}
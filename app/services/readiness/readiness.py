@@ -0,0 +1,71 @@
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from flask import Flask
+import time
+
+
+class Readiness:
+    """
+    Boot work that needs the database: the connectivity check, index builds
+    and cache warm-up.
+
+    `run` does it in place, so init_app returns only once the database has
+    answered. `start` does it on a background thread instead, retrying until
+    it succeeds, and the app serves requests in the meantime.
+    `/api/v1/health/ready` answers 503 until every task has finished.
+    """
+
+    def __init__(self, retry_seconds: float = 5):
+        self.retry_seconds = retry_seconds
+        self.tasks: List[Tuple[str, Callable[[], Any]]] = []
+        self.timings: Dict[str, float] = {}
+        self.error: Optional[str] = None
+        self._ready = Event()
+        self._lock = Lock()
+        self._thread: Optional[Thread] = None
+
+    def add_task(self, name: str, task: Callable[[], Any]) -> None:
+        self.tasks.append((name, task))
+
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    def run(self) -> None:
+        """Run the tasks that have not finished yet, in order. Raises the first failure."""
+        with self._lock:
+            for name, task in self.tasks:
+                if name in self.timings:
+                    continue
+
+                started = time.perf_counter()
+                task()
+                self.timings[name] = round(time.perf_counter() - started, 3)
+
+            self.error = None
+            self._ready.set()
+
+    def start(self, app: Flask) -> None:
+        if self._thread:
+            return
+
+        self._thread = Thread(target=self._loop, args=(app,), name="readiness", daemon=True)
+        self._thread.start()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ready": self.is_ready(),
+            "pending": [name for name, _ in self.tasks if name not in self.timings],
+            "timings": dict(self.timings),
+            "error": self.error
+        }
+
+    def _loop(self, app: Flask) -> None:
+        while not self.is_ready():
+            try:
+                with app.app_context():
+                    self.run()
+                app.logger.info(f"App ready, boot tasks took {self.timings}.")
+            except Exception as e:
+                self.error = str(e)
+                app.logger.warning(f"Boot tasks not finished, retrying in {self.retry_seconds}s: {str(e)}")
+                time.sleep(self.retry_seconds)
@@ -0,0 +1,4 @@
+from app.config import config
+from app.services.readiness.readiness import Readiness
+
+readiness = Readiness(retry_seconds=config.READINESS_RETRY_SECONDS)
@@ -0,0 +1,143 @@
+from threading import Event, Lock, Thread
+from typing import Any, Dict, List, Optional
+from pymongo.errors import OperationFailure, PyMongoError
+import asyncio
+import logging
+
+from app.database.base import Database
+
+logger = logging.getLogger(__name__)
+
+
+class FeedSubscription:
+    """One request waiting for the document with `key` as its _id to be written."""
+
+    def __init__(self, key: Any):
+        self.key = key
+        self.document: Optional[Dict[str, Any]] = None
+        self._event = Event()
+
+    def notify(self, document: Dict[str, Any]) -> None:
+        self.document = document
+        self._event.set()
+
+    def wait(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Block for up to `timeout` seconds, return the document once it has been written."""
+        self._event.wait(timeout)
+        return self.document
+
+
+class AsyncFeedSubscription(FeedSubscription):
+    """A request served by the ASGI app, waiting on the event loop instead of a thread."""
+
+    def __init__(self, key: Any, loop: asyncio.AbstractEventLoop):
+        super().__init__(key)
+        self.loop = loop
+        self._async_event = asyncio.Event()
+
+    def notify(self, document: Dict[str, Any]) -> None:
+        self.document = document
+        self.loop.call_soon_threadsafe(self._async_event.set)
+
+    async def wait_async(self, timeout: float) -> Optional[Dict[str, Any]]:
+        try:
+            await asyncio.wait_for(self._async_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.document
+
+
+class ChangeFeed:
+    """
+    Wakes the requests in this process that wait on a document of one
+    collection, whichever worker wrote it.
+
+    One thread per process follows the collection through a change stream.
+    Deployments without change streams (a standalone server) get a polling
+    fallback: one `$in` query per interval for every key still awaited in
+    this process. The thread starts with the first subscription.
+    """
+
+    # "The $changeStream stage is only supported on replica sets"
+    CHANGE_STREAMS_UNSUPPORTED = 40573
+
+    def __init__(self, collection: str, poll_interval: float = 2.0):
+        self.collection = collection
+        self.poll_interval = poll_interval
+        self.db: Optional[Database] = None
+        self._subscriptions: Dict[Any, List[FeedSubscription]] = {}
+        self._lock = Lock()
+        self._thread: Optional[Thread] = None
+        self._stop = Event()
+
+    def init_app(self, db: Database) -> None:
+        self.db = db
+
+    def subscribe(self, key: Any, loop: Optional[asyncio.AbstractEventLoop] = None) -> FeedSubscription:
+        """Wait on `key`. Pass the event loop for a request served by the ASGI app."""
+        subscription = AsyncFeedSubscription(key, loop) if loop else FeedSubscription(key)
+        with self._lock:
+            self._subscriptions.setdefault(key, []).append(subscription)
+            if self._thread is None:
+                self._thread = Thread(target=self._follow, name=f"{self.collection}-feed", daemon=True)
+                self._thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription: FeedSubscription) -> None:
+        with self._lock:
+            waiting = self._subscriptions.get(subscription.key, [])
+            if subscription in waiting:
+                waiting.remove(subscription)
+            if not waiting:
+                self._subscriptions.pop(subscription.key, None)
+
+    def publish(self, key: Any, document: Dict[str, Any]) -> None:
+        """Wake everyone in this process waiting on `key`."""
+        with self._lock:
+            waiting = list(self._subscriptions.get(key, []))
+        for subscription in waiting:
+            subscription.notify(document)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _follow(self) -> None:
+        resume_token = None
+        while not self._stop.is_set():
+            try:
+                with self.db.get_collection(self.collection).watch(
+                    [{"$match": {"operationType": {"$in": ["insert", "update", "replace"]}}}],
+                    full_document="updateLookup",
+                    resume_after=resume_token,
+                    max_await_time_ms=int(self.poll_interval * 1000)
+                ) as stream:
+                    while not self._stop.is_set():
+                        change = stream.try_next()
+                        if change is None:
+                            continue
+                        resume_token = stream.resume_token
+                        if change.get("fullDocument"):
+                            self.publish(change["documentKey"]["_id"], change["fullDocument"])
+            except OperationFailure as e:
+                if e.code != self.CHANGE_STREAMS_UNSUPPORTED:
+                    logger.error(f"{self.collection} change stream failed: {str(e)}")
+                    self._stop.wait(self.poll_interval)
+                    continue
+                logger.info(f"Change streams unavailable, polling {self.collection} every {self.poll_interval}s.")
+                self._poll()
+            except PyMongoError as e:
+                logger.error(f"{self.collection} change stream failed: {str(e)}")
+                self._stop.wait(self.poll_interval)
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            with self._lock:
+                keys = list(self._subscriptions)
+            if not keys:
+                continue
+
+            try:
+                for document in self.db.find(self.collection, {"_id": {"$in": keys}}):
+                    self.publish(document["_id"], document)
+            except PyMongoError as e:
+                logger.error(f"Polling {self.collection} failed: {str(e)}")
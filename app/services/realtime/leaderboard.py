@@ -0,0 +1,269 @@
+from bisect import bisect_right
+from copy import deepcopy
+from queue import Empty, Full, Queue
+from threading import Event, Lock, Thread
+from typing import Any, Dict, List, Optional
+from pymongo.errors import OperationFailure, PyMongoError
+import asyncio
+import logging
+
+from app.database.base import Database
+from app.services.realtime.change_feed import ChangeFeed
+from app.utils.utils import serialize_document
+
+logger = logging.getLogger(__name__)
+
+RANK_TYPES = ["General", "Recurve", "Compound", "Barebow"]
+
+
+class Leaderboard:
+    """In-memory copy of the four leaderboards, shaped like GET /rank/all."""
+
+    def __init__(self, documents: List[Dict[str, Any]]):
+        self.archers: Dict[str, Dict[str, Any]] = {}
+        for document in documents:
+            archer = serialize_document(document)
+            self.archers[archer["_id"]] = archer
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        boards: Dict[str, List[Dict[str, Any]]] = {rank_type: [] for rank_type in RANK_TYPES}
+        for archer in self.archers.values():
+            boards.setdefault(archer.get("type"), []).append(archer)
+        for board in boards.values():
+            board.sort(key=lambda archer: archer.get("point", 0), reverse=True)
+        return deepcopy(boards)
+
+    def positions(self, rank_type: Any) -> Dict[str, int]:
+        """Position of every archer of a type: 1 + the number with more points, so ties share a place."""
+        points = sorted(archer.get("point", 0) for archer in self.archers.values() if archer.get("type") == rank_type)
+        return {
+            archer_id: 1 + len(points) - bisect_right(points, archer.get("point", 0))
+            for archer_id, archer in self.archers.items() if archer.get("type") == rank_type
+        }
+
+    def _moved(self, rank_type: Any, before: Dict[str, int], skip: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Upserts for the archers of a type whose position is no longer the one in `before`."""
+        return [
+            {"op": "upsert", "type": rank_type, "archer": deepcopy(self.archers[archer_id]), "position": position}
+            for archer_id, position in self.positions(rank_type).items()
+            if archer_id != skip and before.get(archer_id) != position
+        ]
+
+    def apply(self, document: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Store an inserted or updated archer, return the deltas to send: the
+        archer itself, and every archer it passed or fell behind.
+        """
+        archer = serialize_document(dict(document))
+        previous = self.archers.get(archer["_id"])
+        if previous == archer:
+            return []
+
+        rank_types = [archer.get("type")]
+        if previous and previous.get("type") != archer.get("type"):
+            rank_types.append(previous.get("type"))
+        before = {rank_type: self.positions(rank_type) for rank_type in rank_types}
+
+        deltas = []
+        if previous and previous.get("type") != archer.get("type"):
+            deltas.append({"op": "remove", "type": previous.get("type"), "_id": archer["_id"]})
+
+        self.archers[archer["_id"]] = archer
+        deltas.append({"op": "upsert", "type": archer.get("type"), "archer": deepcopy(archer),
+                       "position": self.positions(archer.get("type"))[archer["_id"]]})
+        for rank_type in rank_types:
+            deltas += self._moved(rank_type, before[rank_type], skip=archer["_id"])
+        return deltas
+
+    def remove(self, archer_id: Any) -> List[Dict[str, Any]]:
+        previous = self.archers.get(str(archer_id))
+        if not previous:
+            return []
+        before = self.positions(previous.get("type"))
+        del self.archers[previous["_id"]]
+        return [{"op": "remove", "type": previous.get("type"), "_id": previous["_id"]}] + self._moved(previous.get("type"), before)
+
+    def replace(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Swap in a freshly read leaderboard, return the deltas between the two."""
+        fresh = Leaderboard(documents)
+        deltas = []
+        for archer_id in [archer_id for archer_id in self.archers if archer_id not in fresh.archers]:
+            deltas += self.remove(archer_id)
+        for archer in fresh.archers.values():
+            deltas += self.apply(archer)
+        return deltas
+
+
+class LeaderboardSubscription:
+    """One connected client. Deltas queue up until its stream sends them."""
+
+    def __init__(self, queue_size: int):
+        self.queue: "Queue[Dict[str, Any]]" = Queue(maxsize=queue_size)
+        # set when the client fell too far behind, its stream sends a fresh snapshot instead
+        self.resync = False
+
+    def push(self, deltas: List[Dict[str, Any]]) -> None:
+        try:
+            for delta in deltas:
+                self.queue.put_nowait(delta)
+        except Full:
+            self._overflow()
+
+    def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        try:
+            return self.queue.get(timeout=timeout)
+        except Empty:
+            return None
+
+    def _overflow(self) -> None:
+        self.resync = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+
+class AsyncLeaderboardSubscription(LeaderboardSubscription):
+    """A client served by the ASGI app, waiting on the event loop instead of a thread."""
+
+    def __init__(self, queue_size: int, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.async_queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=queue_size)
+        self.resync = False
+
+    def push(self, deltas: List[Dict[str, Any]]) -> None:
+        self.loop.call_soon_threadsafe(self._put, deltas)
+
+    async def get_async(self, timeout: float) -> Optional[Dict[str, Any]]:
+        try:
+            return await asyncio.wait_for(self.async_queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def _put(self, deltas: List[Dict[str, Any]]) -> None:
+        try:
+            for delta in deltas:
+                self.async_queue.put_nowait(delta)
+        except asyncio.QueueFull:
+            self.resync = True
+            while not self.async_queue.empty():
+                self.async_queue.get_nowait()
+
+
+class LeaderboardFeed:
+    """
+    Keeps one live copy of the leaderboards per process and pushes every
+    change to the connected clients as a delta (archer, points, position).
+
+    A single thread follows ArcherRank through a change stream, so the
+    number of spectators does not change the load on Mongo. Without change
+    streams (a standalone server) the thread re-reads the collection every
+    `poll_interval` seconds while anyone is connected and sends the
+    difference.
+    """
+
+    def __init__(self, collection: str = "ArcherRank", poll_interval: float = 5, queue_size: int = 256):
+        self.collection = collection
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self.db: Optional[Database] = None
+        self.leaderboard: Optional[Leaderboard] = None
+        self._subscriptions: List[LeaderboardSubscription] = []
+        self._lock = Lock()
+        self._loaded = Event()
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+
+    def init_app(self, db: Database) -> None:
+        self.db = db
+
+    def subscribe(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> LeaderboardSubscription:
+        """Add a client. Pass the event loop for a client served by the ASGI app."""
+        subscription = AsyncLeaderboardSubscription(self.queue_size, loop) if loop else LeaderboardSubscription(self.queue_size)
+        with self._lock:
+            self._subscriptions.append(subscription)
+            if self._thread is None:
+                self._thread = Thread(target=self._follow, name=f"{self.collection}-leaderboard", daemon=True)
+                self._thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription: LeaderboardSubscription) -> None:
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def snapshot(self, timeout: float = 10) -> Dict[str, List[Dict[str, Any]]]:
+        """The current leaderboards, once the first read has finished."""
+        if not self._loaded.wait(timeout):
+            raise TimeoutError("Leaderboard not loaded yet")
+        with self._lock:
+            return self.leaderboard.snapshot()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _load(self) -> List[Dict[str, Any]]:
+        return self.db.find(self.collection, {})
+
+    def _broadcast(self, deltas: List[Dict[str, Any]]) -> None:
+        if not deltas:
+            return
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription.push(deltas)
+
+    def _follow(self) -> None:
+        resume_token = None
+        while not self._stop.is_set():
+            try:
+                with self.db.get_collection(self.collection).watch(
+                    [{"$match": {"operationType": {"$in": ["insert", "update", "replace", "delete"]}}}],
+                    full_document="updateLookup",
+                    resume_after=resume_token,
+                    max_await_time_ms=int(self.poll_interval * 1000)
+                ) as stream:
+                    # read after the stream is open, so no change falls between the two
+                    if not self._loaded.is_set():
+                        with self._lock:
+                            self.leaderboard = Leaderboard(self._load())
+                        self._loaded.set()
+
+                    while not self._stop.is_set():
+                        change = stream.try_next()
+                        if change is None:
+                            continue
+                        resume_token = stream.resume_token
+
+                        with self._lock:
+                            if change["operationType"] == "delete":
+                                deltas = self.leaderboard.remove(change["documentKey"]["_id"])
+                            elif change.get("fullDocument"):
+                                deltas = self.leaderboard.apply(change["fullDocument"])
+                            else:
+                                deltas = []
+                        self._broadcast(deltas)
+            except OperationFailure as e:
+                if e.code != ChangeFeed.CHANGE_STREAMS_UNSUPPORTED:
+                    logger.error(f"{self.collection} leaderboard stream failed: {str(e)}")
+                    self._stop.wait(self.poll_interval)
+                    continue
+                logger.info(f"Change streams unavailable, re-reading {self.collection} every {self.poll_interval}s.")
+                self._poll()
+            except PyMongoError as e:
+                logger.error(f"{self.collection} leaderboard stream failed: {str(e)}")
+                self._stop.wait(self.poll_interval)
+
+    def _poll(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if not self._loaded.is_set():
+                    with self._lock:
+                        self.leaderboard = Leaderboard(self._load())
+                    self._loaded.set()
+                elif self._subscriptions:
+                    documents = self._load()
+                    with self._lock:
+                        deltas = self.leaderboard.replace(documents)
+                    self._broadcast(deltas)
+            except PyMongoError as e:
+                logger.error(f"Polling {self.collection} failed: {str(e)}")
+            self._stop.wait(self.poll_interval)
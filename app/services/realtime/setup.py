@@ -0,0 +1,15 @@
+from app.config import config
+from app.database.models.archer_rank import ArcherRank
+from app.database.models.payment_ledger import PaymentLedger
+from app.services.realtime.change_feed import ChangeFeed
+from app.services.realtime.leaderboard import LeaderboardFeed
+
+# wakes payment status streams when a webhook records the outcome
+payment_feed = ChangeFeed(PaymentLedger.__name__, poll_interval=config.REALTIME_POLL_INTERVAL_SECONDS)
+
+# one live copy of the leaderboards per process, shared by every spectator
+leaderboard_feed = LeaderboardFeed(
+    ArcherRank.__name__,
+    poll_interval=config.REALTIME_POLL_INTERVAL_SECONDS,
+    queue_size=config.LEADERBOARD_SUBSCRIBER_QUEUE_SIZE
+)
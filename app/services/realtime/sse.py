@@ -0,0 +1,12 @@
+from typing import Any, Dict
+import json
+
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def sse_comment(text: str) -> str:
+    """A comment line, ignored by EventSource, that keeps idle connections open through proxies."""
+    return f": {text}\n\n"
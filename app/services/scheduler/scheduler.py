@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+from threading import Event, Thread
+from typing import Callable, Dict, List, Optional
+from flask import Flask
+from pymongo.errors import DuplicateKeyError, PyMongoError
+import logging
+import os
+import socket
+
+from app.database.base import Database
+from app.database import JobStateRepository
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduledJob:
+    def __init__(self, name: str, interval: timedelta, run: Callable[[datetime], Dict]):
+        self.name = name
+        self.interval = interval
+        self.run = run
+
+
+class Scheduler:
+    """
+    Runs periodic jobs on a daemon thread in every worker, but only the
+    worker holding the lease document actually runs them. The lease is
+    renewed on every tick and taken over by another worker once it expires.
+    """
+
+    LEASE_ID = "scheduler"
+
+    def __init__(self, tick_seconds: int = 30, lease_seconds: int = 90):
+        self.tick = tick_seconds
+        self.lease = timedelta(seconds=lease_seconds)
+        self.holder = f"{socket.gethostname()}:{os.getpid()}"
+        self.jobs: List[ScheduledJob] = []
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+
+    def add_job(self, name: str, interval_seconds: int, run: Callable[[datetime], Dict]) -> None:
+        """Register `run(now)`, called at most once per interval across all workers."""
+        self.jobs.append(ScheduledJob(name, timedelta(seconds=interval_seconds), run))
+
+    def start(self, app: Flask, db: Database) -> None:
+        if self._thread:
+            return
+
+        self.app = app
+        self.db = db
+        self.job_state_repo = JobStateRepository(db)
+        self._thread = Thread(target=self._loop, name="scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5) -> None:
+        """Stop the thread and hand the lease back, so another worker takes over without waiting for it to expire."""
+        self._stop.set()
+        if not self._thread:
+            return
+
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            # still inside a job, keep the lease so nobody starts the same job alongside it
+            return
+
+        try:
+            self.db.delete_one("SchedulerLease", {"_id": self.LEASE_ID, "holder": self.holder})
+        except PyMongoError as e:
+            logger.error(f"Failed to release the scheduler lease: {str(e)}")
+
+    def is_leader(self, now: datetime) -> bool:
+        """Take or renew the lease. Losing the upsert race to another worker means it is theirs."""
+        try:
+            lease = self.db.find_one_and_update(
+                "SchedulerLease",
+                {"_id": self.LEASE_ID, "$or": [{"holder": self.holder}, {"expires_at": {"$lt": now}}]},
+                {"$set": {"holder": self.holder, "expires_at": now + self.lease}},
+                upsert=True
+            )
+            return lease is not None and lease.get("holder") == self.holder
+        except DuplicateKeyError:
+            return False
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.tick):
+            try:
+                self.run_pending(datetime.now())
+            except PyMongoError as e:
+                logger.error(f"Scheduler tick failed: {str(e)}")
+
+    def run_pending(self, now: datetime) -> None:
+        if not self.is_leader(now):
+            return
+
+        with self.app.app_context():
+            for job in self.jobs:
+                state = self.job_state_repo.get_by_job(job.name) or {}
+                last_run_at: Optional[datetime] = state.get("last_run_at")
+                if last_run_at and last_run_at + job.interval > now:
+                    continue
+
+                try:
+                    result = job.run(now)
+                    self.job_state_repo.record_run(job.name, result)
+                    logger.info(f"Scheduled job '{job.name}' finished: {result}")
+                except Exception as e:
+                    logger.error(f"Scheduled job '{job.name}' failed: {str(e)}")
@@ -0,0 +1,7 @@
+from app.config import config
+from app.services.scheduler.scheduler import Scheduler
+
+scheduler = Scheduler(
+    tick_seconds=config.SCHEDULER_TICK_SECONDS,
+    lease_seconds=config.SCHEDULER_LEASE_SECONDS,
+)
@@ -8,4 +8,7 @@ from app.usecases.record.record import RecordUseCase
 from app.usecases.archer_rank.archer_rank import ArcherRankUseCase
 from app.usecases.payment.payment_history import PaymentHistoryUseCase
 from app.usecases.champion_user.champion_user import ChampionUserUseCase
-from app.usecases.file_upload.file_upload import FileUploadUseCase
\ No newline at end of file
+from app.usecases.file_upload.file_upload import FileUploadUseCase
+from app.usecases.reconciliation.reconciliation import ReconciliationUseCase
+from app.usecases.admin.admin import AdminUseCase
+from app.usecases.revenue.revenue import RevenueUseCase
\ No newline at end of file
@@ -0,0 +1,55 @@
+from app.database import (
+    UserRepository,
+    SubscriptionRepository,
+    PaymentHistoryRepository,
+    WalkInRepository,
+    ChampionUserRepository
+)
+from app.utils.single_flight import SingleFlightValue
+from typing import Dict, Any, Tuple
+from datetime import datetime
+
+
+class AdminUseCase:
+    # onboarding steps a member goes through, in order
+    ONBOARDING_STATUSES = ("Details", "Terms_Condition", "Waiver", "Payment", "done")
+
+    def __init__(self, user_repo: UserRepository, subscription_repo: SubscriptionRepository, payment_history_repo: PaymentHistoryRepository,
+                 walk_in_repo: WalkInRepository, champion_user_repo: ChampionUserRepository, summary_ttl: int = 30):
+        self.user_repo = user_repo
+        self.subscription_repo = subscription_repo
+        self.payment_history_repo = payment_history_repo
+        self.walk_in_repo = walk_in_repo
+        self.champion_user_repo = champion_user_repo
+
+        # dashboards poll this, one computation per ttl serves every admin in the process
+        self.summary = SingleFlightValue(self.build_summary, ttl=summary_ttl)
+
+    def get_summary(self) -> Tuple[bool, Dict[str, Any]]:
+        """The admin dashboard overview, at most `summary_ttl` seconds old."""
+        return True, {
+            "message": "Summary retrieved successfully.",
+            "data": self.summary.get()
+        }
+
+    def build_summary(self) -> Dict[str, Any]:
+        """One aggregation per collection."""
+        now = datetime.now()
+
+        members = self.user_repo.count_by_status()
+        subscriptions = self.subscription_repo.summarize()
+
+        return {
+            "generated_at": now,
+            "members": {
+                "by_status": {status: members.get(status, 0) for status in self.ONBOARDING_STATUSES},
+                "total": sum(members.values())
+            },
+            "revenue": self.payment_history_repo.summarize_revenue(now),
+            "subscriptions": {
+                **subscriptions,
+                "total_active_users": subscriptions["by_status"].get("active", 0)
+            },
+            "walk_ins_today": self.walk_in_repo.summarize_day(now),
+            "competition_registrations": self.champion_user_repo.count_by_status()
+        }
@@ -1,14 +1,24 @@
-from app.database import ArcherRankRepository
-from app.database.models.archer_rank import ArcherRank, ArcherRankUpdate
-from pymongo.errors import PyMongoError
-from bson import ObjectId
-from typing import Dict, Any, Tuple
+from app.database import ArcherRankRepository, MemberPointsRepository
+from app.database.unit_of_work import UnitOfWork
+from app.database.models.archer_rank import ArcherRank, ArcherRankUpdate, ArcherRankImport
+from app.services.cache.setup import response_cache
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import PyMongoError, BulkWriteError
+from pydantic import TypeAdapter, ValidationError
+from typing import Dict, Any, Iterable, List, Tuple
+from collections import Counter
 from datetime import datetime
+from app.config import config
+
+# built once, validating a row then skips the schema rebuild
+import_row_adapter = TypeAdapter(ArcherRankImport)
 
 
 class ArcherRankUseCase:
-    def __init__(self, archer_rank_repo: ArcherRankRepository):
+    def __init__(self, archer_rank_repo: ArcherRankRepository, member_points_repo: MemberPointsRepository, unit_of_work: UnitOfWork):
         self.archer_rank_repo = archer_rank_repo
+        self.member_points_repo = member_points_repo
+        self.unit_of_work = unit_of_work
 
     def create_archer_rank(self, data: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
         """Create a new archer rank."""
@@ -23,12 +33,19 @@ class ArcherRankUseCase:
         
         bson_data = archer_rank_data.to_bson()
 
-        # Insert into database
-        result_data = self.archer_rank_repo.create_archer_rank(bson_data)
+        # Insert into database, together with the member's new total
+        def create():
+            result = self.archer_rank_repo.create_archer_rank(bson_data)
+            self.member_points_repo.add(result['email'], result['point'])
+            return result
+
+        result_data = self.unit_of_work.run(create)
         if not result_data:
             return False, {
                 "message": "Archer rank creation failed."
             }
+
+        response_cache.invalidate("archer_ranks")
         
         # stringify the ObjectId
         result_data['_id'] = str(result_data['_id'])
@@ -38,6 +55,109 @@ class ArcherRankUseCase:
             "data": result_data
         }
 
+    def import_archer_ranks(self, rows: Iterable[Dict[str, Any]]) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Import a tournament result sheet: points are added to archers already
+        ranked in that category and new archers are created, in one batch
+        written in one unit of work with the members' totals.
+        """
+        results: List[Dict[str, Any]] = []
+        valid: List[Tuple[int, ArcherRankImport]] = []
+        seen = set()
+
+        for number, row in enumerate(rows, start=1):
+            if number > config.ARCHER_RANK_IMPORT_MAX_ROWS:
+                return False, {
+                    "message": f"Result sheets are limited to {config.ARCHER_RANK_IMPORT_MAX_ROWS} rows."
+                }
+
+            try:
+                parsed = import_row_adapter.validate_python(row)
+            except ValidationError as e:
+                results.append({"row": number, "status": "invalid", "message": e.errors(include_url=False, include_context=False)})
+                continue
+
+            key = (parsed.type.value, parsed.full_name)
+            if key in seen:
+                results.append({"row": number, "status": "duplicate", "message": "Archer appears earlier in the sheet."})
+                continue
+
+            seen.add(key)
+            valid.append((number, parsed))
+
+        # one prefetch instead of a duplicate check per row
+        existing: Dict[Tuple[str, str], Any] = {}
+        if valid:
+            for rank in self.archer_rank_repo.get_by_types_and_names(
+                list({row.type.value for _, row in valid}), list({row.full_name for _, row in valid})
+            ):
+                existing[(rank["type"], rank["full_name"])] = rank
+
+        now = datetime.now()
+        operations = []
+        planned: List[Dict[str, Any]] = []
+        # email of the member each operation adds points to, and how many
+        credits: List[Tuple[str, int]] = []
+        for number, row in valid:
+            rank = existing.get((row.type.value, row.full_name))
+            if rank:
+                update_fields: Dict[str, Any] = {"updated_at": now}
+                if row.image_url:
+                    update_fields["image_url"] = row.image_url
+                operations.append(UpdateOne({"_id": rank["_id"]}, {"$inc": {"point": row.point}, "$set": update_fields}))
+                planned.append({"row": number, "status": "updated", "full_name": row.full_name, "type": row.type.value})
+                credits.append((rank.get("email"), row.point))
+            else:
+                operations.append(InsertOne(ArcherRank(**row.model_dump()).to_bson()))
+                planned.append({"row": number, "status": "created", "full_name": row.full_name, "type": row.type.value})
+                credits.append((row.email, row.point))
+
+        # the ranks and the members' totals are written together
+        def write():
+            applied, error = len(operations), None
+            try:
+                self.archer_rank_repo.bulk_write_archer_ranks(operations)
+            except BulkWriteError as e:
+                if self.unit_of_work.supports_transactions():
+                    # the server aborted the transaction, roll back the whole sheet
+                    raise
+                # ordered writes stop at the first failure, nothing after it was applied
+                error = e.details["writeErrors"][0]
+                applied = error["index"]
+
+            # one batch for the members' totals, counting only the rows that were written
+            points_by_email: Counter = Counter()
+            for email, points in credits[:applied]:
+                points_by_email[email] += points
+            self.member_points_repo.add_many(points_by_email)
+            return applied, error
+
+        try:
+            applied, error = self.unit_of_work.run(write)
+        except BulkWriteError as e:
+            applied, error = 0, e.details["writeErrors"][0]
+
+        if error:
+            for index in range(applied, len(planned)):
+                planned[index]["status"] = "failed" if index == error["index"] else "skipped"
+            planned[error["index"]]["message"] = error.get("errmsg")
+
+        if operations:
+            response_cache.invalidate("archer_ranks")
+
+        results = sorted(results + planned, key=lambda result: result["row"])
+        summary = {status: 0 for status in ("created", "updated", "duplicate", "invalid", "failed", "skipped")}
+        for result in results:
+            summary[result["status"]] += 1
+
+        return True, {
+            "message": "Result sheet imported.",
+            "data": {
+                "summary": summary,
+                "rows": results
+            }
+        }
+
     def get_all_archer_ranks(self) -> Tuple[bool, Dict[str, Any]]:
         """Fetch all archer ranks."""
         # filter and sort archer rank by General, Recurve, Compound, and Barebow
@@ -80,23 +200,19 @@ class ArcherRankUseCase:
         try:   
             edit_archer_rank = ArcherRankUpdate(**data)
 
-            # get the archer rank by ID
-            archer_rank = self.archer_rank_repo.get_by_id(archer_rank_id)
-            archer_rank_data = ArcherRank(**archer_rank)
-            edit_archer_rank.point = edit_archer_rank.point + archer_rank_data.point
-
-            edit_data = edit_archer_rank.to_bson()
+            # the points are added in place, and to the member's total in the same unit of work
+            def update():
+                rank = self.archer_rank_repo.add_points(archer_rank_id, edit_archer_rank.point, edit_archer_rank.updated_at)
+                if rank:
+                    self.member_points_repo.add(rank.get('email'), edit_archer_rank.point)
+                return rank
 
-            result_data = self.archer_rank_repo.find_and_update_archer_rank({"_id": ObjectId(archer_rank_id)}, edit_data)
-            if result_data.matched_count == 0:
+            if not self.unit_of_work.run(update):
                 return False, {
                     "message": "Archer rank not found."
                 }
-            
-            if result_data.modified_count == 0:
-                return False, {
-                    "message": "No changes were made."
-                }
+
+            response_cache.invalidate("archer_ranks")
             
             return True, {
                 "message": "Archer rank updated successfully."
@@ -108,11 +224,18 @@ class ArcherRankUseCase:
     def delete_archer_rank(self, archer_rank_id: str) -> Tuple[bool, Dict[str, Any]]:
         """Delete an archer rank by ID."""
         try:
-            result_data = self.archer_rank_repo.find_and_delete_archer_rank({"_id": ObjectId(archer_rank_id)})
-            if result_data.deleted_count == 0:
+            def delete():
+                rank = self.archer_rank_repo.remove_archer_rank(archer_rank_id)
+                if rank:
+                    self.member_points_repo.add(rank.get('email'), -rank.get('point', 0))
+                return rank
+
+            if not self.unit_of_work.run(delete):
                 return False, {
                     "message": "Archer rank not found."
                 }
+
+            response_cache.invalidate("archer_ranks")
             
             return True, {
                 "message": "Archer rank deleted successfully."
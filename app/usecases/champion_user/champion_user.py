@@ -1,17 +1,47 @@
 from app.database import ChampionUserRepository, PaymentHistoryRepository
 from app.database.models.champion_user import ChampionUser, ChampionUserUpdate
 from app.database.models.payment_history import PaymentHistory
-from pymongo.errors import PyMongoError
+from pymongo.errors import DuplicateKeyError, PyMongoError
 from bson import ObjectId
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from app.services.paystack.setup import paystack
+from app.utils.spreadsheet import iter_csv, iter_xlsx
+from datetime import datetime
 from uuid import uuid4
 
 
 class ChampionUserUseCase:
-    def __init__(self, champion_user_repo: ChampionUserRepository, payment_history_repo: PaymentHistoryRepository):
+    # export column headings and the registration fields they come from
+    EXPORT_COLUMNS = [
+        ("Unique ID", "unique_id"),
+        ("First name", "firstName"),
+        ("Last name", "lastName"),
+        ("Email", "email"),
+        ("Phone number", "PhoneNumber"),
+        ("Sex", "sex"),
+        ("Date of birth", "date"),
+        ("Official", "isOfficial"),
+        ("Status", "status"),
+        ("Association", "Association"),
+        ("Nationality", "Nationality"),
+        ("Language", "Language"),
+        ("Departure state", "Departure_state"),
+        ("Departure country", "Departure_country"),
+        ("Category", "Category"),
+        ("Selection", "Selection"),
+        ("Passport", "image_url"),
+        ("Registered at", "created_at"),
+    ]
+    EXPORT_FORMATS = {
+        "csv": "text/csv",
+        "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    }
+
+    def __init__(self, champion_user_repo: ChampionUserRepository, payment_history_repo: PaymentHistoryRepository,
+                 export_batch_size: int = 500):
         self.champion_user_repo= champion_user_repo
         self.payment_history_repo = payment_history_repo
+        self.export_batch_size = export_batch_size
 
     def create_champion_user(self, data: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
         """Create a new champion user."""
@@ -20,36 +50,23 @@ class ChampionUserUseCase:
         champion_user_data = ChampionUser(**data)
         bson_data = champion_user_data.to_bson()
 
-        # get champion user with email and see if it already exists 
-        existing_champion_data = self.champion_user_repo.get_by_email(champion_user_email=champion_user_data.email)
-        if existing_champion_data:
-            # check if status is paymennt
-            if existing_champion_data.get('status') == 'payment' or existing_champion_data.get('status') == 'paid':
-                return False, {
-                    "message": "Registration completed",
-                    "status": 409
-                }
-            del bson_data['created_at']
-            
-            self.champion_user_repo.find_and_update_champion_user({"_id": existing_champion_data.get('_id')}, bson_data)
-            return True, {
-                "message": "Champion user updated successfully.",
-                "data": {
-                    "id": str(existing_champion_data.get('_id'))
-                }
-            }
+        # one upsert on the unique email index instead of a lookup then a write
+        for attempt in range(2):
+            try:
+                champion_user_id, created = self.champion_user_repo.register_champion_user(bson_data)
+                break
+            except DuplicateKeyError:
+                # the email is settled, or a concurrent double-submit inserted it first
+                if attempt:
+                    return False, {
+                        "message": "Registration completed",
+                        "status": 409
+                    }
 
-        # Insert into database
-        result_id = self.champion_user_repo.create_champion_user(bson_data)
-        if not result_id:
-            return False, {
-                "message": "Champion user creation failed."
-            }
-    
         return True, {
-            "message": "Champion user created successfully.",
+            "message": "Champion user created successfully." if created else "Champion user updated successfully.",
             "data": {
-                "id": result_id
+                "id": champion_user_id
             }
         }
     
@@ -166,6 +183,65 @@ class ChampionUserUseCase:
             "data": result
         }
     
+    def export_champion_users(self, file_format: str, status: Optional[str] = None, search: str = "",
+                              official: Optional[bool] = None) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Every registration matching the filters as a CSV or XLSX file. The body
+        is a generator reading the registrations off one cursor, so memory
+        stays flat however many there are. `status` takes a comma-separated
+        list, `search` matches first and last names like the listing does.
+        """
+        if file_format not in self.EXPORT_FORMATS:
+            return False, {"message": f"format must be one of {', '.join(self.EXPORT_FORMATS)}."}
+
+        query: Dict[str, Any] = {}
+        statuses = [value.strip() for value in (status or "").split(",") if value.strip()]
+        if statuses:
+            query["status"] = {"$in": statuses}
+        if search:
+            query["$or"] = [
+                {"firstName": {"$regex": search, "$options": "i"}},
+                {"lastName": {"$regex": search, "$options": "i"}},
+            ]
+        if official is not None:
+            query["isOfficial"] = official
+
+        header = [heading for heading, _ in self.EXPORT_COLUMNS]
+        rows = self._export_rows(query)
+        try:
+            body = iter_csv(header, rows) if file_format == "csv" else iter_xlsx(header, rows)
+        except ImportError:
+            return False, {"message": "XLSX export needs openpyxl installed, use format=csv."}
+
+        return True, {
+            "message": "Champion users exported.",
+            "data": {
+                "filename": f"champion-users-{datetime.now():%Y%m%d-%H%M}.{file_format}",
+                "mimetype": self.EXPORT_FORMATS[file_format],
+                "body": body
+            }
+        }
+
+    def _export_rows(self, query: Dict[str, Any]) -> Iterator[List[Any]]:
+        cursor = self.champion_user_repo.iter_for_export(
+            query, {field: 1 for _, field in self.EXPORT_COLUMNS}, self.export_batch_size
+        )
+        try:
+            for champion_user in cursor:
+                champion_user["Category"] = self._flatten_categories(champion_user.get("Category"))
+                yield [champion_user.get(field) for _, field in self.EXPORT_COLUMNS]
+        finally:
+            # also runs when the client disconnects mid-download
+            cursor.close()
+
+    @staticmethod
+    def _flatten_categories(categories: Optional[List[Dict[str, str]]]) -> str:
+        """[{"bow": "Recurve", "division": "Men"}, ...] as "bow: Recurve, division: Men; ..."."""
+        return "; ".join(
+            ", ".join(f"{key}: {value}" for key, value in category.items())
+            for category in categories or [] if isinstance(category, dict)
+        )
+
     def update_champion_user_payment_status(self, champion_user_id: str) -> Tuple[bool, Dict[str, Any]]:
         """
         Update an champion user payment by ID.
@@ -189,6 +265,7 @@ class ChampionUserUseCase:
             history_data = {
                 "email": champion_user_data.get('email'),
                 "status": "success",
+                "type": "competition",
                 "amount": champion_user_data.get('amount'),
             }
 
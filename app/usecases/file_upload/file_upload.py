@@ -1,9 +1,9 @@
-import cloudinary.uploader as uploader
+from app.services.media.uploader import upload
 from typing import Tuple, Dict, Any
 
 class FileUploadUseCase:
     def upload(self, file) -> Tuple[bool, Dict[str, Any]]:
-        upload_result = uploader.upload(file)
+        upload_result = upload(file)
         file_url = upload_result.get('secure_url')
 
         return True, {
@@ -1,6 +1,7 @@
 from app.database import PlanRepository
 from app.database.models.plan import Plan, PlanUpdate, IntervalType
 from app.services.paystack.setup import paystack
+from app.services.cache.setup import response_cache
 from pymongo.errors import PyMongoError
 from bson import ObjectId
 from typing import Dict, Any, Optional, Tuple
@@ -46,6 +47,8 @@ class PlanUseCase:
                 "message": "Plan creation failed."
             }
 
+        response_cache.invalidate("plans")
+
         # stringify the ObjectId
         result_data['_id'] = str(result_data['_id'])
 
@@ -104,6 +107,8 @@ class PlanUseCase:
             # Check if any changes were made
             if result.modified_count == 0:
                 return False, {"message": "No changes were made to the plan."}
+
+            response_cache.invalidate("plans")
             
             # get the update plan by id
             plan_data = Plan(**self.plan_repo.get_by_id(plan_id=plan_id))
@@ -145,6 +150,8 @@ class PlanUseCase:
             if result.deleted_count == 0:
                 return False, {"message": "Plan not found or already deleted."}
 
+            response_cache.invalidate("plans")
+
             return True, {"message": "Plan deleted successfully."}
 
         except PyMongoError as e:
@@ -0,0 +1,245 @@
+from app.database import SubscriptionRepository, PaymentHistoryRepository, UserRepository, PlanRepository, JobStateRepository
+from app.database.models.subscription import Subscription
+from app.database.models.payment_history import PaymentHistory, PAYMENT_TYPES
+from app.services.paystack.setup import paystack
+from pymongo import InsertOne, UpdateOne
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+
+
+def chunked(items: List[Any], size: int) -> Iterator[List[Any]]:
+    """Split a list into slices of at most `size` items."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def to_naive_utc(value: Optional[str]) -> Optional[datetime]:
+    """Parse a Paystack timestamp into the naive UTC datetime Mongo hands back."""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class ReconciliationUseCase:
+    """
+    Brings Subscription and PaymentHistory back in line with Paystack
+    after missed webhooks.
+
+    Incremental runs only look at transactions since the saved watermark,
+    the subscriptions of the customers behind them and local subscriptions
+    whose billing date passed in the meantime, so the work grows with the
+    number of changes rather than with the number of members.
+    """
+
+    JOB = "paystack_reconciliation"
+    PAGE_SIZE = 100
+    # query size for the $in lookups against Mongo
+    BATCH_SIZE = 500
+
+    def __init__(self, subscription_repo: SubscriptionRepository, payment_history_repo: PaymentHistoryRepository,
+                 user_repo: UserRepository, plan_repo: PlanRepository, job_state_repo: JobStateRepository,
+                 overlap: timedelta = timedelta(hours=1)):
+        self.subscription_repo = subscription_repo
+        self.payment_history_repo = payment_history_repo
+        self.user_repo = user_repo
+        self.plan_repo = plan_repo
+        self.job_state_repo = job_state_repo
+        # re-read a little before the watermark so late-settling transactions are not missed
+        self.overlap = overlap
+
+    def reconcile(self, full: bool = False) -> Tuple[bool, Dict[str, Any]]:
+        """Run one reconciliation pass, everything when `full` or on the first run."""
+        # naive UTC like the Paystack timestamps, a local clock would eat into the overlap
+        started_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        state = self.job_state_repo.get_by_job(self.JOB)
+        full = full or not state or not state.get("watermark")
+        since = None if full else state["watermark"] - self.overlap
+
+        params = {"status": "success"}
+        if since:
+            params["from"] = since.replace(tzinfo=timezone.utc).isoformat()
+        transactions = {tx["reference"]: tx for tx in self._pages(paystack.transaction.list, **params)}
+
+        if full:
+            remote_subscriptions = {
+                sub["subscription_code"]: sub for sub in self._pages(paystack.subscription.list)
+            }
+        else:
+            remote_subscriptions = self._affected_subscriptions(transactions, since, started_at)
+
+        # both passes resolve the same customers and plans
+        customer_codes = {tx["customer"]["customer_code"] for tx in transactions.values()}
+        customer_codes |= {sub["customer"]["customer_code"] for sub in remote_subscriptions.values()}
+        users = self._users_by_customer_code(list(customer_codes))
+        plan_ids = self.plan_repo.get_plan_ids_by_code()
+
+        result = {
+            "full": full,
+            "since": since.isoformat() if since else None,
+            **self._reconcile_transactions(transactions, users, plan_ids),
+            **self._reconcile_subscriptions(remote_subscriptions, users, plan_ids),
+        }
+
+        self.job_state_repo.save_run(self.JOB, started_at, result)
+
+        return True, {
+            "message": "Reconciliation completed.",
+            "data": result
+        }
+
+    def _pages(self, list_fn: Callable[..., Dict], **params) -> Iterator[Dict[str, Any]]:
+        """Walk every page of a Paystack listing."""
+        page = 1
+        while True:
+            response: Dict = list_fn(perPage=self.PAGE_SIZE, page=page, **params)
+            if not response.get("status"):
+                raise RuntimeError(f"Paystack listing failed: {response.get('message')}")
+
+            data: List[Dict] = response.get("data") or []
+            yield from data
+
+            meta: Dict = response.get("meta") or {}
+            if not data or page >= int(meta.get("pageCount") or 1):
+                return
+            page += 1
+
+    def _affected_subscriptions(self, transactions: Dict[str, Dict], since: datetime,
+                                until: datetime) -> Dict[str, Dict[str, Any]]:
+        """Remote state of the subscriptions that could have changed since the watermark."""
+        remote: Dict[str, Dict[str, Any]] = {}
+
+        # customers who paid for a plan, which is when subscriptions are created or renewed
+        customer_ids = {tx["customer"]["id"] for tx in transactions.values() if self._plan_code(tx)}
+        for customer_id in customer_ids:
+            for sub in self._pages(paystack.subscription.list, customer=customer_id):
+                remote[sub["subscription_code"]] = sub
+
+        # subscriptions that were due to renew or lapse, which is when they get cancelled or expire
+        for local in self.subscription_repo.get_due_subscriptions(since, until):
+            code = local.get("subscription_code")
+            if not code or code in remote:
+                continue
+
+            response: Dict = paystack.subscription.fetch(subscription_id=code)
+            if response.get("status"):
+                remote[code] = response["data"]
+
+        return remote
+
+    def _users_by_customer_code(self, customer_codes: List[str]) -> Dict[str, Dict[str, Any]]:
+        users: Dict[str, Dict[str, Any]] = {}
+        for batch in chunked(customer_codes, self.BATCH_SIZE):
+            for user in self.user_repo.get_by_customer_codes(batch):
+                users[user["customer_code"]] = user
+        return users
+
+    @staticmethod
+    def _plan_code(payload: Dict[str, Any]) -> Optional[str]:
+        plan = payload.get("plan")
+        return plan.get("plan_code") if isinstance(plan, dict) else None
+
+    @classmethod
+    def _payment_type(cls, tx: Dict[str, Any]) -> Optional[str]:
+        """What the payment was for: the type in its metadata, else a plan charge without one is a renewal."""
+        metadata = tx.get("metadata")
+        custom = metadata.get("custom") if isinstance(metadata, dict) else None
+        if isinstance(custom, dict) and custom.get("type"):
+            return PAYMENT_TYPES.get(custom["type"])
+        return "renewal" if cls._plan_code(tx) else None
+
+    def _reconcile_transactions(self, transactions: Dict[str, Dict], users: Dict[str, Dict],
+                                plan_ids: Dict[str, Any]) -> Dict[str, int]:
+        """Record successful transactions that never made it into PaymentHistory."""
+        references = list(transactions)
+        recorded = set()
+        for batch in chunked(references, self.BATCH_SIZE):
+            recorded |= self.payment_history_repo.get_existing_references(batch)
+
+        operations = []
+        for reference in references:
+            if reference in recorded:
+                continue
+
+            tx = transactions[reference]
+            customer: Dict = tx["customer"]
+            user = users.get(customer.get("customer_code"))
+            plan_id = plan_ids.get(self._plan_code(tx))
+
+            history = PaymentHistory(**{
+                "amount": tx.get("amount"),
+                "status": tx.get("status"),
+                "type": self._payment_type(tx),
+                "reference": reference,
+                "email": customer.get("email"),
+                "payment_date": tx.get("paid_at") or tx.get("paidAt"),
+                "user_id": user["_id"] if user else None,
+                "plan_id": plan_id
+            })
+            operations.append(InsertOne(history.to_bson()))
+
+        self.payment_history_repo.bulk_write_payment_history(operations)
+
+        return {
+            "transactions_checked": len(references),
+            "payments_recorded": len(operations)
+        }
+
+    def _reconcile_subscriptions(self, remote: Dict[str, Dict], users: Dict[str, Dict],
+                                 plan_ids: Dict[str, Any]) -> Dict[str, int]:
+        """Correct the status and billing date of drifted subscriptions and add missing ones."""
+        local: Dict[str, Dict[str, Any]] = {}
+        for batch in chunked(list(remote), self.BATCH_SIZE):
+            for sub in self.subscription_repo.get_by_subscription_codes(batch):
+                local[sub["subscription_code"]] = sub
+
+        operations = []
+        updated = inserted = unresolved = 0
+        now = datetime.now()
+
+        for code, sub in remote.items():
+            next_payment_date = to_naive_utc(sub.get("next_payment_date"))
+            existing = local.get(code)
+
+            if existing:
+                changes: Dict[str, Any] = {}
+                if existing.get("status") != sub.get("status"):
+                    changes["status"] = sub.get("status")
+                end_date: Optional[datetime] = existing.get("end_date")
+                # Mongo keeps milliseconds, so compare to the second
+                if next_payment_date and (not end_date or abs((end_date - next_payment_date).total_seconds()) >= 1):
+                    changes["end_date"] = next_payment_date
+
+                if changes:
+                    changes["updated_at"] = now
+                    operations.append(UpdateOne({"_id": existing["_id"]}, {"$set": changes}))
+                    updated += 1
+                continue
+
+            user = users.get(sub["customer"]["customer_code"])
+            plan_id = plan_ids.get(self._plan_code(sub))
+            if not user or not plan_id:
+                unresolved += 1
+                continue
+
+            subscription = Subscription(**{
+                "user_id": user["_id"],
+                "plan_id": plan_id,
+                "email": sub["customer"].get("email") or user.get("email"),
+                "email_token": sub.get("email_token"),
+                "subscription_code": code,
+                "start_date": to_naive_utc(sub.get("createdAt")) or now,
+                "end_date": next_payment_date,
+                "status": sub.get("status"),
+                **self.subscription_repo.user_details(user)
+            })
+            operations.append(InsertOne(subscription.to_bson()))
+            inserted += 1
+
+        self.subscription_repo.bulk_write_subscriptions(operations)
+
+        return {
+            "subscriptions_checked": len(remote),
+            "subscriptions_updated": updated,
+            "subscriptions_recorded": inserted,
+            "subscriptions_unresolved": unresolved
+        }
@@ -1,5 +1,6 @@
 from app.database import RecordRepository
 from app.database.models.record import Record
+from app.services.cache.setup import response_cache
 from werkzeug.datastructures import MultiDict
 from pymongo.errors import PyMongoError
 from bson import ObjectId
@@ -21,6 +22,8 @@ class RecordUseCase:
             return False, {
                 "message": "Record creation failed."
             }
+
+        response_cache.invalidate("records")
         
         # stringify the ObjectId
         result_data['_id'] = str(result_data['_id'])
@@ -76,6 +79,8 @@ class RecordUseCase:
                 return False, {
                     "message": "No changes were made.",
                 }
+
+            response_cache.invalidate("records")
             
             return True, {
                 "message": "Record updated successfully.",
@@ -91,6 +96,8 @@ class RecordUseCase:
                 return False, {
                     "message": "Record not found."
                 }
+
+            response_cache.invalidate("records")
             
             return True, {
                 "message": "Record deleted successfully."
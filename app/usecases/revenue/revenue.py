@@ -0,0 +1,92 @@
+from app.database import RevenueRollupRepository, JobStateRepository
+from typing import Any, Dict, Optional, Tuple
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+
+class RevenueUseCase:
+    """
+    Revenue reports read from RevenueRollup, PaymentHistory summed per day,
+    plan, type and status, so a year is a few hundred rows.
+
+    Each rollup run recomputes the days of the payments recorded since the
+    saved watermark. Recomputing whole days rather than adding to them
+    means a retried run, or one re-reading past the watermark, counts every
+    payment once. Runs hold a lock in JobState, so a scheduled run and
+    `flask rollup-revenue` never write the same days at the same time.
+    """
+
+    JOB = "revenue_rollup"
+
+    def __init__(self, revenue_rollup_repo: RevenueRollupRepository, job_state_repo: JobStateRepository,
+                 overlap: timedelta = timedelta(minutes=10), lock_ttl: timedelta = timedelta(hours=1)):
+        self.revenue_rollup_repo = revenue_rollup_repo
+        self.job_state_repo = job_state_repo
+        # payments are timestamped before they commit, re-read a little before the watermark
+        self.overlap = overlap
+        # a run that dies keeps the others out for this long at most
+        self.lock_ttl = lock_ttl
+
+    def roll_up(self, now: datetime, full: bool = False) -> Dict[str, Any]:
+        """
+        Bring the rollups up to date, every day when `full` or on the first run.
+        Does nothing while another run holds the lock.
+        """
+        holder = uuid4().hex
+        if not self.job_state_repo.acquire_lock(self.JOB, holder, self.lock_ttl):
+            return {"skipped": "another rollup is running"}
+
+        try:
+            state = self.job_state_repo.get_by_job(self.JOB)
+            full = full or not state or not state.get("watermark")
+
+            days = None if full else self.revenue_rollup_repo.days_recorded_since(state["watermark"] - self.overlap)
+            removed = self.revenue_rollup_repo.roll_up(days, now) if days is None or days else 0
+
+            result = {
+                "full": full,
+                "days": None if days is None else len(days),
+                "buckets_removed": removed
+            }
+            self.job_state_repo.save_run(self.JOB, now, result)
+            return result
+        finally:
+            self.job_state_repo.release_lock(self.JOB, holder)
+
+    def get_report(self, since: Optional[str], until: Optional[str], period: str = "month") -> Tuple[bool, Dict[str, Any]]:
+        """
+        Revenue per period (day, month or year), plan, type and status between
+        two dates, `until` included. Defaults to the last twelve months, this one
+        included.
+        """
+        if period not in self.revenue_rollup_repo.PERIOD_FORMATS:
+            return False, {"message": f"period must be one of {', '.join(self.revenue_rollup_repo.PERIOD_FORMATS)}."}
+
+        try:
+            today = datetime.combine(datetime.now().date(), datetime.min.time())
+            end = datetime.strptime(until, "%Y-%m-%d") if until else today
+            if since:
+                start = datetime.strptime(since, "%Y-%m-%d")
+            else:
+                # the first day of the month eleven months back
+                months_back = end.year * 12 + end.month - 1 - 11
+                start = datetime(months_back // 12, months_back % 12 + 1, 1)
+        except ValueError:
+            return False, {"message": "from and to must be dates like 2025-01-31."}
+
+        if start > end:
+            return False, {"message": "from must not be after to."}
+
+        state = self.job_state_repo.get_by_job(self.JOB) or {}
+
+        return True, {
+            "message": "Revenue report retrieved successfully.",
+            "data": {
+                "from": start.date().isoformat(),
+                "to": end.date().isoformat(),
+                "period": period,
+                # payments recorded after this are not in the report yet
+                "rolled_up_at": state.get("last_run_at"),
+                "rows": self.revenue_rollup_repo.report(start, end + timedelta(days=1), period)
+            }
+        }
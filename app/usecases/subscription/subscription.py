@@ -1,18 +1,29 @@
-from app.database import SubscriptionRepository, UserRepository, PlanRepository, WalkInRepository
+from app.database import SubscriptionRepository, UserRepository, PlanRepository, WalkInRepository, SessionSlotRepository, PaymentLedgerRepository
 from app.database.models.subscription import Subscription
 from app.database.models.walk_in import WalkIn
+from app.database.models.session_slot import SessionHold
+from app.database.models.payment_ledger import FINAL_PAYMENT_STATUSES
 from bson import ObjectId
 from typing import Dict, Any, Optional, Tuple
-from datetime import datetime
+from datetime import datetime, timedelta
+from uuid import uuid4
 from app.services.paystack.setup import paystack
+from app.services.paystack.customers import provision_customer
+from app.utils.lru_cache import LRUCache
+from app.config import config
 
 
 class SubscriptionUseCase:
-    def __init__(self, subscription_repo: SubscriptionRepository, user_repo: UserRepository, plan_repo: PlanRepository, walk_in_repo: WalkInRepository):
+    def __init__(self, subscription_repo: SubscriptionRepository, user_repo: UserRepository, plan_repo: PlanRepository, walk_in_repo: WalkInRepository, session_slot_repo: SessionSlotRepository, payment_ledger_repo: PaymentLedgerRepository):
         self.walk_in_repo = walk_in_repo
+        self.session_slot_repo = session_slot_repo
         self.subscription_repo = subscription_repo
         self.user_repo = user_repo
         self.plan_repo = plan_repo
+        self.payment_ledger_repo = payment_ledger_repo
+
+        # the callback page polls verify_payment, repeats within the ttl are answered from memory
+        self.payment_status_cache = LRUCache(max_entries=config.PAYMENT_STATUS_CACHE_MAX_ENTRIES, ttl=config.PAYMENT_STATUS_CACHE_TTL_SECONDS)
 
     def create_subscription(self, user_id: str, callback_url: str) -> Tuple[bool, Dict[str, Any]]:
         """Create a new subscription."""
@@ -41,6 +52,12 @@ class SubscriptionUseCase:
                     "message": "User already has an active subscription."
                 }
 
+        # normally set by the background task started at registration
+        if not provision_customer(self.user_repo, user_data):
+            return False, {
+                "message": "Could not create a payment profile, please try again."
+            }
+
         old_amount = plan_data.get('Price')
 
         new_reg = self.plan_repo.get_by_registration()
@@ -83,18 +100,18 @@ class SubscriptionUseCase:
         """Fetch all subscriptions."""
         return self.subscription_repo.get_all_subscriptions()
     
-    def get_all_subscriptions_with_user_details(self) -> Tuple[bool, Dict[str, Any]]:
-        """Fetch all subscriptions with user details."""
-        subscriptions = self.subscription_repo.get_subscriptions_with_user_details()
+    def get_all_subscriptions_with_user_details(self, page: int, limit: int) -> Tuple[bool, Dict[str, Any]]:
+        """Fetch a page of subscriptions with user details."""
+        result = self.subscription_repo.get_subscriptions_with_user_details(page, limit)
 
-        if len(subscriptions) < 1:
+        if result["total"] < 1:
             return False, {
                 "message": "Subscriptions not found."
             }
         
         return True, {
             "message": "Subscriptions found.",
-            "data": subscriptions
+            "data": result
         }
 
 
@@ -235,31 +252,39 @@ class SubscriptionUseCase:
             "last_name": last_name
         })
 
-        # get the number of people with given entry date
-        number_of_people = self.walk_in_repo.get_walkin_count_pipeline(entry_date=walkin.entry_date)
-        if len(number_of_people) != 0 and number_of_people[0].get('total_walkins') == 6:
+        # hold a place in the session until the payment comes through
+        hold = SessionHold(
+            hold_id=str(uuid4()),
+            email=email,
+            expires_at=datetime.now() + timedelta(minutes=config.WALKIN_HOLD_TTL_MINUTES)
+        )
+        if not self.reserve_session_place(walkin.entry_date, hold):
             return False, {
                 "message": "Fully booked for session",
                 "status": 400
             }
-        
-        
 
-        response: Dict = paystack.transaction.initialize(
-                email=email,
-                amount=amount * 100,
-                callback_url=callback_url,
-                metadata={
-                    "custom": {
-                        "type": "walkin",
-                        "entry_date": entry_date,
-                        "first_name": first_name,
-                        "last_name": last_name
+        try:
+            response: Dict = paystack.transaction.initialize(
+                    email=email,
+                    amount=amount * 100,
+                    callback_url=callback_url,
+                    metadata={
+                        "custom": {
+                            "type": "walkin",
+                            "entry_date": entry_date,
+                            "first_name": first_name,
+                            "last_name": last_name,
+                            "hold_id": hold.hold_id
+                        }
                     }
-                }
-            )
+                )
+        except Exception:
+            self.session_slot_repo.release_hold(walkin.entry_date, hold.hold_id)
+            raise
 
         if not response.get('status'):
+                self.session_slot_repo.release_hold(walkin.entry_date, hold.hold_id)
                 return False, {
                     "message": response.get('message'),
                     "status": 400
@@ -275,10 +300,36 @@ class SubscriptionUseCase:
                 "status": 200
             }
 
+    def reserve_session_place(self, entry_date: datetime, hold: SessionHold) -> bool:
+        """
+            Atomically takes a place in a walk-in session, returns False when it is full
+        """
+        if self.session_slot_repo.reserve_hold(entry_date, hold):
+            return True
+
+        if not self.session_slot_repo.get_by_date(entry_date):
+            # first booking for this session, seed the counter from the walk-ins already recorded
+            number_of_people = self.walk_in_repo.get_walkin_count_pipeline(entry_date=entry_date)
+            booked = number_of_people[0].get('total_walkins') if number_of_people else 0
+            self.session_slot_repo.create_slot(entry_date, config.WALKIN_SESSION_CAPACITY, booked)
+        else:
+            # full unless some holds were never paid for
+            self.session_slot_repo.release_expired_holds(entry_date)
+
+        return self.session_slot_repo.reserve_hold(entry_date, hold) is not None
+
     def verify_payment(self, reference: str) -> Tuple[bool, Dict[str, Any]]:
         """
-            verify payment by the reference
+            verify payment by the reference, from the payment ledger when a
+            webhook already reported it and from Paystack otherwise
         """
+        if cached := self.payment_status_cache.get(reference):
+            return True, cached
+
+        if result := self.get_recorded_payment(reference):
+            self.payment_status_cache.set(reference, result)
+            return True, result
+
         response: Dict = paystack.transaction.verify(
             reference=reference
         )
@@ -290,12 +341,56 @@ class SubscriptionUseCase:
                 }
 
         response_data: Dict = response.get('data')
-        
-        return True, {
+
+        # settled outcomes go in the ledger, a pending one is asked about again
+        if response_data.get('status') in FINAL_PAYMENT_STATUSES:
+            self.payment_ledger_repo.record(reference, response_data.get('status'), "verify",
+                                            amount=response_data.get('amount'), paid_at=response_data.get('paid_at'))
+
+        result = {
             "status": response_data.get('status'),
             "message": response.get('message')
         }
+        self.payment_status_cache.set(reference, result)
+        return True, result
     
+    def get_recorded_payment(self, reference: str) -> Optional[Dict[str, Any]]:
+        """
+            the verification result for a payment already in the ledger, None if
+            no outcome has been recorded yet
+        """
+        entry = self.payment_ledger_repo.get_by_reference(reference)
+        if not entry:
+            return None
+
+        return self.recorded_payment_result(entry)
+
+    @staticmethod
+    def recorded_payment_result(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """
+            shapes a ledger entry like a Paystack verification
+        """
+        return {
+            "status": entry.get('status'),
+            "message": "Verification successful"
+        }
+
+    def expire_subscriptions(self, now: datetime) -> Dict[str, int]:
+        """
+            Moves lapsed subscriptions on when no Paystack event did: non-renewing
+            ones past their end_date are completed, active ones not renewed within
+            the grace period need attention.
+        """
+        completed = self.subscription_repo.transition_lapsed("non-renewing", "completed", now)
+        overdue = self.subscription_repo.transition_lapsed(
+            "active", "attention", now - timedelta(hours=config.SUBSCRIPTION_RENEWAL_GRACE_HOURS)
+        )
+
+        return {
+            "completed": completed.modified_count,
+            "attention": overdue.modified_count
+        }
+
     def get_active_users(self) -> Tuple[bool, Dict[str, Any]]:
         """
             Gets all active users by with plan name too
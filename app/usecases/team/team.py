@@ -1,6 +1,7 @@
 from pymongo.errors import PyMongoError
 from app.database import TeamRepository
 from app.database.models.team import Team
+from app.services.cache.setup import response_cache
 from bson import ObjectId
 from typing import Dict, Any, Tuple
 from datetime import datetime
@@ -16,6 +17,7 @@ class TeamUseCase:
 
         # Insert into database
         result_data = self.team_repo.create_team(bson_data)
+        response_cache.invalidate("teams")
     
         return True, {
             "message": "Team Member created successfully.",
@@ -74,6 +76,8 @@ class TeamUseCase:
                     "message": "No changes made to the team Member.",
                     "status": 304
                     }
+
+            response_cache.invalidate("teams")
             return True, {
                 "message": "Team Member updated successfully."
             }
@@ -89,6 +93,8 @@ class TeamUseCase:
                 return False, {
                     "message": "Team Member not found"
                 }
+
+            response_cache.invalidate("teams")
             return True, {
                 "message": "Team Member deleted successfully."
             }
@@ -2,24 +2,27 @@ from app.database import (
     UserRepository,
     SubscriptionRepository,
     PlanRepository,
-    ArcherRankRepository,
+    MemberPointsRepository,
     PaymentHistoryRepository
 )
 from app.database.models.user import User, UserUpdate
 from app.database.models.subscription import Subscription
 from app.database.models.plan import Plan
 from flask_jwt_extended import create_access_token, create_refresh_token
-from app.services.paystack.setup import paystack
+from app.services.background.setup import background_tasks
+from app.services.paystack.customers import provision_customer
+from app.services.hashing.hasher import HashingBusyError
 from typing import Optional, Tuple, Dict, Any
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 
 
 class UserUseCase:
-    def __init__(self, user_repo: UserRepository, subscription_repo: SubscriptionRepository, plan_repo: PlanRepository, rank_repo: ArcherRankRepository, pay_history_repo: PaymentHistoryRepository):
+    def __init__(self, user_repo: UserRepository, subscription_repo: SubscriptionRepository, plan_repo: PlanRepository, member_points_repo: MemberPointsRepository, pay_history_repo: PaymentHistoryRepository):
         self.user_repo = user_repo
         self.subscription_repo = subscription_repo
         self.plan_repo = plan_repo
-        self.rank_repo = rank_repo
+        self.member_points_repo = member_points_repo
         self.pay_history_repo = pay_history_repo
 
 
@@ -28,38 +31,20 @@ class UserUseCase:
         user_data = User(**data)
         user_data.set_password(data["Password"])
 
-        if self.user_repo.get_by_email(user_data.email):
-            return False, {
-                "message": "User already exists."
-            }
-
-        # create a customer account in paystack
-        response: Dict = paystack.customer.create(
-            first_name=user_data.firstName,
-            last_name=user_data.lastName,
-            email=user_data.email,
-            phone=user_data.PhoneNumber,
-        )
+        user_data.status = "Terms_Condition"
 
-        if not response.get('status'):
+        # the unique email index rejects a second account, no lookup needed first
+        try:
+            result_data = self.user_repo.create_user(user_data.to_bson())
+        except DuplicateKeyError:
             return False, {
-                "message": response.get('message'),
+                "message": "User already exists."
             }
-        
-        response_data: Dict = response.get('data')
-
-        # # update the current user model with the necessary codes from paystack
-        user_data.customer_code = response_data.get('customer_code')
-        user_data.status = "Terms_Condition"
 
-        # Insert into database
-        result_id = self.user_repo.create_user(user_data.to_bson())
-        
-        # send welcome email
-        self.user_repo.send_welcome_email(user_data)
-
-        # # Fetch the inserted record
-        result_data = self.user_repo.get_by_id(result_id)
+        # the paystack customer is created after the response, create_subscription
+        # creates it inline if this has not finished by the payment step
+        background_tasks.submit("provision_customer", provision_customer, self.user_repo, result_data)
+        background_tasks.submit("welcome_email", self.user_repo.send_welcome_email, user_data)
 
         return True, {
             "message": "User registered successfully.",
@@ -86,6 +71,15 @@ class UserUseCase:
                 "message": "Invalid email or password.",
             }
 
+        # upgrade the stored hash if the hashing parameters have changed
+        if user_data.password_needs_rehash():
+            try:
+                user_data.set_password(password)
+                self.user_repo.find_and_update_user({"_id": user_data.id}, {"Password": user_data.Password})
+            except HashingBusyError:
+                # not worth failing the login over, it will be retried on the next one
+                pass
+
         # Generate JWT access token
         access_token = create_access_token(identity={
             "user_id": str(user_data.id),
@@ -132,12 +126,8 @@ class UserUseCase:
             response_data["benefits"] = plan_data.benefits
             response_data["price"] = plan_data.Price // 100
 
-        # get user's total points
-        points = self.rank_repo.find_all_points_by_email(user.get('email'))
-        if points:
-            response_data["points"] = points[0].get('total_points', 0)
-        else:
-            response_data["points"] = 0
+        # get user's total points, kept up to date as their ranks change
+        response_data["points"] = self.member_points_repo.get_total(user.get('email'))
 
         subscription = self.subscription_repo.get_by_plan_user_id(user_id=user_id, plan_id=str(user.get('plan_id')))
         if subscription:
@@ -0,0 +1,31 @@
+from typing import IO, Any, Dict, Iterator
+import codecs
+import csv
+import json
+
+
+def iter_result_sheet(stream: IO[bytes], filename: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the rows of an uploaded result sheet as dicts.
+
+    CSV (with a header row) and JSON Lines are read row by row off the
+    upload stream. A plain JSON array is loaded whole.
+    """
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    # utf-8-sig drops the byte-order mark spreadsheet exports tend to add
+    text = codecs.getreader("utf-8-sig")(stream)
+
+    if extension == "csv":
+        for row in csv.DictReader(text):
+            yield {key.strip(): value for key, value in row.items() if key}
+    elif extension in ("ndjson", "jsonl"):
+        for line in text:
+            if line.strip():
+                yield json.loads(line)
+    elif extension == "json":
+        rows = json.load(text)
+        if not isinstance(rows, list):
+            raise ValueError("A JSON result sheet must be an array of rows.")
+        yield from rows
+    else:
+        raise ValueError("Unsupported result sheet, upload a .csv, .json or .ndjson file.")
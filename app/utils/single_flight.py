@@ -0,0 +1,45 @@
+from threading import Lock
+from typing import Any, Callable, Optional, Tuple
+import time
+
+
+class SingleFlightValue:
+    """
+    A value recomputed at most once per `ttl` seconds in this process.
+
+    Only one caller runs `compute` at a time. While it does, the others get
+    the previous value if there is one, or wait for the new one if not. A
+    failed refresh raises for the caller that ran it and leaves the previous
+    value in place for the next.
+    """
+
+    def __init__(self, compute: Callable[[], Any], ttl: float):
+        self.compute = compute
+        self.ttl = ttl
+        self._value: Optional[Tuple[float, Any]] = None
+        self._refresh = Lock()
+
+    def get(self) -> Any:
+        value = self._value
+        if value and value[0] > time.monotonic():
+            return value[1]
+
+        # someone else is refreshing, serve what we have rather than queue behind them
+        if value and not self._refresh.acquire(blocking=False):
+            return value[1]
+        if not value:
+            self._refresh.acquire()
+
+        try:
+            # it may have been refreshed while we waited for the lock
+            if self._value and self._value[0] > time.monotonic():
+                return self._value[1]
+
+            result = self.compute()
+            self._value = (time.monotonic() + self.ttl, result)
+            return result
+        finally:
+            self._refresh.release()
+
+    def clear(self) -> None:
+        self._value = None
@@ -0,0 +1,73 @@
+from typing import Any, Iterable, Iterator, List
+from datetime import datetime, time
+import csv
+import io
+import tempfile
+
+# cells starting with these are run as formulas by spreadsheet apps
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def to_cell(value: Any) -> Any:
+    """A value as one spreadsheet cell: dates as ISO text, lists joined, text never run as a formula."""
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        # dates of birth are stored as midnight
+        return value.date().isoformat() if value.time() == time() else value.isoformat(timespec="seconds")
+    if isinstance(value, (list, tuple)):
+        value = "; ".join(str(item) for item in value)
+    if isinstance(value, (bool, int, float)):
+        return value
+
+    value = str(value)
+    # phone numbers like +234 ... are kept as they are
+    if value.startswith(FORMULA_PREFIXES) and not value.lstrip("+-").replace(" ", "").isdigit():
+        return "'" + value
+    return value
+
+
+def iter_csv(header: List[str], rows: Iterable[List[Any]], chunk_size: int = 64 * 1024) -> Iterator[str]:
+    """Encode rows as CSV text, returned in chunks of about `chunk_size` characters."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    # the byte-order mark tells Excel the file is utf-8
+    buffer.write("\ufeff")
+    writer.writerow(header)
+    for values in rows:
+        writer.writerow([to_cell(value) for value in values])
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+
+
+def iter_xlsx(header: List[str], rows: Iterable[List[Any]], chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """
+    Encode rows as an .xlsx workbook, returned in chunks.
+
+    An xlsx file is a zip that is only complete once every row is in, so
+    the rows are written to a temporary file in openpyxl's write-only mode,
+    which keeps memory flat, and the file is sent once it is done. Raises
+    ImportError straight away when openpyxl is not installed.
+    """
+    # imported on the first xlsx export, which keeps it out of the boot time
+    from openpyxl import Workbook
+
+    def chunks() -> Iterator[bytes]:
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append(header)
+        for values in rows:
+            sheet.append([to_cell(value) for value in values])
+
+        with tempfile.TemporaryFile() as file:
+            workbook.save(file)
+            file.seek(0)
+            while chunk := file.read(chunk_size):
+                yield chunk
+
+    return chunks()
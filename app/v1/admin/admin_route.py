@@ -0,0 +1,43 @@
+from flask import Blueprint, abort, jsonify, request, current_app
+from app.usecases import AdminUseCase, RevenueUseCase
+from app.utils.decorators import admin_required
+
+admin_bp = Blueprint('admin', __name__)
+
+
+@admin_bp.get('/summary', strict_slashes=False)
+@admin_required()
+def get_summary():
+    """
+    Member onboarding counts, revenue by period, subscriptions per status and
+    plan, today's walk-ins and competition registrations, in one response.
+    """
+    try:
+        usecase: AdminUseCase = admin_bp.admin_use_case
+        success, resp_data = usecase.get_summary()
+
+        return jsonify({"error": not success, "message": resp_data.get("message"), "data": resp_data.get("data")}), 200
+    except Exception as e:
+        current_app.logger.error(f"Failed to get admin summary: {str(e)}")
+        abort(500, 'Failed to get admin summary')
+
+
+@admin_bp.get('/revenue', strict_slashes=False)
+@admin_required()
+def get_revenue_report():
+    """
+    Revenue per period, plan, type and status, read from the daily rollups.
+    Takes `from` and `to` (YYYY-MM-DD, both included) and `period` (day, month or year).
+    """
+    try:
+        usecase: RevenueUseCase = admin_bp.revenue_use_case
+        success, resp_data = usecase.get_report(request.args.get("from"), request.args.get("to"),
+                                                request.args.get("period", "month"))
+
+        if not success:
+            return jsonify({"error": not success, "message": resp_data.get("message")}), 400
+
+        return jsonify({"error": not success, "message": resp_data.get("message"), "data": resp_data.get("data")}), 200
+    except Exception as e:
+        current_app.logger.error(f"Failed to get revenue report: {str(e)}")
+        abort(500, 'Failed to get revenue report')
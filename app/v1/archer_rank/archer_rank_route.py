@@ -1,8 +1,10 @@
 from flask import Blueprint, abort, jsonify, request, current_app
 from app.usecases import ArcherRankUseCase
 from app.utils.decorators import admin_required
+from app.services.cache.setup import response_cache
+from app.utils.result_sheet import iter_result_sheet
 from typing import Dict
-from cloudinary.uploader import upload
+from app.services.media.uploader import upload
 
 archer_rank_bp = Blueprint('archer_rank', __name__)
 
@@ -38,6 +40,39 @@ def create_archer_rank():
         current_app.logger.error(f"Failed to create archer rank: {str(e)}")
         abort(500, 'Failed to create archer rank')
 
+@archer_rank_bp.post('/import', strict_slashes=False)
+@admin_required()
+def import_archer_ranks():
+    """
+    Import a tournament result sheet (.csv, .json or .ndjson) uploaded as `file`.
+    Each row needs email, full_name, point and type, image_url is optional.
+    """
+    try:
+        sheet = request.files.get('file')
+        if not sheet:
+            return jsonify({"error": True, "message": "Upload the result sheet as 'file'."}), 400
+
+        usecase: ArcherRankUseCase = archer_rank_bp.archer_rank_use_case
+        success, resp_data = usecase.import_archer_ranks(iter_result_sheet(sheet.stream, sheet.filename or ""))
+
+        if not success:
+            return jsonify({
+                "error": not success,
+                "message": resp_data.get("message"),
+            }), 400
+
+        return jsonify({
+                "error": not success,
+                "message": resp_data.get("message"),
+                "data": resp_data.get("data")
+            }), 200
+    except (ValueError, UnicodeDecodeError) as e:
+        return jsonify({"error": True, "message": f"Could not read the result sheet: {str(e)}"}), 400
+    except Exception as e:
+        current_app.logger.error(f"Failed to import archer ranks: {str(e)}")
+        abort(500, 'Failed to import archer ranks')
+
+
 @archer_rank_bp.get('/<archer_rank_id>', strict_slashes=False)
 @admin_required()
 def get_archer_rank(archer_rank_id):
@@ -62,6 +97,7 @@ def get_archer_rank(archer_rank_id):
 
 
 @archer_rank_bp.get('/all', strict_slashes=False)
+@response_cache.cached('archer_ranks')
 def get_all_archer_ranks():
     try:
         usecase: ArcherRankUseCase = archer_rank_bp.archer_rank_use_case
@@ -2,6 +2,9 @@ from flask import abort, jsonify, request, current_app, Blueprint
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from pydantic import ValidationError
 from app.utils.utils import validateEmail
+from app.utils.decorators import admin_required
+from app.services.hashing.hasher import HashingBusyError
+from app.services.hashing.setup import password_hasher
 from app.usecases import (
     UserUseCase,
     SubscriptionUseCase,
@@ -53,6 +56,9 @@ def register(plan_id: str):
     except ValidationError as e:
         current_app.logger.error(f"Validation error: {e.json()}")
         abort(400, 'Invalid request data')
+    except HashingBusyError as e:
+        current_app.logger.warning(f"Failed to register user: {str(e)}")
+        return jsonify({"error": True, "message": "Server busy, please try again"}), 503
     except Exception as e:
         current_app.logger.error(f"Failed to register user: {str(e)}")
         abort(500, 'Failed to register user')
@@ -136,6 +142,9 @@ def login():
             return jsonify({"error": True, "message": login_data.get("message")}), status_code
 
         return jsonify({"error": False, "message": login_data.get("message"), "tokens": login_data.get("data")}), status_code
+    except HashingBusyError as e:
+        current_app.logger.warning(f"Failed to login user: {str(e)}")
+        return jsonify({"error": True, "message": "Server busy, please try again"}), 503
     except Exception as e:
         current_app.logger.error(f"Failed to login user: {str(e)}")
         abort(500, 'Failed to login user')
@@ -170,4 +179,10 @@ def logout():
         return jsonify({"error": False, "message": f"{token_type} token revoked successfully"}), 200
     except Exception as e:
         current_app.logger.error(f"Failed to logout user: {str(e)}")
-        abort(500, 'Failed to logout user')
\ No newline at end of file
+        abort(500, 'Failed to logout user')
+
+
+@auth_bp.get("/hashing/stats", strict_slashes=False)
+@admin_required()
+def hashing_stats():
+    return jsonify({"error": False, "data": password_hasher.stats()}), 200
@@ -1,4 +1,4 @@
-from flask import abort, jsonify, request, current_app, Blueprint
+from flask import abort, jsonify, request, current_app, Blueprint, Response, stream_with_context
 from pydantic import ValidationError
 from typing import Dict
 from app.usecases import ChampionUserUseCase
@@ -107,6 +107,37 @@ def get_all_champion_users():
         current_app.logger.error(f"Failed to get all Champion users: {str(e)}")
         abort(500, 'Failed to get all Champion users')
 
+@champion_user_bp.get('/export', strict_slashes=False)
+@admin_required()
+def export_champion_users():
+    """
+    Download every registration matching the filters, with its categories,
+    as `format=csv` (default) or `format=xlsx`. Filters: `status` (comma
+    separated), `search` (first or last name) and `official` (true or false).
+    """
+    try:
+        usecase: ChampionUserUseCase = champion_user_bp.champion_user_use_case
+
+        official = request.args.get("official")
+        success, resp_data = usecase.export_champion_users(
+            request.args.get("format", "csv").lower(),
+            status=request.args.get("status"),
+            search=request.args.get("search", ""),
+            official=None if official is None else official.lower() == "true"
+        )
+
+        if not success:
+            return jsonify({"error": True, "message": resp_data.get("message")}), 400
+
+        export: Dict = resp_data.get("data")
+        return Response(stream_with_context(export["body"]), mimetype=export["mimetype"], headers={
+            "Content-Disposition": f'attachment; filename="{export["filename"]}"',
+            "Cache-Control": "no-store"
+        })
+    except Exception as e:
+        current_app.logger.error(f"Failed to export Champion users: {str(e)}")
+        abort(500, 'Failed to export Champion users')
+
 @champion_user_bp.put('/update/payment/<champion_user_id>', strict_slashes=False)
 @admin_required()
 def update_champion_user_payment_status(champion_user_id: str):
@@ -0,0 +1,18 @@
+from flask import Blueprint, jsonify
+from app.services.readiness.setup import readiness
+
+health_bp = Blueprint('health', __name__)
+
+
+@health_bp.get('/live', strict_slashes=False)
+def live():
+    # the process is up and serving, whether or not the database is
+    return jsonify({"error": False, "message": "Alive"}), 200
+
+@health_bp.get('/ready', strict_slashes=False)
+def ready():
+    status = readiness.status()
+    if not status["ready"]:
+        return jsonify({"error": True, "message": "Starting up", "data": status}), 503
+
+    return jsonify({"error": False, "message": "Ready", "data": status}), 200
@@ -1,11 +1,11 @@
 from flask import Blueprint, abort, jsonify, request, current_app
 
 from typing import Dict
-from cloudinary.uploader import upload
-import hmac
-import hashlib
 from app.config  import config
 from app.services.paystack.payment import PayStackPayment
+from app.services.paystack.setup import webhook_ingress
+from app.services.paystack.webhook import WebhookRejected
+from app.database import WebhookEventRepository
 
 payment_bp = Blueprint('payment', __name__)
 
@@ -34,29 +34,22 @@ def check_ip_whitelist():
 @payment_bp.post('/webhook', strict_slashes=False)
 def payment_webhook():
     try:
-        # Step 1: Validate Paystack signature
-        signature = request.headers.get('X-Paystack-Signature')
-        if not signature:
-            return jsonify({"error": True, "message": "Signature missing"}), 400
+        # Validate the Paystack signature and parse the payload
+        try:
+            event_type, event_data = webhook_ingress.read(request)
+        except WebhookRejected as e:
+            return jsonify({"error": True, "message": e.message}), e.status
 
-        payload = request.get_data()
-        expected_signature = hmac.new(
-            config.PAYSTACK_SECRET_KEY.encode('utf-8'),
-            payload,
-            hashlib.sha512
-        ).hexdigest()
-
-        if signature != expected_signature:
-            return jsonify({"error": True, "message": "Invalid signature"}), 400
-        
-        # Step 2: Parse the payload
-        event_data: Dict = request.get_json()
-        
-        event_type = event_data.get("event")
-        event_data = event_data.get("data")
+        # keep the raw event so it can be replayed if a handler gets it wrong
+        if config.WEBHOOK_ARCHIVE_ENABLED:
+            try:
+                current_app.extensions['repositories'].get(WebhookEventRepository).archive(event_type, event_data)
+            except Exception as e:
+                current_app.logger.error(f"Failed to archive webhook event: {str(e)}")
 
         # handle events
-        success, resp_data = PayStackPayment.paymentHandler(event_type=event_type, data=event_data)
+        paystack_payment: PayStackPayment = payment_bp.paystack_payment
+        success, resp_data = paystack_payment.paymentHandler(event_type=event_type, data=event_data)
         # print(event_type)
 
         if not success:
@@ -1,6 +1,7 @@
 from flask import Blueprint, abort, jsonify, request, current_app
 from app.usecases import PlanUseCase
 from app.utils.decorators import admin_required
+from app.services.cache.setup import response_cache
 from typing import Dict
 
 plan_bp = Blueprint('plan', __name__)
@@ -23,6 +24,7 @@ def create_plan():
         abort(500, 'Failed to create plan')
 
 @plan_bp.get('/all', strict_slashes=False)
+@response_cache.cached('plans')
 def get_all_plans():
     try:
         usecase: PlanUseCase = plan_bp.plan_use_case
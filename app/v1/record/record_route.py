@@ -1,8 +1,9 @@
 from flask import Blueprint, abort, jsonify, request, current_app
 from app.usecases import RecordUseCase
 from app.utils.decorators import admin_required
+from app.services.cache.setup import response_cache
 from typing import Dict
-from cloudinary.uploader import upload
+from app.services.media.uploader import upload
 
 record_bp = Blueprint('record', __name__)
 
@@ -64,6 +65,7 @@ def get_record(record_id):
 
 
 @record_bp.get('/all', strict_slashes=False)
+@response_cache.cached('records')
 def get_all_records():
     try:
         usecase: RecordUseCase = record_bp.record_use_case
@@ -1,17 +1,28 @@
-from flask import abort, jsonify, current_app, Blueprint, g, request
+from flask import abort, jsonify, current_app, Blueprint, g, request, Response, stream_with_context
 from app.utils.decorators import admin_required, auth_required
 from app.usecases import SubscriptionUseCase
+from app.services.realtime.setup import payment_feed
+from app.services.realtime.sse import sse_event, sse_comment
+from app.config import config
 from typing import Dict
+from threading import BoundedSemaphore
+import time
 
 subscription_bp = Blueprint('subscription', __name__)
 
+# each open payment stream holds a worker thread, so only a few may wait at once
+payment_streams = BoundedSemaphore(config.PAYMENT_STREAM_MAX_OPEN)
+
 
 @subscription_bp.get('/all', strict_slashes=False)
 @admin_required()
 def get_all_subscriptions_with_user_details():
     try:
         usecase: SubscriptionUseCase = subscription_bp.subscription_use_case
-        success, resp_data = usecase.get_all_subscriptions_with_user_details()
+
+        page = int(request.args.get("page", 1))
+        limit = int(request.args.get("limit", 50))
+        success, resp_data = usecase.get_all_subscriptions_with_user_details(max(page, 1), min(max(limit, 1), 200))
         
         if not success:
             return jsonify({"error": not success, "message": resp_data.get("message")}), 400
@@ -132,6 +143,57 @@ def verify_payment(reference: str):
         abort(500, 'Failed to initialize payment')
 
 
+@subscription_bp.get('/verify/<reference>/stream', strict_slashes=False)
+def stream_payment_status(reference: str):
+    """
+    Server-sent events for one payment: a `payment` event shaped like /verify
+    as soon as the webhook records the outcome, or `timeout` once
+    PAYMENT_STREAM_TIMEOUT_SECONDS pass without one.
+
+    Under gunicorn the stream holds a worker thread, so each worker keeps at
+    most PAYMENT_STREAM_MAX_OPEN open and answers 503 beyond that; the page
+    then polls /verify. The ASGI app serves this route natively instead.
+    """
+    usecase: SubscriptionUseCase = subscription_bp.subscription_use_case
+    if not payment_streams.acquire(blocking=False):
+        return jsonify({"error": True, "message": "Too many payment streams open, poll /verify instead."}), 503, {"Retry-After": "5"}
+
+    def stream():
+        subscription = payment_feed.subscribe(reference)
+        try:
+            # subscribed before looking, so an outcome recorded in between still wakes us
+            result = usecase.get_recorded_payment(reference)
+            deadline = time.monotonic() + config.PAYMENT_STREAM_TIMEOUT_SECONDS
+
+            while result is None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    yield sse_event("timeout", {"message": "No payment outcome yet."})
+                    return
+
+                entry = subscription.wait(min(remaining, config.SSE_KEEPALIVE_SECONDS))
+                if entry is None:
+                    yield sse_comment("waiting")
+                    continue
+                result = usecase.recorded_payment_result(entry)
+
+            yield sse_event("payment", {"error": False, **result})
+        except Exception as e:
+            current_app.logger.error(f"Failed to stream payment status: {str(e)}")
+            yield sse_event("error", {"error": True, "message": "Failed to stream payment status"})
+        finally:
+            payment_feed.unsubscribe(subscription)
+
+    response = Response(stream_with_context(stream()), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        # stops nginx from buffering the stream
+        "X-Accel-Buffering": "no"
+    })
+    # on close rather than in the generator, which never runs if the client leaves first
+    response.call_on_close(payment_streams.release)
+    return response
+
+
 @subscription_bp.get('/active', strict_slashes=False)
 @admin_required()
 def get_all_active_users():
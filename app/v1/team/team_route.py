@@ -1,9 +1,10 @@
 from flask import Blueprint, abort, jsonify, request, current_app
 from app.usecases import TeamUseCase
 from app.utils.decorators import admin_required
+from app.services.cache.setup import response_cache
 
 from typing import Dict
-from cloudinary.uploader import upload
+from app.services.media.uploader import upload
 
 team_bp = Blueprint('team', __name__)
 
@@ -64,6 +65,7 @@ def get_team(team_id):
         abort(500, 'Failed to get team')
 
 @team_bp.get('/all', strict_slashes=False)
+@response_cache.cached('teams')
 def get_all_teams():
     try:
         usecase: TeamUseCase = team_bp.team_use_case
@@ -0,0 +1,5 @@
+from run import app as flask_app
+from app.asgi import init_asgi_app
+
+
+app = init_asgi_app(flask_app)
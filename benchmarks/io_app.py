@@ -0,0 +1,29 @@
+"""
+Stand-in app for comparing worker profiles without Mongo or Paystack.
+
+Each request waits IO_MS milliseconds (the Mongo/Paystack round trips) and
+then does CPU_MS milliseconds of work, which matches the 0.9 I/O ratio the
+default profile assumes.
+
+    GUNICORN_WORKER_CLASS=sync gunicorn -b 127.0.0.1:5001 benchmarks.io_app:app
+    gunicorn -b 127.0.0.1:5002 benchmarks.io_app:app
+"""
+import os
+import time
+from flask import Flask, jsonify
+
+IO_MS = float(os.getenv("IO_MS", "45"))
+CPU_MS = float(os.getenv("CPU_MS", "5"))
+
+app = Flask(__name__)
+
+
+@app.get("/io")
+def io_bound():
+    time.sleep(IO_MS / 1000)
+
+    deadline = time.perf_counter() + CPU_MS / 1000
+    while time.perf_counter() < deadline:
+        pass
+
+    return jsonify({"error": False})
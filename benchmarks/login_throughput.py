@@ -0,0 +1,57 @@
+"""
+Measures password verifications (the CPU cost of a login) per second.
+
+    python -m benchmarks.login_throughput --algorithm scrypt --workers 2 --clients 16
+
+Every client thread repeatedly verifies a password through the same
+PasswordHasher the app uses, so queueing and rejections behave like a login
+storm against one gunicorn worker.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import os
+import time
+
+from app.services.hashing.hasher import PasswordHasher, HashingBusyError
+
+
+def run(algorithm: str, cost: int, workers: int, clients: int, duration: float) -> None:
+    hasher = PasswordHasher(algorithm=algorithm, cost=cost, max_workers=workers, max_pending=clients)
+    hashed = hasher.hash("correct horse battery staple")
+    deadline = time.perf_counter() + duration
+
+    def client() -> int:
+        logins = 0
+        while time.perf_counter() < deadline:
+            try:
+                hasher.verify(hashed, "correct horse battery staple")
+                logins += 1
+            except HashingBusyError:
+                pass
+        return logins
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        total = sum(pool.map(lambda _: client(), range(clients)))
+    elapsed = time.perf_counter() - started
+
+    cores = min(workers, os.cpu_count() or 1)
+    stats = hasher.stats()
+    print(f"{stats['algorithm']:<28} workers={workers} clients={clients}")
+    print(f"  logins/s           {total / elapsed:10.1f}")
+    print(f"  logins/s per core  {total / elapsed / cores:10.1f}")
+    print(f"  avg hash ms        {stats['avg_hash_ms']:10.2f}")
+    print(f"  avg queue wait ms  {stats['avg_queue_wait_ms']:10.2f}")
+    print(f"  rejected           {stats['rejected']:10d}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--algorithm", default="scrypt", choices=["scrypt", "pbkdf2", "bcrypt"])
+    parser.add_argument("--cost", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10)
+    args = parser.parse_args()
+
+    run(args.algorithm, args.cost, args.workers, args.clients, args.duration)
@@ -0,0 +1,67 @@
+"""
+Load-tests one or more deployments with a fixed number of concurrent clients.
+
+    # sync deployment (Dockerfile default) and ASGI deployment side by side
+    gunicorn -w 4 -b 0.0.0.0:5000 run:app
+    uvicorn asgi:app --workers 4 --port 8000
+
+    python -m benchmarks.serving_modes --path /api/v1/rank/all \\
+        --concurrency 50 200 --duration 20 \\
+        http://localhost:5000 http://localhost:8000
+
+Reports requests per second, latency percentiles and errors per target and
+concurrency level.
+"""
+from typing import List
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def load(base_url: str, path: str, concurrency: int, duration: float) -> None:
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(base_url=base_url, limits=httpx.Limits(max_connections=concurrency), timeout=60) as client:
+        async def worker() -> None:
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code >= 500:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000 if latencies else 0
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0
+    print(f"{base_url:<28} c={concurrency:<5} {len(latencies) / elapsed:9.1f} req/s"
+          f"   p50 {p50:8.1f} ms   p99 {p99:8.1f} ms   errors {errors}")
+
+
+async def main(targets: List[str], path: str, concurrency: List[int], duration: float) -> None:
+    for level in concurrency:
+        for target in targets:
+            await load(target, path, level, duration)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("targets", nargs="+", help="base URLs of the deployments to compare")
+    parser.add_argument("--path", default="/api/v1/plan/all")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--duration", type=float, default=10)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.targets, args.path, args.concurrency, args.duration))
@@ -0,0 +1,73 @@
+"""
+Profiles a cold start: how long `import run` takes and which packages the time goes to.
+
+    python -m benchmarks.startup --repeat 5 --budget 1.0
+
+Each run is a fresh interpreter with LAZY_INIT=true and the scheduler off,
+so the boot neither waits for nor needs a reachable database. Reports the
+median wall time of the import, then where it goes: the self time
+`python -X importtime` reports for each module, summed per top-level
+package. Exits non-zero when the median exceeds --budget seconds.
+"""
+from collections import defaultdict
+from typing import Dict, List
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+PROBE = "import time; t = time.perf_counter(); import run; print(time.perf_counter() - t)"
+
+
+def boot_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault("FLASK_MONGO_URI", "mongodb://127.0.0.1:27017/zen")
+    env["LAZY_INIT"] = "true"
+    env["SCHEDULER_ENABLED"] = "false"
+    return env
+
+
+def wall_times(repeat: int) -> List[float]:
+    times = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", PROBE], env=boot_env(), capture_output=True, text=True, check=True)
+        times.append(float(output.stdout.strip().splitlines()[-1]))
+    return times
+
+
+def import_breakdown() -> Dict[str, int]:
+    """Self import time in microseconds, summed per top-level package."""
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", "import run"],
+                            env=boot_env(), capture_output=True, text=True, check=True)
+    packages: Dict[str, int] = defaultdict(int)
+
+    for line in output.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_time, _, name = line[len("import time:"):].split("|")
+        if not self_time.strip().isdigit():
+            continue
+
+        packages[name.strip().split(".")[0]] += int(self_time)
+    return packages
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget", type=float, help="fail when the median boot takes longer, in seconds")
+    args = parser.parse_args()
+
+    times = wall_times(args.repeat)
+    median = statistics.median(times)
+    print(f"import run: median {median:.3f}s   min {min(times):.3f}s   max {max(times):.3f}s   ({args.repeat} runs)")
+
+    print("\nslowest packages (self import time):")
+    for package, micros in sorted(import_breakdown().items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {package:<24} {micros / 1000:8.1f} ms")
+
+    if args.budget is not None and median > args.budget:
+        print(f"\nover budget: {median:.3f}s > {args.budget:.3f}s")
+        sys.exit(1)
@@ -0,0 +1,86 @@
+"""
+Measures the cost of taking a Paystack webhook off the wire, before any handler runs.
+
+    python -m benchmarks.webhook_ingress --number 20000
+
+Compares the previous ingress (body read into the request, signature compared
+with !=, JSON parsed by Flask) with WebhookIngress (capped single read,
+constant-time compare, one fast parse) on a typical charge.success payload.
+No database or network is involved.
+"""
+from typing import Callable
+import argparse
+import hashlib
+import hmac
+import io
+import json
+import timeit
+
+from flask import Request
+from werkzeug.test import EnvironBuilder
+
+from app.services.paystack.webhook import WebhookIngress
+
+SECRET = "sk_test_benchmark"
+
+PAYLOAD = json.dumps({
+    "event": "charge.success",
+    "data": {
+        "id": 302961,
+        "domain": "live",
+        "status": "success",
+        "reference": "qTPrJoy9Bx",
+        "amount": 1000000,
+        "paid_at": "2026-01-01T10:00:00.000Z",
+        "channel": "card",
+        "currency": "NGN",
+        "metadata": {"custom_fields": [{"display_name": "Plan", "value": "Monthly"}]},
+        "log": {"time_spent": 16, "attempts": 1, "history": [{"type": "action", "message": "Attempted to pay", "time": 7}]},
+        "customer": {"id": 68324, "email": "archer@example.com", "customer_code": "CUS_qo38as2hpsgk2r0"},
+        "authorization": {"authorization_code": "AUTH_f5rnfq9p", "bin": "539999", "last4": "8877", "reusable": True},
+        "plan": {"plan_code": "PLN_gx2wn530m0i3w3m", "interval": "monthly"},
+        "subaccount": {},
+        "split": {},
+    },
+}).encode()
+
+SIGNATURE = hmac.new(SECRET.encode(), PAYLOAD, hashlib.sha512).hexdigest()
+
+ingress = WebhookIngress(SECRET)
+
+
+def previous(request: Request) -> None:
+    signature = request.headers.get("X-Paystack-Signature")
+    payload = request.get_data()
+    expected = hmac.new(SECRET.encode("utf-8"), payload, hashlib.sha512).hexdigest()
+    if signature != expected:
+        raise AssertionError("signature rejected")
+    body = request.get_json()
+    body.get("event"), body.get("data")
+
+
+def current(request: Request) -> None:
+    ingress.read(request)
+
+
+def measure(name: str, ingress_step: Callable[[Request], None], number: int) -> None:
+    environ = EnvironBuilder(
+        "/webhook", method="POST", data=PAYLOAD,
+        headers={"X-Paystack-Signature": SIGNATURE, "Content-Type": "application/json"}
+    ).get_environ()
+
+    def one() -> None:
+        ingress_step(Request(dict(environ, **{"wsgi.input": io.BytesIO(PAYLOAD)})))
+
+    per_event = min(timeit.repeat(one, number=number, repeat=5)) / number
+    print(f"{name:<10} {per_event * 1e6:8.1f} us/event")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"payload {len(PAYLOAD)} bytes")
+    measure("previous", previous, args.number)
+    measure("current", current, args.number)
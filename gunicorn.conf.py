@@ -0,0 +1,45 @@
+"""
+Gunicorn worker profile, picked up automatically from the working directory.
+
+Almost every request waits on Mongo, Paystack, SMTP or Cloudinary, so the
+default profile runs threaded (gthread) workers: one process per core for
+CPU parallelism and enough threads per process to keep that core busy
+while the other requests wait on I/O.
+
+    GUNICORN_WORKER_CLASS  gthread (default) or sync
+    GUNICORN_IO_RATIO      share of a request's time spent waiting on I/O (default 0.9)
+    GUNICORN_WORKERS       override the derived number of processes
+    GUNICORN_THREADS       override the derived number of threads per process
+"""
+import math
+import multiprocessing
+import os
+
+cpus = multiprocessing.cpu_count()
+io_ratio = min(float(os.getenv("GUNICORN_IO_RATIO", "0.9")), 0.99)
+
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+if worker_class == "sync":
+    # the previous deployment: one request at a time per process
+    workers = int(os.getenv("GUNICORN_WORKERS", "4"))
+    threads = 1
+else:
+    # a core stays busy with 1 / (1 - io_ratio) requests in flight, rounded
+    # first so float error (1 / (1 - 0.9) is 10.000000000000002) does not add one
+    in_flight_per_core = math.ceil(round(1 / (1 - io_ratio), 6))
+    workers = int(os.getenv("GUNICORN_WORKERS", str(max(2, cpus))))
+    threads = int(os.getenv("GUNICORN_THREADS", str(math.ceil(cpus * in_flight_per_core / workers))))
+
+
+def post_worker_init(worker):
+    # background jobs run in server workers only, never in `flask` CLI commands
+    from app.extensions import start_scheduler
+    start_scheduler(worker.wsgi)
+
+
+def worker_exit(server, worker):
+    # hand the scheduler lease back so another worker picks the jobs up straight away
+    from app.extensions import stop_scheduler
+    stop_scheduler()
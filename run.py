@@ -1,5 +1,5 @@
 from flask import Flask, jsonify, make_response
-from app.extensions import init_app
+from app.extensions import init_app, start_scheduler
 from app.config import config
 
 
@@ -48,5 +48,6 @@ def handle_exception(e):
     }), 500
 
 if __name__ == '__main__':
+     start_scheduler(app)
      app.run(host=config.ZEN_HOST,
             port=config.ZEN_PORT, debug=config.DEBUG)
\ No newline at end of file